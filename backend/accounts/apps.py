@@ -7,3 +7,8 @@ class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "accounts"
     verbose_name = "Accounts"
+
+    def ready(self) -> None:
+        super().ready()
+        # Register the background job tasks.
+        from . import tasks  # noqa: F401
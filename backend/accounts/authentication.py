@@ -0,0 +1,94 @@
+"""JWT authentication that trusts the role claims of fresh access tokens."""
+from __future__ import annotations
+
+from functools import cached_property
+
+from django.contrib.auth import get_user_model
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from blog import rbac
+
+from .tokens import ROLE_VERSION_CLAIM, ROLES_CLAIM
+
+
+class ClaimsUser(TokenUser):
+    """User built from token claims: id, flags and roles need no query.
+
+    Anything else (profile fields, object permissions) is read from the user
+    row, loaded on first use.
+    """
+
+    def __init__(self, token) -> None:
+        super().__init__(token)
+        rbac.remember_roles(self, token.get(ROLES_CLAIM, ()))
+
+    @cached_property
+    def _user(self):
+        return get_user_model().objects.get(**{api_settings.USER_ID_FIELD: self.pk})
+
+    @property
+    def username(self) -> str:  # type: ignore[override]
+        return self._user.get_username()
+
+    def get_username(self) -> str:
+        return self.username
+
+    @property
+    def groups(self):  # type: ignore[override]
+        return self._user.groups
+
+    @property
+    def user_permissions(self):  # type: ignore[override]
+        return self._user.user_permissions
+
+    def get_group_permissions(self, obj=None) -> set:
+        return self._user.get_group_permissions(obj)
+
+    def get_all_permissions(self, obj=None) -> set:
+        return self._user.get_all_permissions(obj)
+
+    def has_perm(self, perm: str, obj=None) -> bool:
+        return self._user.has_perm(perm, obj)
+
+    def has_perms(self, perm_list, obj=None) -> bool:
+        return self._user.has_perms(perm_list, obj)
+
+    def has_module_perms(self, module: str) -> bool:
+        return self._user.has_module_perms(module)
+
+    def __getattr__(self, attr: str):
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self._user, attr)
+
+
+class RoleClaimsJWTAuthentication(JWTAuthentication):
+    """Resolve readers from their token claims instead of the user table.
+
+    Safe requests whose token carries the current role version (see
+    ``blog.rbac.role_version``) get a :class:`ClaimsUser`. Writes, tokens
+    without roles and tokens issued before a role, ``is_active``,
+    ``is_staff`` or ``is_superuser`` change load the user row as usual.
+    """
+
+    def authenticate(self, request):  # type: ignore[override]
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        if request.method in SAFE_METHODS and self._claims_are_current(validated_token):
+            return ClaimsUser(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    def _claims_are_current(self, validated_token) -> bool:
+        version = validated_token.get(ROLE_VERSION_CLAIM)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if version is None or user_id is None or ROLES_CLAIM not in validated_token:
+            return False
+        return rbac.role_version(user_id) == version
@@ -7,7 +7,11 @@ from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .tokens import issue_tokens, stamp_roles
 
 User = get_user_model()
 
@@ -78,12 +82,7 @@ class RegisterSerializer(serializers.ModelSerializer):
     def to_representation(self, instance: User) -> dict[str, Any]:
         """Include JWT tokens alongside the public user data."""
 
-        refresh = RefreshToken.for_user(instance)
-        return {
-            "user": UserSerializer(instance).data,
-            "refresh": str(refresh),
-            "access": str(refresh.access_token),
-        }
+        return {"user": UserSerializer(instance).data, **issue_tokens(instance)}
 
 
 class LoginSerializer(serializers.Serializer):
@@ -126,9 +125,18 @@ class LoginSerializer(serializers.Serializer):
         if not user.is_active:
             raise serializers.ValidationError(self.error_messages["inactive"])
 
-        refresh = RefreshToken.for_user(user)
-        return {
-            "user": UserSerializer(user).data,
-            "refresh": str(refresh),
-            "access": str(refresh.access_token),
-        }
+        return {"user": UserSerializer(user).data, **issue_tokens(user)}
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh tokens stamping the current roles on the new access token."""
+
+    def validate(self, attrs: dict[str, Any]) -> dict[str, str]:
+        data = super().validate(attrs)
+        access = AccessToken(data["access"])
+        user = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: access[api_settings.USER_ID_CLAIM]}
+        ).first()
+        if user is not None:
+            data["access"] = str(stamp_roles(access, user))
+        return data
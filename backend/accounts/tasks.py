@@ -0,0 +1,24 @@
+"""Background job tasks of the accounts app."""
+from __future__ import annotations
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import send_mail
+
+from blog import jobs
+
+
+@jobs.task("accounts.send_welcome_email")
+def send_welcome_email(payload: dict) -> dict:
+    """Welcome email of the accounts created through the registration API."""
+
+    user = get_user_model().objects.filter(pk=payload["user_id"]).first()
+    if user is None or not user.email:
+        return {"sent": False}
+    subject = "Bienvenido a CodexTest"
+    message = (
+        "Hola {name},\n\n"
+        "Gracias por registrarte en CodexTest. Ya puedes iniciar sesión con tus credenciales."
+    ).format(name=user.get_full_name() or user.get_username())
+    send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=False)
+    return {"sent": True}
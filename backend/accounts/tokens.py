@@ -0,0 +1,36 @@
+"""JWT issuing with the RBAC roles of the user embedded as claims."""
+from __future__ import annotations
+
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from blog import rbac
+
+ROLES_CLAIM = "roles"
+ROLE_VERSION_CLAIM = "role_version"
+
+#: Claims read by ``rest_framework_simplejwt.models.TokenUser``.
+FLAG_CLAIMS = ("is_staff", "is_superuser")
+
+
+def stamp_roles(token: AccessToken, user) -> AccessToken:
+    """Add the roles of ``user`` and their current version to ``token``."""
+
+    token[ROLES_CLAIM] = sorted(rbac.user_roles(user))
+    token[ROLE_VERSION_CLAIM] = rbac.role_version(user.pk)
+    for claim in FLAG_CLAIMS:
+        token[claim] = bool(getattr(user, claim, False))
+    return token
+
+
+def issue_tokens(user) -> dict[str, str]:
+    """Return a refresh token and a role-bearing access token for ``user``.
+
+    Roles are only stamped on the short lived access token; refreshing it
+    stamps them again (see ``accounts.serializers.RoleTokenRefreshSerializer``).
+    """
+
+    refresh = RefreshToken.for_user(user)
+    return {
+        "refresh": str(refresh),
+        "access": str(stamp_roles(refresh.access_token, user)),
+    }
@@ -1,12 +1,12 @@
 """Authentication API views."""
 from __future__ import annotations
 
-from django.conf import settings
-from django.core.mail import send_mail
 from drf_spectacular.utils import extend_schema
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 
+from blog import jobs
+
 from .serializers import LoginSerializer, RegisterSerializer, UserSerializer
 
 
@@ -31,12 +31,7 @@ class RegisterAPIView(generics.GenericAPIView):
     def _send_welcome_email(self, user) -> None:
         if not user.email:
             return
-        subject = "Bienvenido a CodexTest"
-        message = (
-            "Hola {name},\n\n"
-            "Gracias por registrarte en CodexTest. Ya puedes iniciar sesión con tus credenciales."
-        ).format(name=user.get_full_name() or user.get_username())
-        send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=False)
+        jobs.enqueue("accounts.send_welcome_email", {"user_id": user.pk}, queue="emails")
 
 
 @extend_schema(tags=["auth"])
@@ -359,7 +359,7 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.BasicAuthentication",
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.RoleClaimsJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
@@ -389,6 +389,23 @@ REST_FRAMEWORK = {
     },
 }
 
+_response_cache_timeout = _env("BLOG_RESPONSE_CACHE_TIMEOUT", "300") or "300"
+try:
+    BLOG_RESPONSE_CACHE_TIMEOUT = int(_response_cache_timeout)
+except (TypeError, ValueError):
+    BLOG_RESPONSE_CACHE_TIMEOUT = 300
+BLOG_RESPONSE_CACHE_ALIAS = _env("BLOG_RESPONSE_CACHE_ALIAS", "default") or "default"
+
+_role_cache_timeout = _env("BLOG_ROLE_CACHE_TIMEOUT", "300") or "300"
+try:
+    BLOG_ROLE_CACHE_TIMEOUT = int(_role_cache_timeout)
+except (TypeError, ValueError):
+    BLOG_ROLE_CACHE_TIMEOUT = 300
+BLOG_ROLE_CACHE_ALIAS = _env("BLOG_ROLE_CACHE_ALIAS", "default") or "default"
+
+# "denormalized" reads Post.comment_count/reaction_total; "live" counts with subqueries.
+BLOG_POST_COUNTS_MODE = (_env("BLOG_POST_COUNTS_MODE", "denormalized") or "denormalized").lower()
+
 REST_USE_JWT = True
 REST_AUTH_TOKEN_MODEL = None
 REST_AUTH = {
@@ -407,6 +424,7 @@ SIMPLE_JWT = {
     "BLACKLIST_AFTER_ROTATION": False,
     "UPDATE_LAST_LOGIN": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.RoleTokenRefreshSerializer",
 }
 
 if DEBUG:
@@ -469,8 +487,37 @@ OPENAI_SYSTEM_PROMPT = _env(
         "Markdown/HTML, respeta enlaces y código, no inventes contenido."
     ),
 )
+# Overall budget of a translation call, retries included (see blog.utils.openai).
 OPENAI_REQUEST_TIMEOUT = _env_float("OPENAI_REQUEST_TIMEOUT", 15.0)
+OPENAI_MAX_RETRIES = _env_int("OPENAI_MAX_RETRIES", 2)
+OPENAI_RETRY_BACKOFF = _env_float("OPENAI_RETRY_BACKOFF", 0.5)
+OPENAI_POOL_SIZE = _env_int("OPENAI_POOL_SIZE", 10)
 OPENAI_MAX_TEXT_LENGTH = _env_int("OPENAI_MAX_TEXT_LENGTH", 2000)
+OPENAI_MAX_DOCUMENT_LENGTH = _env_int("OPENAI_MAX_DOCUMENT_LENGTH", 50000)
+OPENAI_TRANSLATION_WORKERS = _env_int("OPENAI_TRANSLATION_WORKERS", 12)
+# Limits shared by every process (see blog.openai_limiter); "local" counts per process.
+OPENAI_LIMITER_BACKEND = (_env("OPENAI_LIMITER_BACKEND", "database") or "database").lower()
+OPENAI_MAX_IN_FLIGHT = _env_int("OPENAI_MAX_IN_FLIGHT", 16)
+OPENAI_TOKEN_BUDGET = _env_int("OPENAI_TOKEN_BUDGET", 200000)
+OPENAI_TOKEN_WINDOW = _env_int("OPENAI_TOKEN_WINDOW", 60)
+OPENAI_LIMITER_MAX_WAIT = _env_float("OPENAI_LIMITER_MAX_WAIT", 2.0)
+
+# Background jobs (``blog.jobs``, ``python manage.py run_blog_worker``).
+BLOG_JOBS_EAGER = _env_bool("BLOG_JOBS_EAGER", False)
+BLOG_JOB_QUEUES = {
+    "translations": _env_int("BLOG_JOB_TRANSLATIONS_CONCURRENCY", 4),
+    "emails": _env_int("BLOG_JOB_EMAILS_CONCURRENCY", 2),
+    "maintenance": _env_int("BLOG_JOB_MAINTENANCE_CONCURRENCY", 1),
+}
+BLOG_JOB_LEASE_SECONDS = _env_int("BLOG_JOB_LEASE_SECONDS", 120)
+BLOG_JOB_RETRY_DELAY = _env_float("BLOG_JOB_RETRY_DELAY", 15.0)
+BLOG_JOB_RETENTION_DAYS = _env_int("BLOG_JOB_RETENTION_DAYS", 7)
+
+# Memory of OpenAI translations (see blog.translation_memory); TTL 0 disables it.
+BLOG_TRANSLATION_MEMORY_TTL = _env_int("BLOG_TRANSLATION_MEMORY_TTL", 30 * 24 * 3600)
+BLOG_TRANSLATION_MEMORY_MAX_ENTRIES = _env_int("BLOG_TRANSLATION_MEMORY_MAX_ENTRIES", 10000)
+BLOG_TRANSLATION_MEMORY_LRU_SIZE = _env_int("BLOG_TRANSLATION_MEMORY_LRU_SIZE", 256)
+BLOG_TRANSLATION_LOCK_SECONDS = _env_int("BLOG_TRANSLATION_LOCK_SECONDS", 120)
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "CodexTest Blog API",
@@ -2,23 +2,34 @@
 from __future__ import annotations
 
 from django.contrib import admin
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from parler.admin import TranslatableAdmin
 
+from . import counters, response_cache
 from .models import Category, Comment, Post, Reaction, Tag
 
 
 @admin.register(Category)
 class CategoryAdmin(TranslatableAdmin):
-    list_display = ["name", "slug", "is_active", "created_at"]
+    list_display = [
+        "name",
+        "slug",
+        "is_active",
+        "post_count",
+        "published_post_count",
+        "created_at",
+    ]
     list_filter = ["is_active", "created_at"]
     search_fields = ["translations__name", "translations__description"]
     ordering = ["translations__name"]
-    readonly_fields = ["created_at", "updated_at"]
+    readonly_fields = ["post_count", "published_post_count", "created_at", "updated_at"]
 
 
 @admin.register(Tag)
 class TagAdmin(TranslatableAdmin):
+    list_display = ["name", "slug", "post_count", "published_post_count"]
+    readonly_fields = ["post_count", "published_post_count"]
     search_fields = ["translations__name", "translations__slug"]
     ordering = ["translations__name"]
 
@@ -66,17 +77,25 @@ class PostAdmin(TranslatableAdmin):
             actions.pop("action_publish", None)
         return actions
 
+    def _update_status(self, queryset, status: str) -> None:
+        # ``update`` skips the signals that maintain the taxonomy counters and
+        # expire cached API responses.
+        post_ids = list(queryset.values_list("pk", flat=True))
+        Post.objects.filter(pk__in=post_ids).update(status=status, updated_at=timezone.now())
+        counters.recount_for_posts(post_ids)
+        response_cache.invalidate_objects(Post, post_ids)
+
     @admin.action(description=_("Marcar como borrador"))
     def action_mark_draft(self, request, queryset):
-        queryset.update(status=Post.Status.DRAFT)
+        self._update_status(queryset, Post.Status.DRAFT)
 
     @admin.action(description=_("Enviar a revisión"))
     def action_mark_in_review(self, request, queryset):
-        queryset.update(status=Post.Status.IN_REVIEW)
+        self._update_status(queryset, Post.Status.IN_REVIEW)
 
     @admin.action(description=_("Publicar entradas seleccionadas"))
     def action_publish(self, request, queryset):
-        queryset.update(status=Post.Status.PUBLISHED)
+        self._update_status(queryset, Post.Status.PUBLISHED)
 
 
 @admin.register(Comment)
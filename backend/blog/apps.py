@@ -1,4 +1,6 @@
 from django.apps import AppConfig
+from django.db.models import CharField
+from django.db.models.functions import Lower
 
 
 class BlogConfig(AppConfig):
@@ -7,6 +9,17 @@ class BlogConfig(AppConfig):
 
     def ready(self) -> None:
         super().ready()
+        # ``name__lower=Lower(Value(value))`` matches the ``lower()`` expression
+        # indexes of the translation tables, unlike ``iexact``.
+        CharField.register_lookup(Lower)
+
+        from .models import Category, Post, Tag, warm_rewrite_plans
+
+        warm_rewrite_plans(Post, Category, Tag)
+
         # Import signal handlers to enable post-migrate seeding when configured.
         from . import signals  # noqa: F401
 
+        # Register the background job tasks.
+        from . import tasks  # noqa: F401
+
@@ -0,0 +1,58 @@
+"""HTTP validators (``ETag``/``Last-Modified``) for conditional GETs."""
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+#: ``(etag, last_modified)`` describing a representation; either may be ``None``.
+Validators = tuple[Optional[str], Optional[datetime]]
+
+NO_VALIDATORS: Validators = (None, None)
+
+
+def make_etag(*parts) -> str:
+    """Return a strong ETag identifying the given representation inputs."""
+
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8"))
+    return quote_etag(digest.hexdigest())
+
+
+def viewer_scope(request) -> str:
+    """Representations vary per authenticated user (roles, own drafts...)."""
+
+    user = getattr(request, "user", None)
+    if getattr(user, "is_authenticated", False):
+        return f"user:{user.pk}"
+    return "anonymous"
+
+
+def apply(response, validators: Validators):
+    etag, last_modified = validators
+    if etag is None and last_modified is None:
+        return response
+    patch_vary_headers(response, ("Accept-Language", "Authorization"))
+    if etag:
+        response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified(request, validators: Validators):
+    """Return a 304 response when the client already holds the representation."""
+
+    etag, last_modified = validators
+    if request.method not in {"GET", "HEAD"} or (etag is None and last_modified is None):
+        return None
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified is not None else None,
+    )
+    if response is None or response.status_code != 304:
+        return None
+    return apply(response, validators)
@@ -0,0 +1,219 @@
+"""Denormalized post counters stored on categories and tags."""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from . import rbac, response_cache
+from .models import Post
+
+#: Post relations whose targets carry ``post_count``/``published_post_count``.
+TAXONOMY_FIELDS = ("tags", "categories")
+
+_STATUS_ATTR = "_counted_status"
+
+
+def _through(field_name: str):
+    return Post._meta.get_field(field_name).remote_field.through
+
+
+def _target_column(field_name: str) -> str:
+    return Post._meta.get_field(field_name).m2m_reverse_field_name()
+
+
+def _target_model(field_name: str):
+    return Post._meta.get_field(field_name).related_model
+
+
+def _field_for_model(model) -> str:
+    for field_name in TAXONOMY_FIELDS:
+        if _target_model(field_name) is model:
+            return field_name
+    raise ValueError(f"{model.__name__} does not carry post counters.")
+
+
+def _stamped(model, updates: dict) -> dict:
+    """Also move ``updated_at`` so render snapshots embedding the counters go stale."""
+
+    if any(field.name == "updated_at" for field in model._meta.concrete_fields):
+        updates["updated_at"] = timezone.now()
+    return updates
+
+
+def is_public_status(status: Optional[str]) -> bool:
+    return status in rbac.PUBLIC_POST_STATUSES
+
+
+def field_for_through(through) -> Optional[str]:
+    """Return the ``Post`` field name served by the ``through`` model, if any."""
+
+    for field_name in TAXONOMY_FIELDS:
+        if _through(field_name) is through:
+            return field_name
+    return None
+
+
+def adjust(model, pks: Iterable[int], total: int = 0, published: int = 0) -> None:
+    """Apply ``F()`` deltas to the counters of ``model`` rows in ``pks``."""
+
+    pks = list(pks)
+    if not pks or not (total or published):
+        return
+    updates = {}
+    if total:
+        updates["post_count"] = Greatest(F("post_count") + total, Value(0))
+    if published:
+        updates["published_post_count"] = Greatest(
+            F("published_post_count") + published, Value(0)
+        )
+    model._base_manager.filter(pk__in=pks).update(**_stamped(model, updates))
+    response_cache.invalidate_objects(model, pks)
+
+
+def expected_counts(model) -> dict:
+    """Return subquery expressions computing the true counters of ``model``."""
+
+    field_name = _field_for_model(model)
+    through = _through(field_name)
+    column = _target_column(field_name)
+
+    def _count(condition: Optional[Q] = None):
+        return Coalesce(
+            Subquery(
+                through.objects.filter(condition or Q(), **{column: OuterRef("pk")})
+                .values(column)
+                .annotate(total=Count("pk"))
+                .values("total")
+            ),
+            Value(0),
+            output_field=IntegerField(),
+        )
+
+    return {
+        "post_count": _count(),
+        "published_post_count": _count(Q(post__status__in=rbac.PUBLIC_POST_STATUSES)),
+    }
+
+
+def recount(model, pks: Optional[Iterable[int]] = None) -> int:
+    """Recompute the counters of ``model`` from the relation tables."""
+
+    queryset = model._base_manager.all()
+    if pks is not None:
+        pks = list(pks)
+        queryset = queryset.filter(pk__in=pks)
+    updated = queryset.update(**_stamped(model, expected_counts(model)))
+    if pks is None:
+        pks = queryset.values_list("pk", flat=True)
+    response_cache.invalidate_objects(model, pks)
+    return updated
+
+
+def recount_for_posts(posts) -> None:
+    """Recount every tag and category linked to ``posts`` (a queryset or ids)."""
+
+    if hasattr(posts, "values_list"):
+        post_ids = list(posts.values_list("pk", flat=True))
+    else:
+        post_ids = list(posts)
+    for field_name in TAXONOMY_FIELDS:
+        column = _target_column(field_name)
+        linked = _through(field_name).objects.filter(post_id__in=post_ids)
+        linked = linked.values_list(column, flat=True).distinct()
+        recount(_target_model(field_name), list(linked))
+
+
+def remember_status(post: Post) -> None:
+    """Record the stored status of ``post`` to detect transitions on save."""
+
+    setattr(post, _STATUS_ATTR, post.__dict__.get("status"))
+
+
+def _counted_status(post: Post) -> Optional[str]:
+    return getattr(post, _STATUS_ATTR, None)
+
+
+def _stored_status(post: Post) -> Optional[str]:
+    return _counted_status(post) or post.status
+
+
+def linked_ids(field_name: str, post: Post, pks: Optional[Iterable[int]] = None) -> list[int]:
+    column = _target_column(field_name)
+    queryset = _through(field_name).objects.filter(post_id=post.pk)
+    if pks is not None:
+        queryset = queryset.filter(**{f"{column}__in": list(pks)})
+    return list(queryset.values_list(column, flat=True))
+
+
+def on_post_saved(post: Post, created: bool) -> None:
+    """Move the published counters when ``post`` enters or leaves a public status."""
+
+    previous = _counted_status(post)
+    remember_status(post)
+    if created:
+        return
+    if previous is None:
+        # The stored status was not loaded (deferred field); recount precisely.
+        recount_for_posts([post.pk])
+        return
+
+    was_public, is_public = is_public_status(previous), is_public_status(post.status)
+    if was_public == is_public:
+        return
+    delta = 1 if is_public else -1
+    for field_name in TAXONOMY_FIELDS:
+        adjust(_target_model(field_name), linked_ids(field_name, post), published=delta)
+
+
+def on_post_deleted(post: Post) -> None:
+    """Release the counters held by ``post`` before its links are cascaded."""
+
+    published = -1 if is_public_status(_stored_status(post)) else 0
+    for field_name in TAXONOMY_FIELDS:
+        adjust(
+            _target_model(field_name),
+            linked_ids(field_name, post),
+            total=-1,
+            published=published,
+        )
+
+
+def on_relation_changed(field_name: str, instance, action: str, reverse: bool, pk_set) -> None:
+    """Translate an ``m2m_changed`` notification into counter deltas.
+
+    ``post_add`` only reports links that did not exist yet, whereas removals
+    and clears report what was requested, so those are resolved against the
+    relation table before the rows disappear.
+    """
+
+    if action not in {"post_add", "pre_remove", "pre_clear"}:
+        return
+    sign = 1 if action == "post_add" else -1
+    target_model = _target_model(field_name)
+
+    if not reverse:
+        if action == "post_add":
+            pks = list(pk_set or ())
+        else:
+            pks = linked_ids(field_name, instance, None if action == "pre_clear" else pk_set)
+        published = sign if is_public_status(_stored_status(instance)) else 0
+        adjust(target_model, pks, total=sign, published=published)
+        return
+
+    column = _target_column(field_name)
+    links = _through(field_name).objects.filter(**{column: instance.pk})
+    if action != "pre_clear":
+        links = links.filter(post_id__in=list(pk_set or ()))
+    totals = links.aggregate(
+        total=Count("pk"),
+        published=Count("pk", filter=Q(post__status__in=rbac.PUBLIC_POST_STATUSES)),
+    )
+    adjust(
+        target_model,
+        [instance.pk],
+        total=sign * totals["total"],
+        published=sign * totals["published"],
+    )
@@ -1,24 +1,205 @@
 """Filter definitions for translation-aware lookups."""
 from __future__ import annotations
 
+from collections import OrderedDict
+
 import django_filters
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import translation
+from rest_framework.filters import OrderingFilter, SearchFilter
 
+from . import search
 from .models import Post
 
 
+def _is_multi_valued(model, relation: str) -> bool:
+    try:
+        field = model._meta.get_field(relation)
+    except Exception:  # pragma: no cover - defensive guard
+        return False
+    return bool(field.many_to_many or field.one_to_many)
+
+
+def related_exists(model, path: str, condition: Q | None = None, **lookups) -> Exists:
+    """Return an ``EXISTS`` subquery over the multi-valued relation leading ``path``.
+
+    ``path`` starts with a reverse foreign key (``translations``) or a
+    many-to-many field (``tags``); the remainder is applied inside the
+    correlated subquery so the outer queryset never joins wide rows and never
+    needs ``DISTINCT``. ``condition`` accepts a ``Q`` already expressed relative
+    to the related rows (``title__icontains=...``).
+    """
+
+    relation, _sep, remainder = path.partition("__")
+    field = model._meta.get_field(relation)
+
+    def _prefixed(prefix: str) -> tuple[Q, dict]:
+        inner_q = Q()
+        if condition is not None:
+            inner_q = _prefix_q(condition, prefix)
+        inner_kwargs = {
+            "__".join(part for part in (prefix, remainder, key) if part): value
+            for key, value in lookups.items()
+        }
+        return inner_q, inner_kwargs
+
+    if field.many_to_many:
+        through = field.remote_field.through
+        target = field.m2m_reverse_field_name()
+        inner_q, inner_kwargs = _prefixed(target)
+        subquery = through._default_manager.filter(
+            inner_q, **{field.m2m_field_name(): OuterRef("pk")}, **inner_kwargs
+        )
+    else:
+        related_model = field.related_model
+        inner_q, inner_kwargs = _prefixed("")
+        subquery = related_model._default_manager.filter(
+            inner_q, **{field.field.name: OuterRef("pk")}, **inner_kwargs
+        )
+    return Exists(subquery.values("pk"))
+
+
+def _prefix_q(expression: Q, prefix: str) -> Q:
+    if not prefix:
+        return expression
+    new_q = Q()
+    new_q.connector = expression.connector
+    new_q.negated = expression.negated
+    for child in expression.children:
+        if isinstance(child, Q):
+            new_q.children.append(_prefix_q(child, prefix))
+        else:
+            key, value = child
+            new_q.children.append((f"{prefix}__{key}", value))
+    return new_q
+
+
+def active_translation_value(model, field_name: str, language_code: str | None):
+    """Return a subquery selecting ``field_name`` in the active language with fallback."""
+
+    translations_model = model._parler_meta.root_model
+    default_language = settings.LANGUAGE_CODE
+    candidates = [code for code in (language_code, default_language) if code]
+    values = [
+        Subquery(
+            translations_model._default_manager.filter(
+                master=OuterRef("pk"), language_code=code
+            ).values(field_name)[:1]
+        )
+        for code in OrderedDict.fromkeys(candidates)
+    ]
+    if len(values) == 1:
+        return values[0]
+    return Coalesce(*values)
+
+
 class PostFilterSet(django_filters.FilterSet):
     """Expose legacy query parameters while targeting translated columns."""
 
     tags__name = django_filters.CharFilter(
-        field_name="tags__translations__name", lookup_expr="exact"
+        field_name="tags__translations__name", method="filter_related"
     )
     categories__slug = django_filters.CharFilter(
-        field_name="categories__translations__slug", lookup_expr="exact"
+        field_name="categories__translations__slug", method="filter_related"
     )
     categories__name = django_filters.CharFilter(
-        field_name="categories__translations__name", lookup_expr="exact"
+        field_name="categories__translations__name", method="filter_related"
     )
 
     class Meta:
         model = Post
         fields: list[str] = []
+
+    def filter_related(self, queryset, name, value):
+        path, _sep, lookup = name.rpartition("__")
+        return queryset.filter(related_exists(queryset.model, path, **{lookup: value}))
+
+
+class ExistsSearchFilter(SearchFilter):
+    """``SearchFilter`` resolving multi-valued relations through ``EXISTS``.
+
+    Fields sharing the same relation are folded into one subquery, so searching
+    title and content costs a single probe on the translations table.
+    """
+
+    def filter_queryset(self, request, queryset, view):  # type: ignore[override]
+        search_fields = self.get_search_fields(view, request)
+        search_terms = self.get_search_terms(request)
+        if not search_fields or not search_terms:
+            return queryset
+
+        lookups = [self.construct_search(str(field), queryset) for field in search_fields]
+        model = queryset.model
+        for term in search_terms:
+            grouped: "OrderedDict[str, Q]" = OrderedDict()
+            direct = Q()
+            for lookup in lookups:
+                relation, _sep, remainder = lookup.partition("__")
+                if remainder and _is_multi_valued(model, relation):
+                    grouped[relation] = grouped.get(relation, Q()) | Q(**{remainder: term})
+                else:
+                    direct |= Q(**{lookup: term})
+
+            condition = direct
+            for relation, inner in grouped.items():
+                condition |= related_exists(model, relation, inner)
+            queryset = queryset.filter(condition)
+        return queryset
+
+
+class FullTextSearchFilter(ExistsSearchFilter):
+    """Rank posts with the per-language full-text index when it is available.
+
+    Other models, or databases without the index, keep the ``icontains``
+    lookups of :class:`ExistsSearchFilter`.
+    """
+
+    def filter_queryset(self, request, queryset, view):  # type: ignore[override]
+        search_terms = self.get_search_terms(request)
+        if not search_terms:
+            return queryset
+        language_code = getattr(view, "language_code", None) or translation.get_language()
+        searched = search.search_posts(queryset, search_terms, language_code)
+        if searched is None:
+            return super().filter_queryset(request, queryset, view)
+        return searched
+
+
+class TranslatedOrderingFilter(OrderingFilter):
+    """Order translated fields by the active-language value instead of a join.
+
+    Without an explicit ``ordering`` parameter, full-text results are sorted
+    by relevance before the default ordering.
+    """
+
+    def filter_queryset(self, request, queryset, view):  # type: ignore[override]
+        ordering = self.get_ordering(request, queryset, view)
+        if (
+            search.SEARCH_RANK_ALIAS in queryset.query.annotations
+            and not request.query_params.get(self.ordering_param)
+        ):
+            ordering = [f"-{search.SEARCH_RANK_ALIAS}", *(ordering or ())]
+        if not ordering:
+            return queryset
+
+        model = queryset.model
+        parler_meta = getattr(model, "_parler_meta", None)
+        translated = set(parler_meta.get_translated_fields()) if parler_meta else set()
+        language_code = getattr(view, "language_code", None) or translation.get_language()
+
+        rewritten: list[str] = []
+        annotations = {}
+        for term in ordering:
+            descending = term.startswith("-")
+            name = term.lstrip("-")
+            if name in translated:
+                alias = f"_ordering_{name}"
+                annotations[alias] = active_translation_value(model, name, language_code)
+                name = alias
+            rewritten.append(f"-{name}" if descending else name)
+
+        if annotations:
+            queryset = queryset.annotate(**annotations)
+        return queryset.order_by(*rewritten)
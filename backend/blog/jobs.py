@@ -0,0 +1,293 @@
+"""Database-backed queue for work that must not block web workers.
+
+A job is a :class:`~blog.models.BackgroundJob` row naming a task registered
+with :func:`task` and a JSON payload. ``run_blog_worker`` claims jobs by
+priority (higher first) with a lease of ``BLOG_JOB_LEASE_SECONDS`` that it
+renews while they run; when a worker dies its leases expire and another
+worker takes the jobs over. Each queue of ``BLOG_JOB_QUEUES`` runs at most
+that many jobs at once across all workers: claims lock the
+:class:`~blog.models.BackgroundJobQueue` rows of their queues, so workers
+admit jobs one after another.
+
+A task that raises is retried with exponential backoff from
+``BLOG_JOB_RETRY_DELAY`` until ``max_attempts``; :class:`PermanentFailure`
+fails it at once and :class:`Deferred` puts it back in the queue for later
+without spending an attempt. Failed jobs keep ``{"detail", "status_code"}`` as result
+for the clients polling them. With ``BLOG_JOBS_EAGER`` jobs run inline as
+soon as they are enqueued, in a single attempt (tests, development without
+a worker).
+"""
+from __future__ import annotations
+
+import logging
+from datetime import timedelta
+from typing import Any, Callable, Iterable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from .models import BackgroundJob, BackgroundJobQueue
+
+logger = logging.getLogger(__name__)
+
+Status = BackgroundJob.Status
+
+#: Registered tasks by name.
+TASKS: dict[str, Callable[[dict], Any]] = {}
+#: Lease owner of the jobs run inline in eager mode.
+EAGER_OWNER = "eager"
+
+#: Priorities: someone waits on the job, regular work, maintenance.
+HIGH_PRIORITY = 10
+NORMAL_PRIORITY = 0
+LOW_PRIORITY = -10
+
+
+class PermanentFailure(Exception):
+    """Raised by a task whose job must fail without further attempts."""
+
+    def __init__(self, detail: str, *, status_code: Optional[int] = None):
+        super().__init__(detail)
+        self.detail = detail
+        self.status_code = status_code
+
+
+class Deferred(Exception):
+    """Raised by a task that cannot run yet, e.g. while OpenAI limits are reached."""
+
+    def __init__(self, detail: str, *, retry_after: float, status_code: Optional[int] = None):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+
+def task(name: str) -> Callable:
+    """Register the decorated ``function(payload)`` as task ``name``."""
+
+    def register(function: Callable[[dict], Any]) -> Callable[[dict], Any]:
+        TASKS[name] = function
+        return function
+
+    return register
+
+
+def queues() -> dict[str, int]:
+    """Configured queues and their concurrency across all workers."""
+
+    return {
+        name: max(1, int(limit))
+        for name, limit in getattr(settings, "BLOG_JOB_QUEUES", {"default": 1}).items()
+    }
+
+
+def lease_seconds() -> int:
+    return max(1, int(getattr(settings, "BLOG_JOB_LEASE_SECONDS", 120)))
+
+
+def eager() -> bool:
+    return bool(getattr(settings, "BLOG_JOBS_EAGER", False))
+
+
+def enqueue(
+    name: str,
+    payload: Optional[dict] = None,
+    *,
+    queue: str = "default",
+    priority: int = NORMAL_PRIORITY,
+    max_attempts: int = 3,
+    user=None,
+) -> BackgroundJob:
+    """Queue task ``name``; in eager mode the returned job has already run."""
+
+    if name not in TASKS:
+        raise KeyError(f"Tarea no registrada: {name}")
+    if queue not in queues():
+        raise KeyError(f"Cola no configurada: {queue}")
+    run_inline = eager()
+    job = BackgroundJob.objects.create(
+        queue=queue,
+        task=name,
+        payload=payload or {},
+        priority=priority,
+        # No worker would pick up the retries of an inline job.
+        max_attempts=1 if run_inline else max(1, max_attempts),
+        created_by_id=user.pk if getattr(user, "is_authenticated", False) else None,
+    )
+    if run_inline:
+        job.status, job.attempts, job.lease_owner = Status.RUNNING, 1, EAGER_OWNER
+        job.leased_until = timezone.now() + timedelta(seconds=lease_seconds())
+        job.save(update_fields=["status", "attempts", "lease_owner", "leased_until"])
+        execute(job)
+    return job
+
+
+def _claimable(now) -> Q:
+    expired = Q(status=Status.RUNNING, leased_until__lt=now, attempts__lt=F("max_attempts"))
+    return Q(status=Status.QUEUED, run_after__lte=now) | expired
+
+
+def expire_leases() -> int:
+    """Fail the running jobs whose lease expired after their last attempt."""
+
+    return BackgroundJob.objects.filter(
+        status=Status.RUNNING, leased_until__lt=timezone.now(), attempts__gte=F("max_attempts")
+    ).update(
+        status=Status.FAILED,
+        finished_at=timezone.now(),
+        leased_until=None,
+        error="La reserva expiró en el último intento.",
+        result={"detail": "La tarea no terminó a tiempo.", "status_code": None},
+    )
+
+
+def _lock_queues(names: list[str]) -> None:
+    BackgroundJobQueue.objects.bulk_create(
+        [BackgroundJobQueue(name=name) for name in names], ignore_conflicts=True
+    )
+    # Sorted so workers claiming several queues lock them in the same order.
+    list(BackgroundJobQueue.objects.select_for_update().filter(name__in=names).order_by("name"))
+
+
+def claim(
+    owner: str, queue_names: Optional[Iterable[str]] = None, limit: int = 1
+) -> list[BackgroundJob]:
+    """Lease up to ``limit`` due jobs to ``owner``, highest priority first.
+
+    Queues at their concurrency limit are skipped. The running jobs are
+    counted and the new ones taken while the queue rows are locked, so
+    concurrent workers neither exceed the limits nor run a job twice.
+    """
+
+    configured = queues()
+    names = sorted({name for name in (queue_names or configured) if name in configured})
+    if limit < 1 or not names:
+        return []
+    claimed = []
+    with transaction.atomic():
+        _lock_queues(names)
+        now = timezone.now()
+        running = dict(
+            BackgroundJob.objects.filter(
+                queue__in=names, status=Status.RUNNING, leased_until__gte=now
+            )
+            .values_list("queue")
+            .annotate(total=Count("pk"))
+            .order_by()
+        )
+        slots = {name: configured[name] - running.get(name, 0) for name in names}
+        open_queues = [name for name, free in slots.items() if free > 0]
+        if not open_queues:
+            return []
+
+        candidates = (
+            BackgroundJob.objects.filter(_claimable(now), queue__in=open_queues)
+            .order_by("-priority", "run_after", "pk")
+            .values_list("pk", "queue")[: limit * 4]
+        )
+        for pk, queue in candidates:
+            if len(claimed) >= limit:
+                break
+            if slots[queue] <= 0:
+                continue
+            taken = BackgroundJob.objects.filter(_claimable(now), pk=pk).update(
+                status=Status.RUNNING,
+                lease_owner=owner,
+                leased_until=now + timedelta(seconds=lease_seconds()),
+                attempts=F("attempts") + 1,
+            )
+            if taken:
+                slots[queue] -= 1
+                claimed.append(pk)
+    return list(BackgroundJob.objects.filter(pk__in=claimed).order_by("-priority", "run_after", "pk"))
+
+
+def extend_leases(owner: str, job_ids: Iterable[int]) -> int:
+    """Renew the leases ``owner`` holds on ``job_ids``."""
+
+    return BackgroundJob.objects.filter(
+        pk__in=list(job_ids), lease_owner=owner, status=Status.RUNNING
+    ).update(leased_until=timezone.now() + timedelta(seconds=lease_seconds()))
+
+
+def _retry_delay(attempt: int) -> float:
+    base = float(getattr(settings, "BLOG_JOB_RETRY_DELAY", 15.0))
+    return base * (2 ** max(0, attempt - 1))
+
+
+def _save_outcome(job: BackgroundJob, **fields) -> bool:
+    """Write the outcome unless another worker took the job over meanwhile."""
+
+    fields.update(leased_until=None)
+    updated = BackgroundJob.objects.filter(
+        pk=job.pk, status=Status.RUNNING, lease_owner=job.lease_owner
+    ).update(**fields)
+    for name, value in fields.items():
+        setattr(job, name, value)
+    return bool(updated)
+
+
+def execute(job: BackgroundJob) -> BackgroundJob:
+    """Run a claimed job and record its result, retry or failure."""
+
+    function = TASKS.get(job.task)
+    try:
+        if function is None:
+            raise PermanentFailure(f"Tarea no registrada: {job.task}")
+        result = function(job.payload)
+    except Deferred as exc:
+        result = {"detail": exc.detail, "status_code": exc.status_code, "retry_after": exc.retry_after}
+        if job.lease_owner == EAGER_OWNER:
+            # Nobody would run it later: the caller gets the error and retries.
+            _save_outcome(
+                job, status=Status.FAILED, finished_at=timezone.now(), error=exc.detail, result=result
+            )
+        else:
+            _save_outcome(
+                job,
+                status=Status.QUEUED,
+                attempts=job.attempts - 1,
+                error=exc.detail,
+                run_after=timezone.now() + timedelta(seconds=exc.retry_after),
+            )
+    except PermanentFailure as exc:
+        _save_outcome(
+            job,
+            status=Status.FAILED,
+            finished_at=timezone.now(),
+            error=exc.detail,
+            result={"detail": exc.detail, "status_code": exc.status_code},
+        )
+    except Exception as exc:  # noqa: BLE001 - any task error is retried
+        logger.warning("Job %s (%s) failed on attempt %s: %s", job.pk, job.task, job.attempts, exc)
+        if job.attempts >= job.max_attempts:
+            _save_outcome(
+                job,
+                status=Status.FAILED,
+                finished_at=timezone.now(),
+                error=repr(exc),
+                result={"detail": str(exc), "status_code": getattr(exc, "status_code", None)},
+            )
+        else:
+            _save_outcome(
+                job,
+                status=Status.QUEUED,
+                error=repr(exc),
+                run_after=timezone.now() + timedelta(seconds=_retry_delay(job.attempts)),
+            )
+    else:
+        _save_outcome(job, status=Status.SUCCEEDED, finished_at=timezone.now(), result=result, error="")
+    return job
+
+
+def prune(days: Optional[int] = None) -> int:
+    """Delete the jobs finished more than ``BLOG_JOB_RETENTION_DAYS`` ago."""
+
+    if days is None:
+        days = int(getattr(settings, "BLOG_JOB_RETENTION_DAYS", 7))
+    deleted, _ = BackgroundJob.objects.filter(
+        finished_at__lt=timezone.now() - timedelta(days=max(0, days))
+    ).delete()
+    return deleted
@@ -0,0 +1,161 @@
+"""Print query plans and timings for the post list querysets."""
+from __future__ import annotations
+
+import gc
+import time
+from typing import Dict, List
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from ... import models
+from ...models import Category, Post, Tag, warm_rewrite_plans
+from ...views import PostViewSet
+
+DEFAULT_SCENARIOS: Dict[str, Dict[str, str]] = {
+    "listado": {},
+    "categoria": {"category": "backend"},
+    "tag": {"tags__name": "django"},
+    "busqueda": {"search": "django"},
+    "orden-titulo": {"ordering": "title"},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Muestra el plan de ejecución (EXPLAIN) y el tiempo de las consultas del "
+        "listado de posts para comparar estrategias de filtrado entre motores."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--param",
+            action="append",
+            default=[],
+            metavar="CLAVE=VALOR",
+            help="Parámetro de consulta adicional; sustituye los escenarios por defecto.",
+        )
+        parser.add_argument(
+            "--lang",
+            default=None,
+            help="Idioma activo con el que se construye la consulta.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Número de ejecuciones para promediar el tiempo.",
+        )
+        parser.add_argument(
+            "--construction",
+            action="store_true",
+            help=(
+                "Mide solo la construcción de los querysets (sin ejecutarlos), con y sin "
+                "los planes de reescritura de lookups traducidos en caché."
+            ),
+        )
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Usa EXPLAIN ANALYZE cuando el motor lo soporta (PostgreSQL).",
+        )
+
+    def handle(self, *args, **options) -> None:
+        scenarios = DEFAULT_SCENARIOS
+        if options["param"]:
+            scenarios = {"personalizado": self._parse_params(options["param"])}
+
+        repeat = max(1, int(options["repeat"]))
+        explain_options = {}
+        if options["analyze"] and connection.vendor == "postgresql":
+            explain_options = {"analyze": True, "buffers": True}
+
+        if options["construction"]:
+            self._time_construction(scenarios, options["lang"], repeat)
+            return
+
+        self.stdout.write(f"Motor: {connection.vendor}")
+        for name, params in scenarios.items():
+            if options["lang"]:
+                params = {**params, "lang": options["lang"]}
+            queryset = self._build_queryset(params)
+            page = queryset[:10]
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"== {name} {params or ''}"))
+            self.stdout.write(str(page.query))
+            self.stdout.write(page.explain(**explain_options))
+
+            count_timings = self._time(lambda: queryset.all().count(), repeat)
+            page_timings = self._time(lambda: list(page.all()), repeat)
+            self.stdout.write(
+                f"count(): {self._summary(count_timings)} | "
+                f"primera página: {self._summary(page_timings)}"
+            )
+
+    def _parse_params(self, raw_params: List[str]) -> Dict[str, str]:
+        params: Dict[str, str] = {}
+        for raw in raw_params:
+            key, sep, value = raw.partition("=")
+            if not sep or not key:
+                raise CommandError(f"Parámetro inválido: {raw!r}. Usa CLAVE=VALOR.")
+            params[key] = value
+        return params
+
+    def _time_construction(self, scenarios, lang, repeat: int) -> None:
+        for name, params in scenarios.items():
+            if lang:
+                params = {**params, "lang": lang}
+            view = self._build_view(params)
+
+            def build():
+                return view.filter_queryset(view.get_queryset())
+
+            def build_cold():
+                models._REWRITE_PLANS.clear()
+                return build()
+
+            # Collections triggered by earlier allocations would dominate the timings.
+            gc.collect()
+            gc.disable()
+            try:
+                cold = self._time(build_cold, repeat)
+                warm_rewrite_plans(Post, Category, Tag)
+                warm = self._time(build, repeat)
+            finally:
+                gc.enable()
+            self.stdout.write(
+                f"{name}: con planes {self._summary(warm, 1000, 'µs')} | "
+                f"sin planes {self._summary(cold, 1000, 'µs')}"
+            )
+
+    def _build_queryset(self, params: Dict[str, str]):
+        view = self._build_view(params)
+        return view.filter_queryset(view.get_queryset())
+
+    def _build_view(self, params: Dict[str, str]) -> PostViewSet:
+        django_request = APIRequestFactory().get("/api/posts/", params)
+        django_request.user = AnonymousUser()
+        view = PostViewSet()
+        view.action = "list"
+        view.format_kwarg = None
+        view.kwargs = {}
+        view.request = Request(django_request)
+        view.request.user = AnonymousUser()
+        view.language_code = view.request.query_params.get("lang") or view.language_code
+        return view
+
+    def _time(self, func, repeat: int) -> List[float]:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+
+    def _summary(self, timings: List[float], scale: float = 1, unit: str = "ms") -> str:
+        ordered = sorted(timing * scale for timing in timings)
+        median = ordered[len(ordered) // 2]
+        return f"mediana {median:.2f} {unit} (mín {ordered[0]:.2f} {unit})"
@@ -0,0 +1,42 @@
+"""Repair the denormalized reaction counters."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ... import reaction_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula los contadores de reacciones por objeto y tipo a partir de la "
+        "tabla de reacciones y corrige las desviaciones por lotes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Número de objetos revisados por transacción.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Solo informa de las desviaciones sin escribir cambios.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        batch_size = max(1, int(options["batch_size"]))
+        checked = corrected = 0
+        for content_type_id, object_ids in reaction_counters.targets().items():
+            for start in range(0, len(object_ids), batch_size):
+                batch = object_ids[start : start + batch_size]
+                checked += len(batch)
+                if options["dry_run"]:
+                    corrected += len(reaction_counters.drifted(content_type_id, batch))
+                    continue
+                with transaction.atomic():
+                    corrected += reaction_counters.rebuild(content_type_id, batch)
+        verb = "con desviación" if options["dry_run"] else "corregidos"
+        self.stdout.write(f"Contadores de reacciones: {corrected} {verb} en {checked} objetos.")
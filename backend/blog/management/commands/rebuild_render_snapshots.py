@@ -0,0 +1,104 @@
+"""Precompute the render snapshots served to anonymous readers."""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from ... import jobs, snapshots
+
+
+def _init_worker() -> None:
+    # Forked workers must not reuse the parent's database connections.
+    if not apps.ready:
+        django.setup()
+    connections.close_all()
+
+
+def _build_batch(post_ids: list[int], languages: list[str], expanded_variants: tuple[bool, ...]) -> int:
+    try:
+        return snapshots.build(post_ids, languages, expanded_variants)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Regenera las instantáneas de render (payload de detalle y de listado por "
+        "idioma) de todas las entradas públicas, repartiendo el trabajo entre procesos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Número de procesos en paralelo (1 = en el proceso actual).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Número de entradas procesadas por lote.",
+        )
+        parser.add_argument(
+            "--language",
+            action="append",
+            dest="languages",
+            help="Idioma a regenerar (repetible). Por defecto, todos los de LANGUAGES.",
+        )
+        parser.add_argument(
+            "--with-expanded",
+            action="store_true",
+            help="Genera también las variantes con expand=translations.",
+        )
+        parser.add_argument(
+            "--enqueue",
+            action="store_true",
+            help="Encola la regeneración en la cola maintenance en lugar de ejecutarla.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        available = snapshots.language_codes()
+        languages = options["languages"] or available
+        unknown = sorted(set(languages) - set(available))
+        if unknown:
+            raise CommandError(f"Idiomas no configurados: {', '.join(unknown)}.")
+        expanded_variants = (False, True) if options["with_expanded"] else (False,)
+        batch_size = max(1, int(options["batch_size"]))
+        workers = max(1, int(options["workers"]))
+        if options["enqueue"]:
+            job = jobs.enqueue(
+                "blog.rebuild_render_snapshots",
+                {
+                    "languages": languages,
+                    "with_expanded": options["with_expanded"],
+                    "batch_size": batch_size,
+                },
+                queue="maintenance",
+                priority=jobs.LOW_PRIORITY,
+            )
+            self.stdout.write(self.style.SUCCESS(f"Regeneración encolada (tarea {job.pk})."))
+            return
+
+        post_ids = snapshots.public_post_ids()
+        batches = [post_ids[start : start + batch_size] for start in range(0, len(post_ids), batch_size)]
+        if workers == 1 or len(batches) <= 1:
+            total = sum(snapshots.build(batch, languages, expanded_variants) for batch in batches)
+        else:
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+                total = sum(
+                    executor.map(
+                        _build_batch,
+                        batches,
+                        [languages] * len(batches),
+                        [expanded_variants] * len(batches),
+                    )
+                )
+        self.stdout.write(
+            self.style.SUCCESS(f"Instantáneas generadas: {total} ({len(post_ids)} entradas).")
+        )
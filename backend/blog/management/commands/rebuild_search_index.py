@@ -0,0 +1,45 @@
+"""Rebuild the full-text search documents of every post translation."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import NotSupportedError, transaction
+
+from ... import search
+
+
+class Command(BaseCommand):
+    help = (
+        "Regenera el índice de búsqueda de texto completo (FTS5 en SQLite, "
+        "tsvector + GIN en PostgreSQL) para todas las traducciones de posts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Número de traducciones indexadas por lote.",
+        )
+        parser.add_argument(
+            "--if-needed",
+            action="store_true",
+            help="Solo regenera el índice si todavía no se ha construido.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["if_needed"]:
+            if search.get_backend() is None:
+                self.stdout.write("La base de datos no dispone del índice de búsqueda.")
+                return
+            if search.is_ready():
+                self.stdout.write("El índice de búsqueda ya está construido.")
+                return
+        try:
+            with transaction.atomic():
+                total = search.rebuild(batch_size=max(1, int(options["batch_size"])))
+        except NotSupportedError as exc:
+            raise CommandError(
+                "La base de datos no dispone del índice de búsqueda; aplica las migraciones "
+                "en SQLite con FTS5 o PostgreSQL."
+            ) from exc
+        self.stdout.write(self.style.SUCCESS(f"Documentos indexados: {total}."))
@@ -0,0 +1,38 @@
+"""Repair the comment and reaction totals stored on posts."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ... import post_counters
+from ...models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula `comment_count` y `reaction_total` de las entradas a partir de "
+        "los comentarios y reacciones y corrige las desviaciones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Número de entradas corregidas por transacción.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Solo informa de las desviaciones sin escribir cambios.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        batch_size = max(1, int(options["batch_size"]))
+        drifted = post_counters.drifted_ids()
+        if not options["dry_run"]:
+            for start in range(0, len(drifted), batch_size):
+                with transaction.atomic():
+                    post_counters.recount(drifted[start : start + batch_size])
+        verb = "con desviación" if options["dry_run"] else "corregidas"
+        self.stdout.write(f"Entradas: {len(drifted)} {verb} de {Post._base_manager.count()}.")
@@ -0,0 +1,51 @@
+"""Repair the denormalized post counters of categories and tags."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Q
+
+from ... import counters
+from ...models import Category, Tag
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula `post_count` y `published_post_count` de categorías y etiquetas "
+        "a partir de las relaciones con entradas y corrige las desviaciones."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Número de filas corregidas por transacción.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Solo informa de las desviaciones sin escribir cambios.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        batch_size = max(1, int(options["batch_size"]))
+        for label, model in (("Categorías", Category), ("Etiquetas", Tag)):
+            drifted = self._drifted_ids(model)
+            if not options["dry_run"]:
+                for start in range(0, len(drifted), batch_size):
+                    with transaction.atomic():
+                        counters.recount(model, drifted[start : start + batch_size])
+            verb = "con desviación" if options["dry_run"] else "corregidas"
+            self.stdout.write(f"{label}: {len(drifted)} {verb} de {model._base_manager.count()}.")
+
+    def _drifted_ids(self, model) -> list[int]:
+        expected = counters.expected_counts(model)
+        queryset = model._base_manager.annotate(
+            _expected_total=expected["post_count"],
+            _expected_published=expected["published_post_count"],
+        ).filter(
+            ~Q(post_count=F("_expected_total"))
+            | ~Q(published_post_count=F("_expected_published"))
+        )
+        return list(queryset.order_by("pk").values_list("pk", flat=True))
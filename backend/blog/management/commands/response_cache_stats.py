@@ -0,0 +1,31 @@
+"""Report hit/miss counters of the anonymous response cache."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from ... import response_cache
+
+
+class Command(BaseCommand):
+    help = (
+        "Muestra los aciertos y fallos de la caché de respuestas anónimas por "
+        "recurso para dimensionarla."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Pone a cero los contadores después de mostrarlos.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        for scope, counts in response_cache.stats(response_cache.SCOPES).items():
+            total = counts["hit"] + counts["miss"]
+            ratio = (counts["hit"] / total * 100) if total else 0.0
+            self.stdout.write(
+                f"{scope}: {counts['hit']} aciertos, {counts['miss']} fallos ({ratio:.1f}% de aciertos)."
+            )
+        if options["reset"]:
+            response_cache.reset_stats(response_cache.SCOPES)
+            self.stdout.write("Contadores reiniciados.")
@@ -0,0 +1,132 @@
+"""Run the jobs of the database-backed queue (``blog.jobs``)."""
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connections
+
+from ... import jobs
+
+logger = logging.getLogger(__name__)
+
+#: Seconds between two purges of the finished jobs.
+PRUNE_INTERVAL = 3600
+
+
+def _run(job) -> None:
+    try:
+        jobs.execute(job)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Ejecuta las tareas en segundo plano (traducciones, emails, mantenimiento) "
+        "respetando la prioridad y la concurrencia de cada cola."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--queue",
+            action="append",
+            dest="queues",
+            help="Cola a atender (repetible). Por defecto, todas las de BLOG_JOB_QUEUES.",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=4,
+            help="Número de tareas ejecutadas a la vez por este worker.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Segundos de espera cuando no hay tareas pendientes.",
+        )
+        parser.add_argument(
+            "--max-jobs",
+            type=int,
+            default=0,
+            help="Termina tras ejecutar este número de tareas (0 = sin límite).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Ejecuta las tareas pendientes y termina.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        configured = jobs.queues()
+        queue_names = options["queues"] or list(configured)
+        unknown = sorted(set(queue_names) - set(configured))
+        if unknown:
+            raise CommandError(f"Colas no configuradas: {', '.join(unknown)}.")
+        threads = max(1, int(options["threads"]))
+        poll_interval = max(0.05, float(options["poll_interval"]))
+        max_jobs = max(0, int(options["max_jobs"]))
+        owner = f"{socket.gethostname()}:{os.getpid()}"
+
+        stop = threading.Event()
+        previous = {}
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                previous[signum] = signal.signal(signum, lambda *_args: stop.set())
+        try:
+            done = self._work(owner, queue_names, threads, poll_interval, max_jobs, options["once"], stop)
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+        self.stdout.write(self.style.SUCCESS(f"Worker {owner} detenido: {done} tareas ejecutadas."))
+
+    def _work(self, owner, queue_names, threads, poll_interval, max_jobs, once, stop) -> int:
+        """Claim and run jobs until ``stop`` is set; return how many ran."""
+
+        self.stdout.write(f"Worker {owner} atendiendo: {', '.join(queue_names)}.")
+        renew_every = jobs.lease_seconds() / 3
+        renewed_at = pruned_at = 0.0
+        running: dict = {}
+        done = 0
+        with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="blog-job") as executor:
+            while not stop.is_set():
+                close_old_connections()
+                now = time.monotonic()
+                if now - renewed_at >= renew_every:
+                    jobs.extend_leases(owner, running.values())
+                    jobs.expire_leases()
+                    renewed_at = now
+                if now - pruned_at >= PRUNE_INTERVAL:
+                    jobs.prune()
+                    pruned_at = now
+
+                free = threads - len(running)
+                if max_jobs:
+                    free = min(free, max_jobs - done - len(running))
+                claimed = jobs.claim(owner, queue_names, free) if free > 0 else []
+                for job in claimed:
+                    running[executor.submit(_run, job)] = job.pk
+
+                if not running:
+                    if once or (max_jobs and done >= max_jobs):
+                        break
+                    stop.wait(poll_interval)
+                    continue
+                finished, _pending = wait(
+                    running, timeout=min(poll_interval, renew_every), return_when=FIRST_COMPLETED
+                )
+                for future in finished:
+                    job_id = running.pop(future)
+                    done += 1
+                    if future.exception() is not None:
+                        # The lease expires and another attempt picks the job up.
+                        logger.error("Job %s crashed: %r", job_id, future.exception())
+            jobs.extend_leases(owner, running.values())
+        return done
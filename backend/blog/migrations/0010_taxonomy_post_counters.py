@@ -0,0 +1,69 @@
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+PUBLIC_POST_STATUSES = ["published"]
+
+
+def backfill_post_counters(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    for field_name in ("tags", "categories"):
+        field = Post._meta.get_field(field_name)
+        through = field.remote_field.through
+        column = field.m2m_reverse_field_name()
+
+        def _count(condition=None):
+            return Coalesce(
+                Subquery(
+                    through.objects.filter(condition or Q(), **{column: OuterRef("pk")})
+                    .values(column)
+                    .annotate(total=Count("pk"))
+                    .values("total")
+                ),
+                Value(0),
+                output_field=IntegerField(),
+            )
+
+        field.related_model._base_manager.update(
+            post_count=_count(),
+            published_post_count=_count(Q(post__status__in=PUBLIC_POST_STATUSES)),
+        )
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0009_alter_comment_options_alter_post_options"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="post_count",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Entradas"),
+        ),
+        migrations.AddField(
+            model_name="category",
+            name="published_post_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Entradas publicadas"
+            ),
+        ),
+        migrations.AddField(
+            model_name="tag",
+            name="post_count",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Entradas"),
+        ),
+        migrations.AddField(
+            model_name="tag",
+            name="published_post_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Entradas publicadas"
+            ),
+        ),
+        migrations.RunPython(backfill_post_counters, noop),
+    ]
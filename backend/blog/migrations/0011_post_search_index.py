@@ -0,0 +1,78 @@
+import django.db.models.deletion
+from django.db import OperationalError, migrations, models
+
+import blog.models
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE blog_post_search USING fts5("
+    "title, taxonomy, body, "
+    "translation_id UNINDEXED, post_id UNINDEXED, language_code UNINDEXED, "
+    "tokenize = 'unicode61 remove_diacritics 2')"
+)
+# Title matches weigh more than tag/category names, which weigh more than the body.
+SQLITE_RANK = "INSERT INTO blog_post_search (blog_post_search, rank) VALUES ('rank', 'bm25(10.0, 4.0, 1.0)')"
+
+POSTGRES_CREATE = [
+    "CREATE TABLE blog_post_search ("
+    "translation_id bigint PRIMARY KEY REFERENCES blog_post_translation (id) "
+    "ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, "
+    "post_id bigint NOT NULL, "
+    "language_code varchar(15) NOT NULL, "
+    "document tsvector NOT NULL)",
+    "CREATE INDEX blog_post_search_document_gin ON blog_post_search USING GIN (document)",
+    "CREATE INDEX blog_post_search_post_lang ON blog_post_search (post_id, language_code)",
+]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        try:
+            schema_editor.execute(SQLITE_CREATE)
+        except OperationalError:
+            # SQLite built without FTS5: the API keeps the icontains search.
+            return
+        schema_editor.execute(SQLITE_RANK)
+    elif vendor == "postgresql":
+        for statement in POSTGRES_CREATE:
+            schema_editor.execute(statement)
+    # Existing posts are indexed by ``manage.py rebuild_search_index`` (run by
+    # the deploy entrypoint) so the migration neither depends on the current
+    # models nor holds up ``migrate``; see 0027 for the fallback meanwhile.
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in {"sqlite", "postgresql"}:
+        schema_editor.execute("DROP TABLE IF EXISTS blog_post_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0010_taxonomy_post_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostSearchEntry",
+            fields=[
+                ("translation_id", models.BigIntegerField(primary_key=True, serialize=False)),
+                (
+                    "post",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="search_entries",
+                        to="blog.post",
+                    ),
+                ),
+                ("language_code", models.CharField(max_length=15)),
+                ("document", blog.models.SearchDocumentField()),
+            ],
+            options={
+                "db_table": "blog_post_search",
+                "managed": False,
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
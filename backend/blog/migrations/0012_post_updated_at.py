@@ -0,0 +1,23 @@
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0011_post_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                db_index=True,
+                default=django.utils.timezone.now,
+                verbose_name="Actualizado",
+            ),
+            preserve_default=False,
+        ),
+    ]
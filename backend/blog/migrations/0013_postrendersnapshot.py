@@ -0,0 +1,65 @@
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0012_post_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PostRenderSnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("language_code", models.CharField(max_length=15, verbose_name="Idioma")),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("detail", "Detalle"), ("list", "Listado")],
+                        max_length=10,
+                        verbose_name="Tipo",
+                    ),
+                ),
+                ("expanded", models.BooleanField(default=False, verbose_name="Con traducciones")),
+                ("slug", models.SlugField(max_length=255, verbose_name="Slug")),
+                (
+                    "payload",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        verbose_name="Contenido",
+                    ),
+                ),
+                ("dependencies", models.JSONField(default=list, verbose_name="Dependencias")),
+                ("source_updated_at", models.DateTimeField(verbose_name="Versión de la entrada")),
+                ("built_at", models.DateTimeField(verbose_name="Generada")),
+                (
+                    "post",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="render_snapshots",
+                        to="blog.post",
+                        verbose_name="Entrada",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Instantánea de entrada",
+                "verbose_name_plural": "Instantáneas de entradas",
+                "indexes": [
+                    models.Index(
+                        fields=["slug", "language_code", "kind", "expanded"],
+                        name="blog_post_snapshot_slug_idx",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("post", "language_code", "kind", "expanded"),
+                        name="blog_post_snapshot_uniq_variant",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0013_postrendersnapshot"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="postrendersnapshot",
+            name="blog_post_snapshot_slug_idx",
+        ),
+        migrations.RemoveField(
+            model_name="postrendersnapshot",
+            name="slug",
+        ),
+    ]
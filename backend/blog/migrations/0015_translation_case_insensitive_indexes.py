@@ -0,0 +1,32 @@
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0014_remove_postrendersnapshot_slug"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="posttranslation",
+            index=models.Index(Lower("slug"), models.F("language_code"), name="blog_post_tr_slug_ci_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="categorytranslation",
+            index=models.Index(Lower("slug"), models.F("language_code"), name="blog_category_tr_slug_ci_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="categorytranslation",
+            index=models.Index(Lower("name"), models.F("language_code"), name="blog_category_tr_name_ci_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tagtranslation",
+            index=models.Index(Lower("slug"), models.F("language_code"), name="blog_tag_tr_slug_ci_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="tagtranslation",
+            index=models.Index(Lower("name"), models.F("language_code"), name="blog_tag_tr_name_ci_idx"),
+        ),
+    ]
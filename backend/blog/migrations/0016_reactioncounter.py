@@ -0,0 +1,83 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+BATCH_SIZE = 1000
+
+
+def backfill_reaction_counters(apps, schema_editor):
+    Reaction = apps.get_model("blog", "Reaction")
+    ReactionCounter = apps.get_model("blog", "ReactionCounter")
+    rows = (
+        Reaction.objects.values("content_type_id", "object_id", "type")
+        .annotate(total=Count("pk"))
+        .order_by()
+    )
+    ReactionCounter.objects.bulk_create(
+        (
+            ReactionCounter(
+                content_type_id=row["content_type_id"],
+                object_id=row["object_id"],
+                type=row["type"],
+                count=row["total"],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("blog", "0015_translation_case_insensitive_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReactionCounter",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("object_id", models.PositiveBigIntegerField()),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[
+                            ("like", "Me gusta"),
+                            ("love", "Me encanta"),
+                            ("clap", "Aplausos"),
+                            ("wow", "Asombro"),
+                            ("laugh", "Me divierte"),
+                            ("insight", "Interesante"),
+                        ],
+                        max_length=20,
+                        verbose_name="Tipo",
+                    ),
+                ),
+                ("count", models.PositiveIntegerField(default=0, verbose_name="Total")),
+                (
+                    "content_type",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="contenttypes.contenttype",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Contador de reacciones",
+                "verbose_name_plural": "Contadores de reacciones",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("content_type", "object_id", "type"),
+                        name="blog_reaction_counter_uniq_type",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_reaction_counters, noop),
+    ]
@@ -0,0 +1,59 @@
+from django.db import migrations
+from django.db.models import Count, Max
+
+BATCH_SIZE = 1000
+
+
+def keep_latest_reaction(apps, schema_editor):
+    Reaction = apps.get_model("blog", "Reaction")
+    ReactionCounter = apps.get_model("blog", "ReactionCounter")
+    latest = (
+        Reaction.objects.values("user_id", "content_type_id", "object_id")
+        .annotate(latest=Max("pk"))
+        .values("latest")
+        .order_by()
+    )
+    removed, _details = Reaction.objects.exclude(pk__in=latest).delete()
+    if not removed:
+        return
+    ReactionCounter.objects.all().delete()
+    rows = (
+        Reaction.objects.values("content_type_id", "object_id", "type")
+        .annotate(total=Count("pk"))
+        .order_by()
+    )
+    ReactionCounter.objects.bulk_create(
+        (
+            ReactionCounter(
+                content_type_id=row["content_type_id"],
+                object_id=row["object_id"],
+                type=row["type"],
+                count=row["total"],
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0016_reactioncounter"),
+    ]
+
+    operations = [
+        migrations.RunPython(keep_latest_reaction, noop),
+        migrations.AlterUniqueTogether(
+            name="reaction",
+            unique_together={("user", "content_type", "object_id")},
+        ),
+        migrations.RemoveIndex(
+            model_name="reaction",
+            name="blog_reacti_user_id_b9b50e_idx",
+        ),
+    ]
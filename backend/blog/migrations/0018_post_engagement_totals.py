@@ -0,0 +1,57 @@
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_post_totals(apps, schema_editor):
+    Post = apps.get_model("blog", "Post")
+    Comment = apps.get_model("blog", "Comment")
+    Reaction = apps.get_model("blog", "Reaction")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    content_type = ContentType.objects.filter(app_label="blog", model="post").first()
+
+    def _count(queryset, column):
+        return Coalesce(
+            Subquery(
+                queryset.filter(**{column: OuterRef("pk")})
+                .order_by()
+                .values(column)
+                .annotate(total=Count("pk"))
+                .values("total")
+            ),
+            Value(0),
+            output_field=IntegerField(),
+        )
+
+    updates = {"comment_count": _count(Comment.objects.all(), "post_id")}
+    if content_type is not None:
+        updates["reaction_total"] = _count(
+            Reaction.objects.filter(content_type=content_type), "object_id"
+        )
+    Post.objects.update(**updates)
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("blog", "0017_reaction_one_per_user"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="post",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Comentarios"),
+        ),
+        migrations.AddField(
+            model_name="post",
+            name="reaction_total",
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name="Reacciones"),
+        ),
+        migrations.RunPython(backfill_post_totals, noop),
+    ]
@@ -0,0 +1,33 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0019_comment_post_created_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranslationMemoryEntry",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("key", models.CharField(max_length=64, unique=True, verbose_name="Clave")),
+                ("translation", models.TextField(verbose_name="Traducción")),
+                ("target_language", models.CharField(max_length=15, verbose_name="Idioma destino")),
+                (
+                    "created_at",
+                    models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name="Creada"),
+                ),
+                (
+                    "last_used_at",
+                    models.DateTimeField(db_index=True, default=django.utils.timezone.now, verbose_name="Último uso"),
+                ),
+            ],
+            options={
+                "verbose_name": "Traducción memorizada",
+                "verbose_name_plural": "Memoria de traducciones",
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0020_translationmemoryentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="posttranslation",
+            name="source_hash",
+            field=models.CharField(
+                blank=True, default="", editable=False, max_length=64, verbose_name="Hash del origen"
+            ),
+        ),
+    ]
@@ -0,0 +1,91 @@
+import django.core.serializers.json
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("blog", "0021_posttranslation_source_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BackgroundJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("queue", models.CharField(max_length=50, verbose_name="Cola")),
+                ("task", models.CharField(max_length=100, verbose_name="Tarea")),
+                (
+                    "payload",
+                    models.JSONField(
+                        default=dict,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        verbose_name="Datos",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("queued", "En cola"),
+                            ("running", "En ejecución"),
+                            ("succeeded", "Completado"),
+                            ("failed", "Fallido"),
+                        ],
+                        default="queued",
+                        max_length=20,
+                        verbose_name="Estado",
+                    ),
+                ),
+                ("priority", models.SmallIntegerField(default=0, verbose_name="Prioridad")),
+                ("attempts", models.PositiveSmallIntegerField(default=0, verbose_name="Intentos")),
+                ("max_attempts", models.PositiveSmallIntegerField(default=3, verbose_name="Intentos máximos")),
+                (
+                    "run_after",
+                    models.DateTimeField(default=django.utils.timezone.now, verbose_name="Ejecutar a partir de"),
+                ),
+                ("leased_until", models.DateTimeField(blank=True, null=True, verbose_name="Reservado hasta")),
+                ("lease_owner", models.CharField(blank=True, max_length=100, verbose_name="Reservado por")),
+                (
+                    "result",
+                    models.JSONField(
+                        blank=True,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        null=True,
+                        verbose_name="Resultado",
+                    ),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="Error")),
+                ("created_at", models.DateTimeField(auto_now_add=True, verbose_name="Creado")),
+                (
+                    "finished_at",
+                    models.DateTimeField(blank=True, db_index=True, null=True, verbose_name="Finalizado"),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="background_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Creado por",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Tarea en segundo plano",
+                "verbose_name_plural": "Tareas en segundo plano",
+                "ordering": ["-created_at", "-id"],
+                "indexes": [
+                    models.Index(
+                        fields=["queue", "status", "-priority", "run_after"], name="job_claim_idx"
+                    )
+                ],
+            },
+        ),
+    ]
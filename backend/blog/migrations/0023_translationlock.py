@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0022_backgroundjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TranslationLock",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("key", models.CharField(max_length=64, unique=True, verbose_name="Clave")),
+                ("owner", models.CharField(max_length=100, verbose_name="Propietario")),
+                ("expires_at", models.DateTimeField(db_index=True, verbose_name="Expira")),
+            ],
+            options={
+                "verbose_name": "Traducción en curso",
+                "verbose_name_plural": "Traducciones en curso",
+            },
+        ),
+    ]
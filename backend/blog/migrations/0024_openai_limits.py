@@ -0,0 +1,41 @@
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0023_translationlock"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OpenAIUsage",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=50, unique=True, verbose_name="Nombre")),
+                (
+                    "window_started_at",
+                    models.DateTimeField(default=django.utils.timezone.now, verbose_name="Inicio de la ventana"),
+                ),
+                ("tokens", models.PositiveIntegerField(default=0, verbose_name="Tokens")),
+            ],
+            options={
+                "verbose_name": "Consumo de OpenAI",
+                "verbose_name_plural": "Consumo de OpenAI",
+            },
+        ),
+        migrations.CreateModel(
+            name="OpenAICallLease",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("owner", models.CharField(max_length=100, verbose_name="Propietario")),
+                ("slots", models.PositiveSmallIntegerField(verbose_name="Llamadas")),
+                ("expires_at", models.DateTimeField(db_index=True, verbose_name="Expira")),
+            ],
+            options={
+                "verbose_name": "Llamadas a OpenAI en curso",
+                "verbose_name_plural": "Llamadas a OpenAI en curso",
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0024_openai_limits"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CacheVersion",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=200, unique=True, verbose_name="Nombre")),
+                ("version", models.CharField(max_length=32, verbose_name="Versión")),
+            ],
+            options={
+                "verbose_name": "Versión de caché",
+                "verbose_name_plural": "Versiones de caché",
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("blog", "0025_cacheversion"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BackgroundJobQueue",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=50, unique=True, verbose_name="Nombre")),
+            ],
+            options={
+                "verbose_name": "Cola de tareas",
+                "verbose_name_plural": "Colas de tareas",
+            },
+        ),
+    ]
@@ -5,8 +5,10 @@ from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
-from django.db.models import Q
+from django.db.models import F, Q
+from django.db.models.functions import Lower
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from parler.managers import TranslatableManager, TranslatableQuerySet
@@ -15,79 +17,143 @@ from parler.models import TranslatableModel, TranslatedFields
 from .utils.i18n import slugify_localized
 
 
-class TranslationAwareQuerySet(TranslatableQuerySet):
-    """Queryset that transparently proxies translated field lookups."""
+def case_insensitive_indexes(prefix: str, *field_names: str) -> list[models.Index]:
+    """``(lower(field), language_code)`` indexes serving ``field__lower`` lookups.
 
-    def _translated_field_names(self) -> set[str]:
-        return set(self.model._parler_meta.get_translated_fields())
+    ``lower()`` leads so lookups across every language can use them too.
+    """
 
-    def _rewrite_lookup_key(self, key: str) -> str:
-        if key.startswith("translations__"):
-            return key
+    return [
+        models.Index(Lower(name), F("language_code"), name=f"{prefix}_{name}_ci_idx")
+        for name in field_names
+    ]
 
-        parts = key.split("__")
-        rewritten: list[str] = []
-        model: type[models.Model] | None = self.model
 
-        idx = 0
-        while idx < len(parts):
-            part = parts[idx]
+#: ``(model, lookup key) -> rewritten key``. Field metadata never changes once
+#: the app registry is ready, so a rewrite is computed once per key.
+_REWRITE_PLANS: dict[tuple[type, str], str] = {}
 
-            if part == "translations":
-                rewritten.extend(parts[idx:])
-                break
+#: Safety valve against unbounded keys (e.g. built from user input).
+MAX_REWRITE_PLANS = 10_000
 
-            if (
-                model is not None
-                and issubclass(model, TranslatableModel)
-                and part in model._parler_meta.get_translated_fields()
-            ):
-                rewritten.extend(["translations", part])
-                model = None
-                idx += 1
-                continue
-
-            field = None
-            if model is not None:
-                try:
-                    field = model._meta.get_field(part)
-                except Exception:  # pragma: no cover - defensive guard
-                    field = None
-
-            if field is None:
-                rewritten.append(part)
-                model = None
-            else:
-                rewritten.append(part)
-                related_model = getattr(field, "related_model", None)
-                if related_model is None and getattr(field, "remote_field", None):
-                    related_model = getattr(field.remote_field, "model", None)
-                model = related_model if isinstance(related_model, type) else None
 
+def compile_lookup_key(model: type[models.Model], key: str) -> str:
+    """Route translated fields of ``key`` through their ``translations`` relation."""
+
+    if key.startswith("translations__"):
+        return key
+
+    parts = key.split("__")
+    rewritten: list[str] = []
+    current: type[models.Model] | None = model
+
+    idx = 0
+    while idx < len(parts):
+        part = parts[idx]
+
+        if part == "translations":
+            rewritten.extend(parts[idx:])
+            break
+
+        if (
+            current is not None
+            and issubclass(current, TranslatableModel)
+            and part in current._parler_meta.get_translated_fields()
+        ):
+            rewritten.extend(["translations", part])
+            current = None
             idx += 1
+            continue
+
+        field = None
+        if current is not None:
+            try:
+                field = current._meta.get_field(part)
+            except Exception:  # pragma: no cover - defensive guard
+                field = None
+
+        if field is None:
+            rewritten.append(part)
+            current = None
+        else:
+            rewritten.append(part)
+            related_model = getattr(field, "related_model", None)
+            if related_model is None and getattr(field, "remote_field", None):
+                related_model = getattr(field.remote_field, "model", None)
+            current = related_model if isinstance(related_model, type) else None
+
+        idx += 1
+
+    return "__".join(rewritten)
+
+
+def rewrite_lookup_key(model: type[models.Model], key: str) -> str:
+    """Memoized :func:`compile_lookup_key`."""
+
+    plan_key = (model, key)
+    try:
+        return _REWRITE_PLANS[plan_key]
+    except KeyError:
+        rewritten = compile_lookup_key(model, key)
+        if len(_REWRITE_PLANS) < MAX_REWRITE_PLANS:
+            _REWRITE_PLANS[plan_key] = rewritten
+        return rewritten
+
+
+def warm_rewrite_plans(*model_classes: type[models.Model]) -> int:
+    """Precompute the plans of every field path of ``model_classes``, one relation deep."""
+
+    before = len(_REWRITE_PLANS)
+    for model in model_classes:
+        for field in model._meta.get_fields():
+            rewrite_lookup_key(model, field.name)
+            related = getattr(field, "related_model", None)
+            if isinstance(related, type) and issubclass(related, TranslatableModel):
+                for name in related._parler_meta.get_translated_fields():
+                    rewrite_lookup_key(model, f"{field.name}__{name}")
+        for name in model._parler_meta.get_translated_fields():
+            rewrite_lookup_key(model, name)
+    return len(_REWRITE_PLANS) - before
 
-        return "__".join(rewritten)
+
+class TranslationAwareQuerySet(TranslatableQuerySet):
+    """Queryset that transparently proxies translated field lookups.
+
+    Rewrites come from :func:`rewrite_lookup_key`; ``Q`` trees and keyword
+    arguments without translated fields are passed through as they are.
+    """
+
+    def _translated_field_names(self) -> set[str]:
+        return set(self.model._parler_meta.get_translated_fields())
+
+    def _rewrite_lookup_key(self, key: str) -> str:
+        return rewrite_lookup_key(self.model, key)
 
     def _rewrite_q(self, expression: Q) -> Q:
-        new_q = Q()
-        new_q.connector = expression.connector
-        new_q.negated = expression.negated
+        children = []
+        changed = False
         for child in expression.children:
             if isinstance(child, Q):
-                new_q.children.append(self._rewrite_q(child))
+                new_child = self._rewrite_q(child)
+            elif not isinstance(child, tuple):
+                # Expressions such as ``Exists`` are passed through untouched.
+                new_child = child
             else:
                 key, value = child
-                new_q.children.append((self._rewrite_lookup_key(key), value))
+                new_key = self._rewrite_lookup_key(key)
+                new_child = child if new_key == key else (new_key, value)
+            changed = changed or new_child is not child
+            children.append(new_child)
+        if not changed:
+            return expression
+        new_q = Q()
+        new_q.connector = expression.connector
+        new_q.negated = expression.negated
+        new_q.children = children
         return new_q
 
     def _rewrite_args(self, args: tuple) -> tuple:
-        rewritten: list = []
-        for arg in args:
-            if isinstance(arg, Q):
-                rewritten.append(self._rewrite_q(arg))
-            else:
-                rewritten.append(arg)
-        return tuple(rewritten)
+        return tuple(self._rewrite_q(arg) if isinstance(arg, Q) else arg for arg in args)
 
     def _rewrite_kwargs(self, kwargs: dict) -> dict:
         return {self._rewrite_lookup_key(key): value for key, value in kwargs.items()}
@@ -135,6 +201,19 @@ class TranslationAwareManager(TranslatableManager):
         return self.queryset_class(self.model, using=self._db)
 
 
+class PostQuerySet(TranslationAwareQuerySet):
+    """Custom queryset to expose helpers for posts."""
+
+    def touch(self) -> int:
+        """Bump ``updated_at`` without firing ``post_save``."""
+
+        return self.update(updated_at=timezone.now())
+
+
+class PostManager(TranslationAwareManager):
+    queryset_class = PostQuerySet
+
+
 class CategoryQuerySet(TranslationAwareQuerySet):
     """Custom queryset to expose helpers for categories."""
 
@@ -230,8 +309,13 @@ class Category(TranslatableSlugMixin, TranslatableModel):
         name=models.CharField("Nombre", max_length=150),
         slug=models.SlugField("Slug", max_length=160, blank=True),
         description=models.TextField("Descripción", blank=True),
+        meta={"indexes": case_insensitive_indexes("blog_category_tr", "slug", "name")},
     )
     is_active = models.BooleanField("Activa", default=True)
+    post_count = models.PositiveIntegerField("Entradas", default=0, editable=False)
+    published_post_count = models.PositiveIntegerField(
+        "Entradas publicadas", default=0, editable=False
+    )
     created_at = models.DateTimeField("Creada", auto_now_add=True)
     updated_at = models.DateTimeField("Actualizada", auto_now=True)
 
@@ -264,6 +348,11 @@ class Tag(TranslatableSlugMixin, TranslatableModel):
     translations = TranslatedFields(
         name=models.CharField("Nombre", max_length=100),
         slug=models.SlugField("Slug", max_length=120, blank=True),
+        meta={"indexes": case_insensitive_indexes("blog_tag_tr", "slug", "name")},
+    )
+    post_count = models.PositiveIntegerField("Entradas", default=0, editable=False)
+    published_post_count = models.PositiveIntegerField(
+        "Entradas publicadas", default=0, editable=False
     )
 
     objects = TranslationAwareManager()
@@ -297,6 +386,12 @@ class Post(TranslatableSlugMixin, TranslatableModel):
         slug=models.SlugField("Slug", max_length=255, blank=True),
         excerpt=models.TextField("Resumen"),
         content=models.TextField("Contenido"),
+        # Hash of the source fields a machine translation was made from; any
+        # other save clears it (``blog.post_translation``).
+        source_hash=models.CharField(
+            "Hash del origen", max_length=64, blank=True, default="", editable=False
+        ),
+        meta={"indexes": case_insensitive_indexes("blog_post_tr", "slug")},
     )
     class Status(models.TextChoices):
         DRAFT = "draft", "Borrador"
@@ -305,6 +400,7 @@ class Post(TranslatableSlugMixin, TranslatableModel):
         ARCHIVED = "archived", "Archivado"
 
     date = models.DateField("Fecha", default=timezone.now)
+    updated_at = models.DateTimeField("Actualizado", auto_now=True, db_index=True)
     image = models.URLField("Imagen")
     thumb = models.URLField("Miniatura")
     imageAlt = models.CharField("Texto alternativo", max_length=255)
@@ -338,8 +434,14 @@ class Post(TranslatableSlugMixin, TranslatableModel):
         related_name="modified_posts",
         verbose_name="Modificado por",
     )
+    # Maintained with F() deltas by ``blog.post_counters``.
+    comment_count = models.PositiveIntegerField("Comentarios", default=0, editable=False)
+    reaction_total = models.PositiveIntegerField("Reacciones", default=0, editable=False)
 
-    objects = TranslationAwareManager()
+    objects = PostManager()
+
+    #: Columns written only through deltas; a full save must not overwrite them.
+    COUNTER_FIELDS = ("comment_count", "reaction_total")
 
     class Meta:
         ordering = ["-date", "-id"]
@@ -355,6 +457,19 @@ class Post(TranslatableSlugMixin, TranslatableModel):
 
     def save(self, *args, **kwargs):
         self._ensure_slug()
+        # Only an update of a stored row may skip the counters; ``pk = None``
+        # copies are inserted like new posts.
+        if (
+            self.pk is not None
+            and not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
         super().save(*args, **kwargs)
 
     def clean(self):
@@ -366,6 +481,73 @@ class Post(TranslatableSlugMixin, TranslatableModel):
     slug_fallback = "post"
 
 
+class SearchDocumentField(models.TextField):
+    """Full-text document column; queried through the ``match`` lookup."""
+
+
+class PostSearchEntry(models.Model):
+    """Row of the per-language full-text index maintained by ``blog.search``.
+
+    The table is created by a vendor specific migration (an FTS5 virtual table
+    on SQLite, a ``tsvector`` table with a GIN index on PostgreSQL) and is
+    only written through :mod:`blog.search`.
+    """
+
+    translation_id = models.BigIntegerField(primary_key=True)
+    post = models.ForeignKey(
+        Post,
+        related_name="search_entries",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+    )
+    language_code = models.CharField(max_length=15)
+    document = SearchDocumentField()
+
+    class Meta:
+        managed = False
+        db_table = "blog_post_search"
+
+
+class PostRenderSnapshot(models.Model):
+    """Prebuilt API payload of a public post for one language and variant.
+
+    Built and read by :mod:`blog.snapshots`; a snapshot is only served while
+    ``source_updated_at`` matches the post and none of its categories changed
+    after ``built_at``.
+    """
+
+    class Kind(models.TextChoices):
+        DETAIL = "detail", "Detalle"
+        LIST = "list", "Listado"
+
+    post = models.ForeignKey(
+        Post,
+        related_name="render_snapshots",
+        on_delete=models.CASCADE,
+        verbose_name="Entrada",
+    )
+    language_code = models.CharField("Idioma", max_length=15)
+    kind = models.CharField("Tipo", max_length=10, choices=Kind.choices)
+    expanded = models.BooleanField("Con traducciones", default=False)
+    payload = models.JSONField("Contenido", encoder=DjangoJSONEncoder)
+    dependencies = models.JSONField("Dependencias", default=list)
+    source_updated_at = models.DateTimeField("Versión de la entrada")
+    built_at = models.DateTimeField("Generada")
+
+    class Meta:
+        verbose_name = "Instantánea de entrada"
+        verbose_name_plural = "Instantáneas de entradas"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["post", "language_code", "kind", "expanded"],
+                name="blog_post_snapshot_uniq_variant",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.post_id} [{self.language_code}/{self.kind}]"
+
+
 class Comment(models.Model):
     """Comment associated to a post."""
 
@@ -383,6 +565,10 @@ class Comment(models.Model):
         ordering = ["-created_at", "-id"]
         verbose_name = "Comentario"
         verbose_name_plural = "Comentarios"
+        indexes = [
+            # Pages of a post's comments, newest first, are one range scan.
+            models.Index(fields=["post", "-created_at", "-id"], name="comment_post_created_idx"),
+        ]
         permissions = [("can_moderate_comment", "Puede moderar comentarios")]
 
     def __str__(self) -> str:
@@ -428,12 +614,200 @@ class Reaction(models.Model):
     class Meta:
         verbose_name = "Reacción"
         verbose_name_plural = "Reacciones"
-        unique_together = ("user", "content_type", "object_id", "type")
+        # One reaction per user and object: toggling another type replaces it.
+        unique_together = ("user", "content_type", "object_id")
         indexes = [
             models.Index(fields=["content_type", "object_id"]),
-            models.Index(fields=["user", "content_type", "object_id"]),
         ]
         ordering = ["-created_at", "-id"]
 
     def __str__(self) -> str:  # pragma: no cover - human readable helper
         return f"{self.get_type_display()} por {self.user}"
+
+
+class ReactionCounter(models.Model):
+    """Number of reactions of one type received by a content object.
+
+    Kept in step with :class:`Reaction` by :mod:`blog.reaction_counters`;
+    ``manage.py rebuild_reaction_counters`` repairs any drift.
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.PositiveBigIntegerField()
+    type = models.CharField("Tipo", max_length=20, choices=Reaction.Types.choices)
+    count = models.PositiveIntegerField("Total", default=0)
+
+    class Meta:
+        verbose_name = "Contador de reacciones"
+        verbose_name_plural = "Contadores de reacciones"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_type", "object_id", "type"],
+                name="blog_reaction_counter_uniq_type",
+            )
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - human readable helper
+        return f"{self.type}: {self.count}"
+
+
+class TranslationMemoryEntry(models.Model):
+    """Stored OpenAI translation, addressed by the hash of its request.
+
+    Read and evicted by :mod:`blog.translation_memory`.
+    """
+
+    key = models.CharField("Clave", max_length=64, unique=True)
+    translation = models.TextField("Traducción")
+    target_language = models.CharField("Idioma destino", max_length=15)
+    created_at = models.DateTimeField("Creada", default=timezone.now, db_index=True)
+    last_used_at = models.DateTimeField("Último uso", default=timezone.now, db_index=True)
+
+    class Meta:
+        verbose_name = "Traducción memorizada"
+        verbose_name_plural = "Memoria de traducciones"
+
+    def __str__(self) -> str:  # pragma: no cover - human readable helper
+        return f"{self.target_language}: {self.key[:12]}"
+
+
+class TranslationLock(models.Model):
+    """Claim of a process on a translation it is requesting from OpenAI.
+
+    Taken by :mod:`blog.translation_memory` so identical requests in other
+    processes wait for the memory entry instead of calling OpenAI again.
+    """
+
+    key = models.CharField("Clave", max_length=64, unique=True)
+    owner = models.CharField("Propietario", max_length=100)
+    expires_at = models.DateTimeField("Expira", db_index=True)
+
+    class Meta:
+        verbose_name = "Traducción en curso"
+        verbose_name_plural = "Traducciones en curso"
+
+    def __str__(self) -> str:  # pragma: no cover - human readable helper
+        return f"{self.owner}: {self.key[:12]}"
+
+
+class OpenAIUsage(models.Model):
+    """Tokens estimated for the OpenAI calls of the current window.
+
+    A single row per ``name``, locked by :mod:`blog.openai_limiter` while it
+    admits a batch of calls, so every process shares the same budget.
+    """
+
+    name = models.CharField("Nombre", max_length=50, unique=True)
+    window_started_at = models.DateTimeField("Inicio de la ventana", default=timezone.now)
+    tokens = models.PositiveIntegerField("Tokens", default=0)
+
+    class Meta:
+        verbose_name = "Consumo de OpenAI"
+        verbose_name_plural = "Consumo de OpenAI"
+
+    def __str__(self) -> str:  # pragma: no cover - human readable helper
+        return f"{self.name}: {self.tokens}"
+
+
+class OpenAICallLease(models.Model):
+    """Calls to OpenAI a process may have in flight until ``expires_at``."""
+
+    owner = models.CharField("Propietario", max_length=100)
+    slots = models.PositiveSmallIntegerField("Llamadas")
+    expires_at = models.DateTimeField("Expira", db_index=True)
+
+    class Meta:
+        verbose_name = "Llamadas a OpenAI en curso"
+        verbose_name_plural = "Llamadas a OpenAI en curso"
+
+    def __str__(self) -> str:  # pragma: no cover - human readable helper
+        return f"{self.owner}: {self.slots}"
+
+
+class CacheVersion(models.Model):
+    """Current version token of a cached dependency.
+
+    Used by :mod:`blog.response_cache` and, through it, by the slug index and
+    the role versions of :mod:`blog.rbac`. Kept in the database so every
+    process compares its cached entries against the same versions. The
+    search index also records here that it has been built.
+    """
+
+    name = models.CharField("Nombre", max_length=200, unique=True)
+    version = models.CharField("Versión", max_length=32)
+
+    class Meta:
+        verbose_name = "Versión de caché"
+        verbose_name_plural = "Versiones de caché"
+
+    def __str__(self) -> str:  # pragma: no cover - human readable helper
+        return f"{self.name}: {self.version}"
+
+
+class BackgroundJobQueue(models.Model):
+    """Row per job queue, locked by :func:`blog.jobs.claim` while it admits jobs.
+
+    Serializes the admission of concurrent workers so a queue never runs more
+    jobs than its concurrency limit.
+    """
+
+    name = models.CharField("Nombre", max_length=50, unique=True)
+
+    class Meta:
+        verbose_name = "Cola de tareas"
+        verbose_name_plural = "Colas de tareas"
+
+    def __str__(self) -> str:  # pragma: no cover - human readable helper
+        return self.name
+
+
+class BackgroundJob(models.Model):
+    """Unit of work run outside the request cycle by ``run_blog_worker``.
+
+    Claimed with a lease by :mod:`blog.jobs`; an expired lease makes the job
+    available to other workers again.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "En cola"
+        RUNNING = "running", "En ejecución"
+        SUCCEEDED = "succeeded", "Completado"
+        FAILED = "failed", "Fallido"
+
+    queue = models.CharField("Cola", max_length=50)
+    task = models.CharField("Tarea", max_length=100)
+    payload = models.JSONField("Datos", default=dict, encoder=DjangoJSONEncoder)
+    status = models.CharField(
+        "Estado", max_length=20, choices=Status.choices, default=Status.QUEUED
+    )
+    priority = models.SmallIntegerField("Prioridad", default=0)
+    attempts = models.PositiveSmallIntegerField("Intentos", default=0)
+    max_attempts = models.PositiveSmallIntegerField("Intentos máximos", default=3)
+    run_after = models.DateTimeField("Ejecutar a partir de", default=timezone.now)
+    leased_until = models.DateTimeField("Reservado hasta", null=True, blank=True)
+    lease_owner = models.CharField("Reservado por", max_length=100, blank=True)
+    result = models.JSONField("Resultado", null=True, blank=True, encoder=DjangoJSONEncoder)
+    error = models.TextField("Error", blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="background_jobs",
+        verbose_name="Creado por",
+    )
+    created_at = models.DateTimeField("Creado", auto_now_add=True)
+    finished_at = models.DateTimeField("Finalizado", null=True, blank=True, db_index=True)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        verbose_name = "Tarea en segundo plano"
+        verbose_name_plural = "Tareas en segundo plano"
+        indexes = [
+            models.Index(
+                fields=["queue", "status", "-priority", "run_after"], name="job_claim_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:  # pragma: no cover - human readable helper
+        return f"{self.task} #{self.pk} ({self.status})"
@@ -0,0 +1,209 @@
+"""Limits on OpenAI usage shared by every process of the deployment.
+
+Two limits protect the account from the provider's own rate limiting:
+
+* ``OPENAI_MAX_IN_FLIGHT`` calls at once, across all web and job workers;
+* ``OPENAI_TOKEN_BUDGET`` estimated tokens per ``OPENAI_TOKEN_WINDOW``
+  seconds (``0`` disables the budget).
+
+:func:`reserve` admits a batch of calls before they are sent and grants
+as many concurrent slots as are free, at least one; the batch runs its
+calls on that many threads. When nothing is free the caller waits up to
+``OPENAI_LIMITER_MAX_WAIT`` seconds and is then shed with
+:class:`~blog.utils.openai.OpenAIRateLimited`, whose ``retry_after`` ends
+up in the ``Retry-After`` header of the 429 answer.
+
+With ``OPENAI_LIMITER_BACKEND = "database"`` the state lives in
+:class:`~blog.models.OpenAIUsage` and :class:`~blog.models.OpenAICallLease`:
+the usage row is locked while a batch is admitted, and the slots of a
+process that dies are freed when its lease expires. ``"local"`` keeps the
+same state in the process, for single process deployments and tests.
+"""
+from __future__ import annotations
+
+import math
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+from .models import OpenAICallLease, OpenAIUsage
+from .utils import openai
+
+USAGE_NAME = "openai"
+#: Holder of the leases taken by this process.
+OWNER = f"{socket.gethostname()}:{os.getpid()}"
+#: Seconds between two admission attempts of a waiting batch.
+POLL_INTERVAL = 0.1
+#: Suggested wait when every slot is taken, in seconds.
+SLOT_RETRY_AFTER = 1.0
+
+_condition = threading.Condition()
+_local = {"in_flight": 0, "window_started_at": 0.0, "tokens": 0}
+
+
+def backend() -> str:
+    return (getattr(settings, "OPENAI_LIMITER_BACKEND", "database") or "database").lower()
+
+
+def max_in_flight() -> int:
+    return max(1, int(getattr(settings, "OPENAI_MAX_IN_FLIGHT", 16)))
+
+
+def token_budget() -> int:
+    """Estimated tokens allowed per window; ``0`` disables the budget."""
+
+    return max(0, int(getattr(settings, "OPENAI_TOKEN_BUDGET", 200000)))
+
+
+def window() -> float:
+    return max(1.0, float(getattr(settings, "OPENAI_TOKEN_WINDOW", 60)))
+
+
+def max_wait() -> float:
+    return max(0.0, float(getattr(settings, "OPENAI_LIMITER_MAX_WAIT", 2.0)))
+
+
+def _over_budget(used: int, tokens: int) -> bool:
+    # A batch larger than the whole budget still runs alone in a fresh window.
+    budget = token_budget()
+    return bool(budget) and used > 0 and used + tokens > budget
+
+
+def _admit_local(calls: int, tokens: int) -> tuple[int, float]:
+    now = time.monotonic()
+    if now - _local["window_started_at"] >= window():
+        _local["window_started_at"], _local["tokens"] = now, 0
+    if _over_budget(_local["tokens"], tokens):
+        return 0, _local["window_started_at"] + window() - now
+    free = max_in_flight() - _local["in_flight"]
+    if free <= 0:
+        return 0, SLOT_RETRY_AFTER
+    granted = min(free, calls)
+    _local["in_flight"] += granted
+    _local["tokens"] += tokens
+    return granted, 0.0
+
+
+def _usage_row() -> OpenAIUsage:
+    try:
+        with transaction.atomic():
+            OpenAIUsage.objects.get_or_create(name=USAGE_NAME)
+    except IntegrityError:
+        pass
+    return OpenAIUsage.objects.select_for_update().get(name=USAGE_NAME)
+
+
+def _admit_database(calls: int, tokens: int, lease: float) -> tuple[int, float, Optional[int]]:
+    now = timezone.now()
+    with transaction.atomic():
+        usage = _usage_row()
+        if usage.window_started_at <= now - timedelta(seconds=window()):
+            usage.window_started_at, usage.tokens = now, 0
+        if _over_budget(usage.tokens, tokens):
+            reset = usage.window_started_at + timedelta(seconds=window())
+            return 0, (reset - now).total_seconds(), None
+        OpenAICallLease.objects.filter(expires_at__lte=now).delete()
+        in_flight = (
+            OpenAICallLease.objects.filter(expires_at__gt=now).aggregate(total=Sum("slots"))["total"]
+            or 0
+        )
+        free = max_in_flight() - in_flight
+        if free <= 0:
+            return 0, SLOT_RETRY_AFTER, None
+        granted = min(free, calls)
+        seconds = lease * math.ceil(calls / granted)
+        held = OpenAICallLease.objects.create(
+            owner=OWNER, slots=granted, expires_at=now + timedelta(seconds=seconds)
+        )
+        usage.tokens += tokens
+        usage.save(update_fields=["window_started_at", "tokens"])
+    return granted, 0.0, held.pk
+
+
+def _release(granted: int, lease_id: Optional[int]) -> None:
+    if lease_id is not None:
+        OpenAICallLease.objects.filter(pk=lease_id).delete()
+        return
+    with _condition:
+        _local["in_flight"] -= granted
+        _condition.notify_all()
+
+
+@contextmanager
+def reserve(calls: int, tokens: int, *, call_seconds: float) -> Iterator[int]:
+    """Admit a batch of ``calls`` estimated at ``tokens``; yield the slots granted.
+
+    ``call_seconds`` bounds one call, retries included; the lease of the
+    slots covers the batch running on them. Raises
+    :class:`~blog.utils.openai.OpenAIRateLimited` once ``max_wait`` passes
+    without room for the batch.
+    """
+
+    calls = max(1, calls)
+    deadline = time.monotonic() + max_wait()
+    while True:
+        lease_id = None
+        if backend() == "local":
+            with _condition:
+                granted, retry_after = _admit_local(calls, tokens)
+        else:
+            granted, retry_after, lease_id = _admit_database(calls, tokens, call_seconds)
+        if granted:
+            break
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or retry_after > remaining:
+            raise openai.OpenAIRateLimited(
+                "El servicio de traducción está saturado. Inténtalo de nuevo en unos segundos.",
+                retry_after=max(1.0, retry_after),
+            )
+        if backend() == "local":
+            with _condition:
+                _condition.wait(min(POLL_INTERVAL, remaining))
+        else:
+            time.sleep(min(POLL_INTERVAL, remaining))
+    try:
+        yield granted
+    finally:
+        _release(granted, lease_id)
+
+
+def exhausted() -> Optional[float]:
+    """Seconds until the token budget has room again, or ``None`` if it has."""
+
+    budget = token_budget()
+    if not budget:
+        return None
+    if backend() == "local":
+        with _condition:
+            started, used = _local["window_started_at"], _local["tokens"]
+        remaining = started + window() - time.monotonic()
+    else:
+        row = (
+            OpenAIUsage.objects.filter(name=USAGE_NAME)
+            .values_list("window_started_at", "tokens")
+            .first()
+        )
+        if row is None:
+            return None
+        started, used = row
+        remaining = (started + timedelta(seconds=window()) - timezone.now()).total_seconds()
+    if used < budget or remaining <= 0:
+        return None
+    return remaining
+
+
+def reset() -> None:
+    """Forget the usage counted by the local backend."""
+
+    with _condition:
+        _local.update(in_flight=0, window_started_at=0.0, tokens=0)
+        _condition.notify_all()
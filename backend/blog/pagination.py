@@ -1,13 +1,231 @@
 """Custom pagination classes for the blog API."""
 from __future__ import annotations
 
-from rest_framework.pagination import PageNumberPagination
+from base64 import b64decode, b64encode
+from functools import partial
+from typing import Optional
+from urllib import parse
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+TRUTHY_VALUES = {"1", "true", "yes"}
+
+
+class KnownCountPaginator(DjangoPaginator):
+    """Django paginator that trusts a total computed elsewhere."""
+
+    def __init__(self, *args, count: Optional[int] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        if count is not None:
+            self.count = count
 
 
 class DefaultPageNumberPagination(PageNumberPagination):
-    """Default page number pagination with sensible defaults."""
+    """Default page number pagination with sensible defaults.
+
+    Views that already counted the filtered queryset (for instance while
+    computing validators) can set ``known_count`` to skip the ``COUNT`` query.
+    """
 
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 50
     page_query_param = "page"
+    known_count: Optional[int] = None
+
+    @property
+    def django_paginator_class(self):  # type: ignore[override]
+        return partial(KnownCountPaginator, count=self.known_count)
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor pagination seeking on a composite, unique ordering.
+
+    DRF's ``CursorPagination`` only positions on the first ordering field and
+    falls back to offsets for ties, which degrades on low-cardinality columns
+    such as dates. This variant encodes every field of ``ordering`` in the
+    opaque cursor and filters with a row-value comparison, so each page costs
+    one indexed range scan regardless of depth. The total count is only
+    computed when the client asks for it with ``?count=true``.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 50
+    count_query_param = "count"
+    ordering: tuple[str, ...] = ("-id",)
+
+    def get_ordering(self, request, queryset, view):  # type: ignore[override]
+        return tuple(self.ordering)
+
+    def paginate_queryset(self, queryset, request, view=None):  # type: ignore[override]
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        self.count = None
+        if self._should_count(request):
+            self.count = queryset.count()
+
+        reverse = bool(self.cursor and self.cursor.reverse)
+        position = self._parse_position(queryset.model, self.cursor)
+
+        ordering = self.ordering
+        if reverse:
+            ordering = tuple(_invert_ordering(field) for field in ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self._seek_filter(ordering, position))
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if reverse:
+            results.reverse()
+
+        if reverse:
+            self.has_previous = has_more
+            self.has_next = position is not None
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = results
+        return self.page
+
+    def _should_count(self, request) -> bool:
+        value = request.query_params.get(self.count_query_param)
+        return value is not None and value.lower() in TRUTHY_VALUES
+
+    def _parse_position(self, model, cursor):
+        if cursor is None or cursor.position is None:
+            return None
+        raw_values = cursor.position
+        if len(raw_values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        values = []
+        for field_name, raw_value in zip(self.ordering, raw_values):
+            field = model._meta.get_field(field_name.lstrip("-"))
+            try:
+                values.append(field.to_python(raw_value))
+            except ValidationError as exc:
+                raise NotFound(self.invalid_cursor_message) from exc
+        return values
+
+    @staticmethod
+    def _seek_filter(ordering, position) -> Q:
+        """Build ``(a, b) < (x, y)`` style filters honouring each direction."""
+
+        condition = Q()
+        for index, field in enumerate(ordering):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            branch = Q(**{f"{name}__{lookup}": position[index]})
+            for previous, value in zip(ordering[:index], position[:index]):
+                branch &= Q(**{previous.lstrip("-"): value})
+            condition |= branch
+        return condition
+
+    def _position_from_instance(self, instance) -> list[str]:
+        values = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            values.append(value.isoformat() if hasattr(value, "isoformat") else str(value))
+        return values
+
+    def get_next_link(self):  # type: ignore[override]
+        if not self.has_next or not self.page:
+            return None
+        position = self._position_from_instance(self.page[-1])
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):  # type: ignore[override]
+        if not self.has_previous or not self.page:
+            return None
+        position = self._position_from_instance(self.page[0])
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def decode_cursor(self, request):  # type: ignore[override]
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            reverse = bool(int(tokens.get("r", ["0"])[0]))
+            position = tokens.get("p")
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):  # type: ignore[override]
+        tokens = {}
+        if cursor.reverse:
+            tokens["r"] = "1"
+        if cursor.position is not None:
+            tokens["p"] = list(cursor.position)
+
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = b64encode(querystring.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_paginated_response(self, data):  # type: ignore[override]
+        payload = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.count is not None:
+            payload = {"count": self.count, **payload}
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):  # type: ignore[override]
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"] = {
+            "count": {"type": "integer", "example": 123},
+            **response_schema["properties"],
+        }
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):  # type: ignore[override]
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append(
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Incluye el total de resultados (`count`) cuando es verdadero.",
+                "schema": {"type": "boolean"},
+            }
+        )
+        return parameters
+
+
+class PostKeysetPagination(KeysetPagination):
+    """Keyset pagination over the canonical ``(-date, -id)`` post ordering."""
+
+    ordering = ("-date", "-id")
+
+
+class CommentKeysetPagination(KeysetPagination):
+    """Keyset pagination over the ``(-created_at, -id)`` comments of a post."""
+
+    ordering = ("-created_at", "-id")
+
+
+def _invert_ordering(field: str) -> str:
+    return field[1:] if field.startswith("-") else f"-{field}"
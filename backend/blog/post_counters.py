@@ -0,0 +1,130 @@
+"""Comment and reaction totals shown on post cards.
+
+``Post.comment_count`` and ``Post.reaction_total`` are kept in step by
+``blog.signals`` (comments) and ``blog.reaction_counters`` (reactions) with
+``F()`` deltas. ``BLOG_POST_COUNTS_MODE`` selects what the post list
+serializes: ``"denormalized"`` reads those columns, ``"live"`` annotates the
+list queryset with correlated subqueries over comments and reactions. The
+columns are maintained in both modes so switching needs no backfill.
+
+Only list payloads embed the totals, so moving one leaves ``updated_at``
+(and with it the detail, its ETag and its render snapshot) alone: it
+expires the cached post lists, and list snapshots take their totals from
+the page rows through :func:`overlay`.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from . import response_cache
+from .models import Comment, Post, Reaction
+
+LIVE = "live"
+DENORMALIZED = "denormalized"
+MODES = (LIVE, DENORMALIZED)
+
+#: Post columns and the annotations that replace them in live mode.
+FIELDS = {"comment_count": "live_comment_count", "reaction_total": "live_reaction_total"}
+
+
+def mode() -> str:
+    value = getattr(settings, "BLOG_POST_COUNTS_MODE", DENORMALIZED)
+    return value if value in MODES else DENORMALIZED
+
+
+def expected_counts() -> dict:
+    """Return subquery expressions computing the true totals of each post."""
+
+    content_type = ContentType.objects.get_for_model(Post, for_concrete_model=False)
+
+    def _count(queryset, column: str):
+        return Coalesce(
+            Subquery(
+                queryset.filter(**{column: OuterRef("pk")})
+                .order_by()
+                .values(column)
+                .annotate(total=Count("pk"))
+                .values("total")
+            ),
+            Value(0),
+            output_field=IntegerField(),
+        )
+
+    return {
+        "comment_count": _count(Comment.objects.all(), "post_id"),
+        "reaction_total": _count(Reaction.objects.filter(content_type=content_type), "object_id"),
+    }
+
+
+def annotate(queryset):
+    """Add the live totals to a post queryset when the live mode is on."""
+
+    if mode() != LIVE:
+        return queryset
+    expressions = expected_counts()
+    return queryset.annotate(**{alias: expressions[field] for field, alias in FIELDS.items()})
+
+
+def value(post: Post, field: str) -> int:
+    """Return the total serialized for ``post``: live annotation or column."""
+
+    return getattr(post, FIELDS[field], getattr(post, field))
+
+
+def overlay(payload: dict, post: Post) -> dict:
+    """Return a list ``payload`` of ``post`` carrying its current totals."""
+
+    return {**payload, **{field: value(post, field) for field in FIELDS}}
+
+
+def adjust(post_ids: Iterable[int], comments: int = 0, reactions: int = 0) -> None:
+    """Apply ``F()`` deltas to the totals of ``post_ids``."""
+
+    post_ids = list(post_ids)
+    if not post_ids or not (comments or reactions):
+        return
+    updates = {}
+    if comments:
+        updates["comment_count"] = Greatest(F("comment_count") + comments, Value(0))
+    if reactions:
+        updates["reaction_total"] = Greatest(F("reaction_total") + reactions, Value(0))
+    Post._base_manager.filter(pk__in=post_ids).update(**updates)
+    response_cache.invalidate(response_cache.dependency(Post))
+
+
+def adjust_reactions(content_type_id: int, object_id: int, delta: int) -> None:
+    """Forward a reaction delta to the post it targets, if it targets one."""
+
+    content_type = ContentType.objects.get_for_model(Post, for_concrete_model=False)
+    if content_type_id == content_type.pk:
+        adjust([object_id], reactions=delta)
+
+
+def recount(post_ids: Optional[Iterable[int]] = None) -> int:
+    """Recompute the totals of ``post_ids`` (every post by default)."""
+
+    queryset = Post._base_manager.all()
+    if post_ids is not None:
+        post_ids = list(post_ids)
+        queryset = queryset.filter(pk__in=post_ids)
+    updated = queryset.update(**expected_counts())
+    response_cache.invalidate(response_cache.dependency(Post))
+    return updated
+
+
+def drifted_ids() -> list[int]:
+    """Return the ids of the posts whose stored totals are wrong."""
+
+    expected = expected_counts()
+    queryset = Post._base_manager.annotate(
+        _expected_comments=expected["comment_count"],
+        _expected_reactions=expected["reaction_total"],
+    ).filter(
+        ~Q(comment_count=F("_expected_comments")) | ~Q(reaction_total=F("_expected_reactions"))
+    )
+    return list(queryset.order_by("pk").values_list("pk", flat=True))
@@ -0,0 +1,222 @@
+"""Machine translation of whole posts into every configured language.
+
+:func:`translate` reads ``title``, ``excerpt`` and ``content`` of a post in a
+source language and fills the other languages of ``settings.LANGUAGES``
+that are missing or stale in a single batch: every field of every language
+goes through :func:`blog.translation_memory.translate_many`, so the OpenAI
+calls share one thread pool and the post takes about as long as its
+slowest chunk.
+
+Machine translations keep in ``source_hash`` the hash of the source fields
+they were made from, and are stale once it stops matching. Saving a
+translation row through the ORM (an editor fixing it) clears the hash, so
+manual translations are only replaced when forced. Rows and slugs are
+written with bulk queries, then the work of the translation signals
+(search documents, ``updated_at``, slug index, cached responses, parler
+cache) is done once for the post.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from parler.cache import _delete_cached_translation
+
+from . import response_cache, search, slug_index, translation_memory
+from .models import Post
+from .utils import openai
+from .utils.i18n import slugify_localized
+
+FIELDS = ("title", "excerpt", "content")
+FORMATS = {"title": "plain", "excerpt": "markdown", "content": "markdown"}
+
+CREATED = "created"
+UPDATED = "updated"
+CURRENT = "current"
+MANUAL = "manual"
+FAILED = "failed"
+
+
+def translations_model():
+    return Post._parler_meta.root_model
+
+
+def source_hash(language_code: str, values: dict[str, str]) -> str:
+    """Return the hash identifying the source a translation is made from."""
+
+    parts = [language_code] + [values.get(field) or "" for field in FIELDS]
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def forget_origin(translation) -> None:
+    """Mark a translation row saved through the ORM as manually maintained."""
+
+    translation.source_hash = ""
+
+
+def _clip(field: str, value: str) -> str:
+    max_length = translations_model()._meta.get_field(field).max_length
+    return value[:max_length] if max_length else value
+
+
+def _free_slugs(post: Post, titles: dict[str, str]) -> dict[str, str]:
+    """Generate unique slugs for several languages with one query."""
+
+    bases = {
+        language_code: slugify_localized(title, language_code) or Post.slug_fallback
+        for language_code, title in titles.items()
+    }
+    if not bases:
+        return {}
+    conditions = Q()
+    for language_code, base in bases.items():
+        conditions |= Q(language_code=language_code, slug__startswith=base)
+    taken: dict[str, set[str]] = {}
+    for language_code, slug in (
+        translations_model()
+        .objects.filter(conditions)
+        .exclude(master_id=post.pk)
+        .values_list("language_code", "slug")
+    ):
+        taken.setdefault(language_code, set()).add(slug.lower())
+    slugs = {}
+    for language_code, base in bases.items():
+        used = taken.get(language_code, set())
+        candidate, suffix = base, 1
+        while candidate in used:
+            suffix += 1
+            candidate = f"{base}-{suffix}"
+        slugs[language_code] = candidate
+    return slugs
+
+
+def has_source(post: Post, language_code: str) -> bool:
+    return (
+        translations_model()
+        .objects.filter(master_id=post.pk, language_code=language_code)
+        .exists()
+    )
+
+
+def target_languages(source_language: str, languages: Optional[Iterable[str]] = None) -> list[str]:
+    configured = [code for code, _name in settings.LANGUAGES if code != source_language]
+    if languages is None:
+        return configured
+    wanted = set(languages)
+    return [code for code in configured if code in wanted]
+
+
+def translate(
+    post: Post,
+    *,
+    source_language: Optional[str] = None,
+    languages: Optional[Iterable[str]] = None,
+    force: bool = False,
+) -> dict[str, dict]:
+    """Translate ``post`` into the missing or stale ``languages``.
+
+    Returns a status per language: ``created``/``updated`` (with the slug),
+    ``current`` (up to date), ``manual`` (edited by hand, kept unless
+    ``force``) or ``failed`` (with the error). Raises ``LookupError`` when
+    the post has no translation in ``source_language`` and configuration
+    errors of ``blog.utils.openai``.
+    """
+
+    source_language = source_language or settings.LANGUAGE_CODE
+    rows = {
+        row.language_code: row for row in translations_model().objects.filter(master_id=post.pk)
+    }
+    source = rows.get(source_language)
+    if source is None:
+        raise LookupError(
+            f"La entrada no tiene contenido en el idioma de origen ({source_language})."
+        )
+    values = {field: getattr(source, field) or "" for field in FIELDS}
+    digest = source_hash(source_language, values)
+
+    report: dict[str, dict] = {}
+    pending = []
+    for language_code in target_languages(source_language, languages):
+        row = rows.get(language_code)
+        if row is not None and not force and row.source_hash == digest:
+            report[language_code] = {"status": CURRENT, "slug": row.slug}
+        elif row is not None and not force and not row.source_hash:
+            report[language_code] = {"status": MANUAL, "slug": row.slug}
+        else:
+            pending.append(language_code)
+
+    items = [
+        {
+            "text": values[field],
+            "target_language": language_code,
+            "source_language": source_language,
+            "fmt": FORMATS[field],
+        }
+        for language_code in pending
+        for field in FIELDS
+        if values[field].strip()
+    ]
+    results = iter(translation_memory.translate_many(items))
+    translated: dict[str, dict[str, str]] = {}
+    for language_code in pending:
+        fields, error = {}, None
+        for field in FIELDS:
+            if not values[field].strip():
+                fields[field] = values[field]
+                continue
+            result = next(results)
+            if isinstance(result, openai.OpenAIRequestError):
+                error = error or result
+            else:
+                fields[field] = _clip(field, result.text)
+        if error is not None:
+            report[language_code] = {"status": FAILED, "detail": str(error)}
+        else:
+            translated[language_code] = fields
+
+    if translated:
+        _write(post, rows, translated, digest, report)
+    return {language_code: report[language_code] for language_code in sorted(report)}
+
+
+def _write(
+    post: Post, rows: dict, translated: dict[str, dict[str, str]], digest: str, report: dict
+) -> None:
+    """Save the translated languages in bulk and record their status in ``report``."""
+
+    model = translations_model()
+    slugs = _free_slugs(
+        post,
+        {
+            language_code: fields["title"]
+            for language_code, fields in translated.items()
+            if language_code not in rows or not rows[language_code].slug
+        },
+    )
+    created, updated = [], []
+    for language_code, fields in translated.items():
+        row = rows.get(language_code)
+        if row is None:
+            row = model(master_id=post.pk, language_code=language_code)
+            created.append(row)
+        else:
+            updated.append(row)
+        for field, value in fields.items():
+            setattr(row, field, value)
+        row.slug = slugs.get(language_code) or row.slug
+        row.source_hash = digest
+        report[language_code] = {"status": UPDATED if row.pk else CREATED, "slug": row.slug}
+
+    with transaction.atomic():
+        model.objects.bulk_create(created)
+        model.objects.bulk_update(updated, [*FIELDS, "slug", "source_hash"])
+        search.index_posts([post.pk])
+        Post.objects.filter(pk=post.pk).touch()
+    for row in created + updated:
+        _delete_cached_translation(row)
+    slug_index.invalidate()
+    response_cache.invalidate_objects(Post, [post.pk])
@@ -4,7 +4,14 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Iterable, Mapping
 
+from django.conf import settings
 from django.contrib.auth.models import Group
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from . import response_cache
 
 APP_LABEL = "blog"
 
@@ -139,6 +146,124 @@ ROLE_PERMISSIONS: Mapping[str, set[str]] = {
 ALL_PERMISSIONS: set[str] = set().union(*ROLE_PERMISSIONS.values())
 
 
+ROLE_CACHE_PREFIX = "blog:rbac:roles"
+
+#: Attribute memoizing the group names on a user instance for one request.
+_ROLE_ATTR = "_blog_role_names"
+
+#: Account flags that change what a user may do besides its groups.
+ACCOUNT_FLAGS = ("is_active", "is_staff", "is_superuser")
+_FLAGS_ATTR = "_blog_account_flags"
+
+
+#: Cache backends private to each process; other workers would keep stale roles.
+_PROCESS_LOCAL_CACHES = (LocMemCache, DummyCache)
+
+
+def _role_timeout() -> int:
+    return int(getattr(settings, "BLOG_ROLE_CACHE_TIMEOUT", 300))
+
+
+def _role_cache():
+    """Return the cache shared by every worker, or ``None`` to skip the cross-request tier.
+
+    Group changes only clear the cache of the process handling them, so the
+    roles are not cached across requests in a per-process backend.
+    """
+
+    if _role_timeout() <= 0:
+        return None
+    cache = caches[getattr(settings, "BLOG_ROLE_CACHE_ALIAS", "default")]
+    return None if isinstance(cache, _PROCESS_LOCAL_CACHES) else cache
+
+
+def _role_key(user_pk) -> str:
+    return f"{ROLE_CACHE_PREFIX}:{user_pk}"
+
+
+def _version_name(user_pk) -> str:
+    return f"{ROLE_CACHE_PREFIX}:version:{user_pk}"
+
+
+def role_version(user_pk) -> str:
+    """Return the version of the roles of ``user_pk``, starting a new one if missing.
+
+    Tokens carrying roles (see ``accounts.tokens``) record this value; a
+    different version means the claims may be outdated. Versions are
+    :class:`~blog.models.CacheVersion` rows bumped in the transaction that
+    changes the roles, so every process sees the change once it commits.
+    """
+
+    name = _version_name(user_pk)
+    return response_cache.current_versions([name])[name]
+
+
+def _group_names(user) -> frozenset[str]:
+    """Return the group names of ``user``, cached per instance and per user.
+
+    ``request.user`` lives for one request, so the instance memo spares the
+    repeated checks of permissions and views; the shared cache spares the
+    query on later requests until :func:`invalidate_roles` drops the entry.
+    """
+
+    names = getattr(user, _ROLE_ATTR, None)
+    if names is not None:
+        return names
+    cache = _role_cache()
+    key = _role_key(user.pk)
+    names = cache.get(key) if cache is not None else None
+    if names is None:
+        names = frozenset(user.groups.values_list("name", flat=True))
+        if cache is not None:
+            cache.set(key, names, timeout=_role_timeout())
+    setattr(user, _ROLE_ATTR, names)
+    return names
+
+
+def remember_roles(user, roles: Iterable[str]) -> None:
+    """Memoize ``roles`` on ``user`` for this request, e.g. taken from token claims."""
+
+    setattr(user, _ROLE_ATTR, frozenset(roles))
+
+
+def invalidate_roles(*user_pks) -> None:
+    """Bump the role versions of ``user_pks`` and drop their cached roles.
+
+    Cache entries are deleted right away and again after the surrounding
+    transaction commits, so a concurrent request cannot cache the pre-commit
+    groups.
+    """
+
+    pks = [pk for pk in dict.fromkeys(user_pks) if pk is not None]
+    if not pks:
+        return
+    response_cache.invalidate(*(_version_name(pk) for pk in pks))
+    cache = _role_cache()
+    if cache is None:
+        return
+    keys = [_role_key(pk) for pk in pks]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
+
+
+def forget_roles(user) -> None:
+    """Clear the per-request memo of ``user`` and its cached roles."""
+
+    user.__dict__.pop(_ROLE_ATTR, None)
+    invalidate_roles(user.pk)
+
+
+def remember_account_flags(user) -> None:
+    """Record the stored :data:`ACCOUNT_FLAGS` of ``user`` to detect changes on save."""
+
+    setattr(user, _FLAGS_ATTR, tuple(user.__dict__.get(flag) for flag in ACCOUNT_FLAGS))
+
+
+def account_flags_changed(user) -> bool:
+    current = tuple(user.__dict__.get(flag) for flag in ACCOUNT_FLAGS)
+    return getattr(user, _FLAGS_ATTR, current) != current
+
+
 def user_has_role(user, role: str) -> bool:
     """Return whether ``user`` belongs to the provided role name."""
 
@@ -146,7 +271,7 @@ def user_has_role(user, role: str) -> bool:
         return False
     if getattr(user, "is_superuser", False):
         return True
-    return user.groups.filter(name=role).exists()
+    return role in _group_names(user)
 
 
 def user_roles(user) -> set[str]:
@@ -156,7 +281,7 @@ def user_roles(user) -> set[str]:
         return set()
     if getattr(user, "is_superuser", False):
         return set(ROLES)
-    return set(user.groups.values_list("name", flat=True))
+    return set(_group_names(user))
 
 
 def assign_roles(user, roles: Iterable[str]) -> None:
@@ -165,6 +290,7 @@ def assign_roles(user, roles: Iterable[str]) -> None:
     valid_roles = {role for role in roles if role in ROLES}
     groups = Group.objects.filter(name__in=valid_roles)
     user.groups.set(groups)
+    forget_roles(user)
 
 
 def ensure_group_structure() -> None:
@@ -0,0 +1,253 @@
+"""Denormalized reaction totals per content object and type.
+
+:class:`~blog.models.ReactionCounter` holds one row per ``(content_type,
+object_id, type)``. ``blog.signals`` applies ``F()`` deltas whenever a
+reaction is created, changes type or is deleted, inside the transaction of
+the write, so reaction summaries read a handful of rows instead of
+aggregating every reaction of the object.
+
+:func:`toggle` serves the API toggle without going through the ORM: it
+removes, inserts and counts with ``RETURNING``/``ON CONFLICT`` statements
+(SQLite 3.35+ or PostgreSQL), two or three round trips in one transaction.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections, router, transaction
+from django.db.models import Count, F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from . import post_counters
+from .models import Reaction, ReactionCounter
+
+_TYPE_ATTR = "_counted_type"
+
+#: Attempts of :func:`toggle` when a concurrent toggle of the same user wins
+#: the insert; each retry sees the winner as the reaction to replace.
+TOGGLE_ATTEMPTS = 3
+
+
+def adjust(content_type_id: int, object_id: int, reaction_type: str, delta: int) -> None:
+    """Add ``delta`` to one counter, creating its row on the first increment."""
+
+    if not delta:
+        return
+    counter = ReactionCounter.objects.filter(
+        content_type_id=content_type_id, object_id=object_id, type=reaction_type
+    )
+    updates = {"count": Greatest(F("count") + delta, Value(0))}
+    if counter.update(**updates) or delta < 0:
+        return
+    ReactionCounter.objects.bulk_create(
+        [
+            ReactionCounter(
+                content_type_id=content_type_id, object_id=object_id, type=reaction_type
+            )
+        ],
+        ignore_conflicts=True,
+    )
+    counter.update(**updates)
+
+
+def counts_for(instance) -> dict[str, int]:
+    """Return the reaction totals of ``instance`` for every reaction type."""
+
+    return summaries(type(instance), [instance.pk])[instance.pk][0]
+
+
+def summaries(
+    model, object_ids: Iterable[int], user_id: Optional[int] = None
+) -> dict[int, tuple[dict[str, int], Optional[str]]]:
+    """Return ``(totals per type, reaction of user_id)`` for each of ``object_ids``.
+
+    One query reads every counter; a second one the reactions of ``user_id``.
+    """
+
+    object_ids = list(dict.fromkeys(object_ids))
+    content_type = ContentType.objects.get_for_model(model, for_concrete_model=False)
+    result = {object_id: ({choice: 0 for choice in _types()}, None) for object_id in object_ids}
+    if not object_ids:
+        return result
+    rows = ReactionCounter.objects.filter(
+        content_type=content_type, object_id__in=object_ids
+    ).values_list("object_id", "type", "count")
+    for object_id, reaction_type, count in rows:
+        result[object_id][0][reaction_type] = count
+    if user_id is not None:
+        mine = Reaction.objects.filter(
+            user_id=user_id, content_type=content_type, object_id__in=object_ids
+        ).values_list("object_id", "type")
+        for object_id, reaction_type in mine.order_by():
+            result[object_id] = (result[object_id][0], reaction_type)
+    return result
+
+
+def remember_type(reaction: Reaction) -> None:
+    """Record the stored type of ``reaction`` to detect changes on save."""
+
+    setattr(reaction, _TYPE_ATTR, reaction.__dict__.get("type"))
+
+
+def _counted_type(reaction: Reaction) -> Optional[str]:
+    return getattr(reaction, _TYPE_ATTR, None)
+
+
+def on_reaction_saved(reaction: Reaction, created: bool) -> None:
+    previous = _counted_type(reaction)
+    remember_type(reaction)
+    target = (reaction.content_type_id, reaction.object_id)
+    if created:
+        adjust(*target, reaction.type, 1)
+        post_counters.adjust_reactions(*target, 1)
+    elif previous is None:
+        # The stored type was not loaded (deferred field); recount precisely.
+        rebuild(reaction.content_type_id, [reaction.object_id])
+    elif previous != reaction.type:
+        adjust(*target, previous, -1)
+        adjust(*target, reaction.type, 1)
+
+
+def on_reaction_deleted(reaction: Reaction) -> None:
+    reaction_type = _counted_type(reaction) or reaction.type
+    adjust(reaction.content_type_id, reaction.object_id, reaction_type, -1)
+    post_counters.adjust_reactions(reaction.content_type_id, reaction.object_id, -1)
+
+
+def drifted(content_type_id: int, object_ids: Iterable[int]) -> dict[tuple[int, str], int]:
+    """Return the true totals of the wrong counters of ``object_ids``.
+
+    A counter at zero and a missing counter are equivalent.
+    """
+
+    object_ids = list(object_ids)
+    expected = {
+        (row["object_id"], row["type"]): row["total"]
+        for row in Reaction.objects.filter(
+            content_type_id=content_type_id, object_id__in=object_ids
+        )
+        .values("object_id", "type")
+        .annotate(total=Count("pk"))
+        .order_by()
+    }
+    stored = {
+        (object_id, reaction_type): count
+        for object_id, reaction_type, count in ReactionCounter.objects.filter(
+            content_type_id=content_type_id, object_id__in=object_ids
+        ).values_list("object_id", "type", "count")
+    }
+    return {
+        key: expected.get(key, 0)
+        for key in expected.keys() | stored.keys()
+        if expected.get(key, 0) != stored.get(key, 0)
+    }
+
+
+def rebuild(content_type_id: int, object_ids: Iterable[int]) -> int:
+    """Rewrite the wrong counters of ``object_ids`` from :class:`Reaction`.
+
+    Returns the number of counters corrected.
+    """
+
+    corrections = drifted(content_type_id, object_ids)
+    ReactionCounter.objects.bulk_create(
+        [
+            ReactionCounter(
+                content_type_id=content_type_id,
+                object_id=object_id,
+                type=reaction_type,
+                count=total,
+            )
+            for (object_id, reaction_type), total in corrections.items()
+        ],
+        update_conflicts=True,
+        unique_fields=["content_type", "object_id", "type"],
+        update_fields=["count"],
+    )
+    return len(corrections)
+
+
+def targets() -> dict[int, list[int]]:
+    """Map each content type to the ids of the objects with reactions or counters."""
+
+    found: dict[int, set[int]] = {}
+    for model in (Reaction, ReactionCounter):
+        for content_type_id, object_id in (
+            model.objects.values_list("content_type_id", "object_id").distinct().order_by()
+        ):
+            found.setdefault(content_type_id, set()).add(object_id)
+    return {content_type_id: sorted(ids) for content_type_id, ids in found.items()}
+
+
+def _types() -> list[str]:
+    return [choice for choice, _label in Reaction.Types.choices]
+
+
+def _apply_deltas(cursor, content_type_id: int, object_id: int, deltas: dict[str, int]) -> dict[str, int]:
+    """Upsert every counter of the object with ``deltas`` and return all totals.
+
+    Rows are written in a fixed order so concurrent toggles lock them
+    consistently; returning every type avoids reading the summary again.
+    """
+
+    table = ReactionCounter._meta.db_table
+    types = _types()
+    values = ", ".join(["(%s, %s, %s, %s)"] * len(types))
+    cases = " ".join("WHEN %s THEN %s" for _type in types)
+    params: list = []
+    for reaction_type in types:
+        params += [content_type_id, object_id, reaction_type, max(deltas.get(reaction_type, 0), 0)]
+    for reaction_type in types:
+        params += [reaction_type, deltas.get(reaction_type, 0)]
+    cursor.execute(
+        f"INSERT INTO {table} (content_type_id, object_id, type, count) VALUES {values} "
+        f"ON CONFLICT (content_type_id, object_id, type) DO UPDATE SET count = "
+        f"CASE WHEN {table}.count + (CASE EXCLUDED.type {cases} ELSE 0 END) < 0 THEN 0 "
+        f"ELSE {table}.count + (CASE EXCLUDED.type {cases} ELSE 0 END) END "
+        f"RETURNING type, count",
+        params + params[len(types) * 4 :],
+    )
+    return dict(cursor.fetchall())
+
+
+def toggle(user_id: int, instance, reaction_type: str) -> tuple[dict[str, int], Optional[str]]:
+    """Toggle the reaction of ``user_id`` on ``instance`` and return the new summary.
+
+    Reacting with the current type removes the reaction; any other type
+    replaces it. Returns the totals per type and the user's reaction.
+    """
+
+    content_type = ContentType.objects.get_for_model(instance, for_concrete_model=False)
+    target = [user_id, content_type.pk, instance.pk]
+    using = router.db_for_write(Reaction)
+    connection = connections[using]
+    table = Reaction._meta.db_table
+    deltas: dict[str, int] = {}
+    current = None
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        for _attempt in range(TOGGLE_ATTEMPTS):
+            cursor.execute(
+                f"DELETE FROM {table} WHERE user_id = %s AND content_type_id = %s "
+                f"AND object_id = %s RETURNING type",
+                target,
+            )
+            removed = [row[0] for row in cursor.fetchall()]
+            for previous in removed:
+                deltas[previous] = deltas.get(previous, 0) - 1
+            if reaction_type in removed:
+                break
+            cursor.execute(
+                f"INSERT INTO {table} (user_id, content_type_id, object_id, type, created_at) "
+                f"VALUES (%s, %s, %s, %s, %s) "
+                f"ON CONFLICT (user_id, content_type_id, object_id) DO NOTHING RETURNING type",
+                target + [reaction_type, connection.ops.adapt_datetimefield_value(timezone.now())],
+            )
+            if cursor.fetchone() is not None:
+                deltas[reaction_type] = deltas.get(reaction_type, 0) + 1
+                current = reaction_type
+                break
+        counts = _apply_deltas(cursor, content_type.pk, instance.pk, deltas)
+        post_counters.adjust_reactions(content_type.pk, instance.pk, sum(deltas.values()))
+    return counts, current
@@ -0,0 +1,179 @@
+"""Cache of anonymous read responses of the public blog API.
+
+Entries are keyed by path, normalized query string and negotiated language.
+Each entry records the version of every *dependency* it was built from:
+
+* ``blog.post`` / ``blog.tag`` / ``blog.category``: a whole collection (lists).
+* ``blog.post:<pk>``...: a single object (detail responses).
+
+Writes bump the versions of the affected dependencies (see ``blog.signals``
+and ``blog.counters``), which turns every entry built from them into a miss
+without having to know their keys. Versions are random tokens kept in
+:class:`~blog.models.CacheVersion`, so every worker validates the entries of
+its own cache against the same versions and a write made through one worker
+expires the entries of all of them.
+"""
+from __future__ import annotations
+
+import hashlib
+import uuid
+from typing import Iterable, Sequence
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .models import CacheVersion, Post
+
+KEY_PREFIX = "blog:response"
+HEADER = "X-Cache"
+HIT = "HIT"
+MISS = "MISS"
+
+_OUTCOMES = (HIT, MISS)
+
+#: Router basenames of the cached viewsets, used to group hit/miss counters.
+SCOPES = ("posts", "categories", "tags")
+
+
+def _cache():
+    return caches[getattr(settings, "BLOG_RESPONSE_CACHE_ALIAS", "default")]
+
+
+def timeout() -> int:
+    return int(getattr(settings, "BLOG_RESPONSE_CACHE_TIMEOUT", 300))
+
+
+def enabled() -> bool:
+    return timeout() > 0
+
+
+def dependency(model, pk=None) -> str:
+    """Name the collection of ``model`` or, with ``pk``, one of its objects."""
+
+    label = model._meta.label_lower
+    return label if pk is None else f"{label}:{pk}"
+
+
+def _stats_key(scope: str, outcome: str) -> str:
+    return f"{KEY_PREFIX}:stats:{scope}:{outcome.lower()}"
+
+
+def _new_version() -> str:
+    return uuid.uuid4().hex
+
+
+def build_key(request, language_code: str) -> str:
+    """Return the entry key for ``request`` rendered in ``language_code``."""
+
+    params = request.query_params
+    query = "&".join(
+        f"{name}={value}"
+        for name in sorted(params)
+        for value in sorted(params.getlist(name))
+    )
+    raw = f"{request.path}?{query}|{language_code}"
+    return f"{KEY_PREFIX}:entry:{hashlib.sha1(raw.encode('utf-8')).hexdigest()}"
+
+
+def current_versions(dependencies: Iterable[str]) -> dict[str, str]:
+    """Return the version of each dependency, initializing missing ones."""
+
+    names = list(dict.fromkeys(dependencies))
+    versions = dict(CacheVersion.objects.filter(name__in=names).values_list("name", "version"))
+    missing = [name for name in names if name not in versions]
+    if missing:
+        CacheVersion.objects.bulk_create(
+            [CacheVersion(name=name, version=_new_version()) for name in missing],
+            ignore_conflicts=True,
+        )
+        versions.update(
+            CacheVersion.objects.filter(name__in=missing).values_list("name", "version")
+        )
+    return {name: versions[name] for name in names}
+
+
+def _bump(names: Sequence[str]) -> None:
+    # Sorted so concurrent writers lock the version rows in the same order.
+    CacheVersion.objects.bulk_create(
+        [CacheVersion(name=name, version=_new_version()) for name in sorted(names)],
+        update_conflicts=True,
+        unique_fields=["name"],
+        update_fields=["version"],
+    )
+
+
+def invalidate(*dependencies: str) -> None:
+    """Expire every entry built from ``dependencies``.
+
+    The new versions commit with the surrounding transaction, so a reader
+    that still sees the old data also sees the old versions.
+    """
+
+    names = list(dict.fromkeys(dependencies))
+    if names:
+        _bump(names)
+
+
+def invalidate_objects(model, pks: Iterable) -> None:
+    """Expire entries built from rows of ``model`` and every post list.
+
+    Post payloads embed tag names and category details (with their counters),
+    so changes to either also reach cached post lists.
+    """
+
+    invalidate(
+        *(dependency(model, pk) for pk in pks),
+        dependency(model),
+        dependency(Post),
+    )
+
+
+def lookup(key: str, scope: str):
+    """Return the ``(status, data, validators)`` stored under ``key`` if still current."""
+
+    entry = _cache().get(key)
+    if entry is not None:
+        versions, status, data, validators = entry
+        if current_versions(versions) == versions:
+            record(scope, HIT)
+            return status, data, validators
+    record(scope, MISS)
+    return None
+
+
+def store(key: str, versions: dict[str, str], status: int, data, validators=(None, None)) -> None:
+    _cache().set(key, (versions, status, data, validators), timeout=timeout())
+
+
+def record(scope: str, outcome: str) -> None:
+    cache = _cache()
+    key = _stats_key(scope, outcome)
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def stats(scopes: Sequence[str]) -> dict[str, dict[str, int]]:
+    """Return hit and miss counters per scope."""
+
+    cache = _cache()
+    keys = {(scope, outcome): _stats_key(scope, outcome) for scope in scopes for outcome in _OUTCOMES}
+    stored = cache.get_many(list(keys.values()))
+    return {
+        scope: {outcome.lower(): int(stored.get(keys[(scope, outcome)], 0)) for outcome in _OUTCOMES}
+        for scope in scopes
+    }
+
+
+def reset_stats(scopes: Sequence[str]) -> None:
+    _cache().delete_many([_stats_key(scope, outcome) for scope in scopes for outcome in _OUTCOMES])
+
+
+def is_cacheable(request) -> bool:
+    """Only anonymous ``GET``/``HEAD`` requests are served from the cache."""
+
+    if not enabled() or request.method not in {"GET", "HEAD"}:
+        return False
+    return not getattr(getattr(request, "user", None), "is_authenticated", False)
@@ -0,0 +1,391 @@
+"""Per-language full-text search over post translations.
+
+Each ``PostTranslation`` owns one search document (title, tag and category
+names, excerpt and content) stored in ``blog_post_search``:
+
+* PostgreSQL: a ``tsvector`` built with the text search configuration of the
+  language (``spanish``, ``english``...) and indexed with GIN.
+* SQLite: an FTS5 virtual table; words are stemmed here in Python because
+  FTS5 only ships an English stemmer.
+
+Documents are refreshed incrementally from signals (see ``blog.signals``) and
+can be rebuilt with ``manage.py rebuild_search_index``. When the table is not
+available, or still lacks the documents of posts written before it existed,
+:func:`search_posts` returns ``None`` and callers fall back to the
+``icontains`` search.
+"""
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Callable, Iterable, Optional, Sequence
+
+from django.conf import settings
+from django.db import NotSupportedError, connections, router
+from django.db.models import Expression, F, FloatField, Func, Lookup
+
+from . import response_cache
+from .models import CacheVersion, Post, PostSearchEntry, SearchDocumentField
+
+#: Annotation holding the relevance of each post; higher is better.
+SEARCH_RANK_ALIAS = "_search_rank"
+
+#: PostgreSQL text search configuration per language code.
+POSTGRES_CONFIGS = {"es": "spanish", "en": "english"}
+POSTGRES_DEFAULT_CONFIG = "simple"
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_AVAILABLE: set[str] = set()
+
+#: :class:`~blog.models.CacheVersion` row stored once every post has a document.
+READY_MARKER = "search:index"
+_READY: set[str] = set()
+
+
+def _unaccent(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _strip_suffix(word: str, suffixes: Sequence[str], min_stem: int = 3) -> str:
+    for suffix in suffixes:
+        if word.endswith(suffix) and len(word) - len(suffix) >= min_stem:
+            return word[: -len(suffix)]
+    return word
+
+
+_ES_SUFFIXES = (
+    "amientos", "imientos", "aciones", "uciones", "amiento", "imiento",
+    "idades", "adoras", "adores", "ancias", "encias", "mente", "acion",
+    "ucion", "idad", "ador", "adora", "ancia", "encia", "ismos", "istas",
+    "ismo", "ista", "ables", "ibles", "able", "ible", "osos", "osas",
+    "oso", "osa", "ivos", "ivas", "ivo", "iva",
+)
+
+
+def _stem_es(word: str) -> str:
+    if word.endswith("ces") and len(word) > 4:
+        word = word[:-3] + "z"
+    else:
+        word = _strip_suffix(word, ("es", "s"))
+    word = _strip_suffix(word, _ES_SUFFIXES)
+    return _strip_suffix(word, ("a", "e", "o"), min_stem=4)
+
+
+_EN_SUFFIXES = (
+    "ational", "fulness", "iveness", "ization", "ousness", "ation", "ness",
+    "ment", "able", "ible", "ful", "ing", "ed", "ly",
+)
+
+
+def _stem_en(word: str) -> str:
+    if word.endswith("sses"):
+        word = word[:-2]
+    elif word.endswith("ies") and len(word) > 4:
+        word = word[:-3] + "i"
+    elif word.endswith("s") and not word.endswith(("ss", "us")) and len(word) > 3:
+        word = word[:-1]
+    stemmed = _strip_suffix(word, _EN_SUFFIXES)
+    if stemmed != word and len(stemmed) > 3 and stemmed[-1] == stemmed[-2] and stemmed[-1] not in "lsz":
+        stemmed = stemmed[:-1]
+    if len(stemmed) > 3 and stemmed.endswith("y") and stemmed[-2] not in "aeiou":
+        stemmed = stemmed[:-1] + "i"
+    return stemmed
+
+
+STEMMERS: dict[str, Callable[[str], str]] = {"es": _stem_es, "en": _stem_en}
+
+
+def tokenize(text: str) -> list[str]:
+    """Return lower-cased, accent-free words of ``text``."""
+
+    return _WORD_RE.findall(_unaccent(text or "").lower())
+
+
+def stem_words(text: str, language_code: str) -> list[str]:
+    """Tokenize ``text`` and reduce each word with the stemmer of the language."""
+
+    stemmer = STEMMERS.get(language_code)
+    words = tokenize(text)
+    if stemmer is None:
+        return words
+    return [stemmer(word) for word in words]
+
+
+def postgres_config(language_code: str) -> str:
+    return POSTGRES_CONFIGS.get(language_code, POSTGRES_DEFAULT_CONFIG)
+
+
+class FullTextQuery(Expression):
+    """Search terms rendered as the engine specific query value."""
+
+    output_field = SearchDocumentField()
+
+    def __init__(self, terms: Iterable[str], language_code: str) -> None:
+        super().__init__()
+        self.terms = list(terms)
+        self.language_code = language_code
+
+    def as_sql(self, compiler, connection):  # pragma: no cover - guarded by get_backend
+        raise NotSupportedError("Full-text search is not available on this database.")
+
+    def as_sqlite(self, compiler, connection):
+        words = stem_words(" ".join(self.terms), self.language_code)
+        return "%s", [" ".join(f'"{word}"*' for word in words)]
+
+    def as_postgresql(self, compiler, connection):
+        words = tokenize(" ".join(self.terms))
+        return "to_tsquery(%s::regconfig, %s)", [
+            postgres_config(self.language_code),
+            " & ".join(f"{word}:*" for word in words),
+        ]
+
+
+@SearchDocumentField.register_lookup
+class FullTextMatch(Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):  # pragma: no cover - guarded by get_backend
+        raise NotSupportedError("Full-text search is not available on this database.")
+
+    def as_sqlite(self, compiler, connection):
+        # FTS5 matches against the hidden column named after the table.
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        alias = compiler.quote_name_unless_alias(self.lhs.alias)
+        table = connection.ops.quote_name(PostSearchEntry._meta.db_table)
+        return f"{alias}.{table} MATCH {rhs_sql}", rhs_params
+
+    def as_postgresql(self, compiler, connection):
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs_sql} @@ {rhs_sql}", [*lhs_params, *rhs_params]
+
+
+class FullTextRank(Func):
+    """Relevance of the matched document; higher values rank first."""
+
+    output_field = FloatField()
+
+    def as_sql(self, compiler, connection, **extra_context):  # pragma: no cover
+        raise NotSupportedError("Full-text search is not available on this database.")
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # ``rank`` is FTS5's configured bm25(); it is negative, lower is better.
+        alias = compiler.quote_name_unless_alias(self.source_expressions[0].alias)
+        return f"-{alias}.rank", []
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return super().as_sql(compiler, connection, function="ts_rank_cd", **extra_context)
+
+
+def get_backend(using: Optional[str] = None) -> Optional[str]:
+    """Return the vendor serving full-text search or ``None`` when unavailable."""
+
+    alias = using or router.db_for_read(PostSearchEntry)
+    connection = connections[alias]
+    if connection.vendor not in {"sqlite", "postgresql"}:
+        return None
+    if alias not in _AVAILABLE:
+        if PostSearchEntry._meta.db_table not in connection.introspection.table_names():
+            return None
+        _AVAILABLE.add(alias)
+    return connection.vendor
+
+
+def is_ready(using: Optional[str] = None) -> bool:
+    """Whether the index holds the documents of every post.
+
+    Databases migrated with posts already in them wait for :func:`rebuild`;
+    empty ones are marked ready by the migration.
+    """
+
+    alias = using or router.db_for_read(PostSearchEntry)
+    if get_backend(alias) is None:
+        return False
+    if alias not in _READY:
+        if not CacheVersion.objects.using(alias).filter(name=READY_MARKER).exists():
+            return False
+        _READY.add(alias)
+    return True
+
+
+def search_posts(queryset, terms: Sequence[str], language_code: str):
+    """Filter ``queryset`` to posts matching ``terms`` and annotate their rank.
+
+    Returns ``None`` when the index cannot answer for the queryset yet.
+    """
+
+    if queryset.model is not Post or not is_ready(queryset.db):
+        return None
+    if not tokenize(" ".join(terms)):
+        return queryset.none()
+
+    # A single join lets the engine evaluate the match once and rank only the
+    # matching documents; a correlated rank subquery re-runs it for every post.
+    query = FullTextQuery(terms, language_code)
+    return queryset.filter(
+        search_entries__language_code=language_code,
+        search_entries__document__match=query,
+    ).annotate(**{SEARCH_RANK_ALIAS: FullTextRank(F("search_entries__document"), query)})
+
+
+def _translation_model():
+    return Post._parler_meta.root_model
+
+
+def _taxonomy_names(post_ids: Iterable[int]) -> dict[tuple[int, str], list[str]]:
+    """Map ``(post_id, language_code)`` to tag and category names."""
+
+    post_ids = list(post_ids)
+    names: dict[tuple[int, str], list[str]] = defaultdict(list)
+    languages = [code for code, _name in settings.LANGUAGES]
+    for field_name in ("tags", "categories"):
+        field = Post._meta.get_field(field_name)
+        column = field.m2m_reverse_field_name()
+        links = list(
+            field.remote_field.through.objects.filter(post_id__in=post_ids).values_list(
+                "post_id", column
+            )
+        )
+        if not links:
+            continue
+        related_translations = field.related_model._parler_meta.root_model
+        by_language: dict[int, dict[str, str]] = defaultdict(dict)
+        for master_id, language_code, name in related_translations.objects.filter(
+            master_id__in={target for _post, target in links}
+        ).values_list("master_id", "language_code", "name"):
+            by_language[master_id][language_code] = name
+        for post_id, target in links:
+            translated = by_language.get(target, {})
+            for language_code in languages:
+                name = translated.get(language_code) or translated.get(settings.LANGUAGE_CODE)
+                if name:
+                    names[(post_id, language_code)].append(name)
+    return names
+
+
+def _documents(translation_filter: dict) -> list[dict]:
+    rows = list(
+        _translation_model()
+        .objects.filter(**translation_filter)
+        .order_by("pk")
+        .values("id", "master_id", "language_code", "title", "excerpt", "content")
+    )
+    taxonomy = _taxonomy_names({row["master_id"] for row in rows})
+    for row in rows:
+        row["taxonomy"] = " ".join(taxonomy.get((row["master_id"], row["language_code"]), ()))
+        row["body"] = f"{row['excerpt'] or ''} {row['content'] or ''}"
+    return rows
+
+
+def _write(rows: list[dict], using: str) -> None:
+    if not rows:
+        return
+    vendor = connections[using].vendor
+    with connections[using].cursor() as cursor:
+        if vendor == "sqlite":
+            cursor.executemany(
+                "DELETE FROM blog_post_search WHERE rowid = %s", [(row["id"],) for row in rows]
+            )
+            cursor.executemany(
+                "INSERT INTO blog_post_search (rowid, title, taxonomy, body, translation_id, "
+                "post_id, language_code) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                [
+                    (
+                        row["id"],
+                        " ".join(stem_words(row["title"], row["language_code"])),
+                        " ".join(stem_words(row["taxonomy"], row["language_code"])),
+                        " ".join(stem_words(row["body"], row["language_code"])),
+                        row["id"],
+                        row["master_id"],
+                        row["language_code"],
+                    )
+                    for row in rows
+                ],
+            )
+            return
+
+        cursor.executemany(
+            "INSERT INTO blog_post_search (translation_id, post_id, language_code, document) "
+            "VALUES (%s, %s, %s, "
+            "setweight(to_tsvector(%s::regconfig, %s), 'A') || "
+            "setweight(to_tsvector(%s::regconfig, %s), 'B') || "
+            "setweight(to_tsvector(%s::regconfig, %s), 'C')) "
+            "ON CONFLICT (translation_id) DO UPDATE SET post_id = EXCLUDED.post_id, "
+            "language_code = EXCLUDED.language_code, document = EXCLUDED.document",
+            [
+                (
+                    row["id"],
+                    row["master_id"],
+                    row["language_code"],
+                    postgres_config(row["language_code"]),
+                    " ".join(tokenize(row["title"])),
+                    postgres_config(row["language_code"]),
+                    " ".join(tokenize(row["taxonomy"])),
+                    postgres_config(row["language_code"]),
+                    " ".join(tokenize(row["body"])),
+                )
+                for row in rows
+            ],
+        )
+
+
+def _delete(translation_ids: Sequence[int], using: str) -> None:
+    column = "rowid" if connections[using].vendor == "sqlite" else "translation_id"
+    with connections[using].cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM blog_post_search WHERE {column} = %s",
+            [(translation_id,) for translation_id in translation_ids],
+        )
+
+
+def index_translations(translation_ids: Iterable[int], using: Optional[str] = None) -> None:
+    """Refresh the search documents of the given ``PostTranslation`` ids."""
+
+    using = using or router.db_for_write(PostSearchEntry)
+    translation_ids = list(translation_ids)
+    if not translation_ids or get_backend(using) is None:
+        return
+    _write(_documents({"pk__in": translation_ids}), using)
+
+
+def index_posts(post_ids: Iterable[int], using: Optional[str] = None) -> None:
+    """Refresh every translation document of the given posts."""
+
+    using = using or router.db_for_write(PostSearchEntry)
+    post_ids = list(post_ids)
+    if not post_ids or get_backend(using) is None:
+        return
+    _write(_documents({"master_id__in": post_ids}), using)
+
+
+def remove_translations(translation_ids: Iterable[int], using: Optional[str] = None) -> None:
+    """Drop the documents of deleted translations."""
+
+    using = using or router.db_for_write(PostSearchEntry)
+    translation_ids = list(translation_ids)
+    if translation_ids and get_backend(using) is not None:
+        _delete(translation_ids, using)
+
+
+def rebuild(batch_size: int = 500, using: Optional[str] = None) -> int:
+    """Recreate every search document; returns the number of indexed rows."""
+
+    using = using or router.db_for_write(PostSearchEntry)
+    if get_backend(using) is None:
+        raise NotSupportedError("Full-text search is not available on this database.")
+    with connections[using].cursor() as cursor:
+        cursor.execute("DELETE FROM blog_post_search")
+
+    translation_ids = list(
+        _translation_model().objects.order_by("pk").values_list("pk", flat=True)
+    )
+    for start in range(0, len(translation_ids), batch_size):
+        batch = translation_ids[start : start + batch_size]
+        _write(_documents({"pk__in": batch}), using)
+    CacheVersion.objects.using(using).update_or_create(
+        name=READY_MARKER, defaults={"version": "ready"}
+    )
+    response_cache.invalidate(response_cache.dependency(Post))
+    return len(translation_ids)
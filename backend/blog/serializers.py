@@ -7,16 +7,47 @@ from typing import Iterable, Optional
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models import Value
+from django.db.models.functions import Lower
 from django.utils.encoding import smart_str
 from parler_rest.serializers import TranslatableModelSerializer
 from rest_framework import serializers
 
-from .models import Category, Comment, Post, Reaction, Tag
-from . import rbac
+from .models import BackgroundJob, Category, Comment, Post, Reaction, Tag
+from . import post_counters, rbac
 from .utils.i18n import set_parler_language, slugify_localized
 from parler.utils.context import switch_language
 
 
+def translations_expansion_requested(request) -> bool:
+    """Return whether ``request`` asks for ``expand=translations``."""
+
+    params = getattr(request, "query_params", None) or getattr(request, "GET", None)
+    if not params:
+        return False
+
+    values: list[str] = []
+    if hasattr(params, "getlist"):
+        values.extend(params.getlist("expand"))
+    else:  # pragma: no cover - legacy mapping fallback
+        expand_value = params.get("expand")
+        if expand_value:
+            values.append(expand_value)
+
+    for raw_value in values:
+        if not raw_value:
+            continue
+        normalized = [part.strip() for part in raw_value.split(",") if part.strip()]
+        for part in normalized:
+            if part.lower() == "translations":
+                return True
+            if part.lower().startswith("translations="):
+                flag = part.split("=", 1)[1].lower()
+                if flag in {"1", "true", "yes"}:
+                    return True
+    return False
+
+
 class _TranslationAwareSerializer(TranslatableModelSerializer):
     """Base serializer that exposes parler translations when requested."""
 
@@ -32,31 +63,7 @@ class _TranslationAwareSerializer(TranslatableModelSerializer):
         request = self.context.get("request")
         if request is None:
             return bool(self.context.get("expand_translations"))
-
-        params = getattr(request, "query_params", None) or getattr(request, "GET", None)
-        if not params:
-            return False
-
-        values: list[str] = []
-        if hasattr(params, "getlist"):
-            values.extend(params.getlist("expand"))
-        else:  # pragma: no cover - legacy mapping fallback
-            expand_value = params.get("expand")
-            if expand_value:
-                values.append(expand_value)
-
-        for raw_value in values:
-            if not raw_value:
-                continue
-            normalized = [part.strip() for part in raw_value.split(",") if part.strip()]
-            for part in normalized:
-                if part.lower() == "translations":
-                    return True
-                if part.lower().startswith("translations="):
-                    flag = part.split("=", 1)[1].lower()
-                    if flag in {"1", "true", "yes"}:
-                        return True
-        return False
+        return translations_expansion_requested(request)
 
     def to_representation(self, instance):  # type: ignore[override]
         data = super().to_representation(instance)
@@ -69,6 +76,11 @@ class _TranslationAwareSerializer(TranslatableModelSerializer):
             return None
 
         translated_fields = getattr(instance._parler_meta, "get_translated_fields", lambda: [])()
+        translations_model = instance._parler_meta.root_model
+        # Bookkeeping columns (``editable=False``) are not part of the payload.
+        translated_fields = [
+            name for name in translated_fields if translations_model._meta.get_field(name).editable
+        ]
         language_codes = [code for code, _ in getattr(settings, "LANGUAGES", ())]
         if not language_codes:
             language_codes = [self._language_code()]
@@ -154,7 +166,8 @@ class CategorySerializer(_TranslatedCRUDSerializer):
 
     name = serializers.CharField()
     description = serializers.CharField(allow_blank=True, required=False)
-    post_count = serializers.SerializerMethodField()
+    post_count = serializers.IntegerField(read_only=True)
+    published_post_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Category
@@ -164,44 +177,24 @@ class CategorySerializer(_TranslatedCRUDSerializer):
             "description",
             "is_active",
             "post_count",
+            "published_post_count",
+            "translations",
+        ]
+        read_only_fields = [
+            "slug",
+            "post_count",
+            "published_post_count",
             "translations",
         ]
-        read_only_fields = ["slug", "post_count", "translations"]
-
-    def get_post_count(self, obj: Category) -> int:
-        """Return the number of posts associated with the category.
-
-        The API can annotate ``post_count`` when explicitly requested, but
-        serializers should degrade gracefully if that annotation is not present.
-        When the attribute does not exist we fallback to counting the cached
-        ``posts`` relation (if it was prefetched) or, as a last resort, perform a
-        lightweight count query.
-        """
-
-        annotated_value = getattr(obj, "post_count", None)
-        try:
-            if annotated_value is not None:
-                return int(annotated_value)
-        except (TypeError, ValueError):
-            pass
-
-        if hasattr(obj, "_prefetched_objects_cache"):
-            cached = obj._prefetched_objects_cache.get("posts")
-            if cached is not None:
-                return len(cached)
-
-        related_posts = getattr(obj, "posts", None)
-        if hasattr(related_posts, "count"):
-            return related_posts.count()
 
-        return 0
 
 
 class TagSerializer(_TranslatedCRUDSerializer):
-    """Public representation of a tag with optional post counts."""
+    """Public representation of a tag with its post counters."""
 
     name = serializers.CharField()
-    post_count = serializers.SerializerMethodField()
+    post_count = serializers.IntegerField(read_only=True)
+    published_post_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Tag
@@ -209,30 +202,16 @@ class TagSerializer(_TranslatedCRUDSerializer):
             "name",
             "slug",
             "post_count",
+            "published_post_count",
+            "translations",
+        ]
+        read_only_fields = [
+            "slug",
+            "post_count",
+            "published_post_count",
             "translations",
         ]
-        read_only_fields = ["slug", "post_count", "translations"]
-
-    def get_post_count(self, obj: Tag) -> int:
-        """Return the number of posts associated with the tag when available."""
-
-        annotated_value = getattr(obj, "post_count", None)
-        try:
-            if annotated_value is not None:
-                return int(annotated_value)
-        except (TypeError, ValueError):
-            pass
-
-        if hasattr(obj, "_prefetched_objects_cache"):
-            cached = obj._prefetched_objects_cache.get("posts")
-            if cached is not None:
-                return len(cached)
-
-        related_posts = getattr(obj, "posts", None)
-        if hasattr(related_posts, "count"):
-            return related_posts.count()
 
-        return 0
 
 
 class TagNameField(serializers.SlugRelatedField):
@@ -244,16 +223,22 @@ class TagNameField(serializers.SlugRelatedField):
             return request.LANGUAGE_CODE
         return self.context.get("language_code", settings.LANGUAGE_CODE)
 
-    def _lookup_kwargs(self, value: str) -> dict[str, str]:
+    def _lookup_kwargs(self, value: str) -> dict[str, Lower]:
         slug_field = getattr(self, "slug_field", None)
         if not slug_field:
             raise AssertionError("TagNameField.slug_field must be defined.")
-        return {f"{slug_field}__iexact": value}
+        # Lowercased by the database too: ``str.lower()`` folds non-ASCII
+        # letters that SQLite's ``lower()`` leaves untouched.
+        return {f"{slug_field}__lower": Lower(Value(value))}
 
     def _find_existing(self, queryset, value: str, language_code: str):
         lookup = self._lookup_kwargs(value)
         if language_code and hasattr(queryset, "language"):
-            localized = queryset.language(language_code).filter(**lookup).first()
+            localized = (
+                queryset.language(language_code)
+                .filter(translations__language_code=language_code, **lookup)
+                .first()
+            )
             if localized is not None:
                 return localized
         return queryset.filter(**lookup).order_by("pk").first()
@@ -410,6 +395,8 @@ class PostListSerializer(
     categories_detail = CategorySerializer(source="categories", many=True, read_only=True)
     status = serializers.CharField(read_only=True)
     created_at = serializers.SerializerMethodField()
+    comment_count = serializers.SerializerMethodField()
+    reaction_total = serializers.SerializerMethodField()
 
     class Meta:
         model = Post
@@ -424,6 +411,8 @@ class PostListSerializer(
             "status",
             "created_at",
             "image",
+            "comment_count",
+            "reaction_total",
             "translations",
         ]
         read_only_fields = [
@@ -434,6 +423,8 @@ class PostListSerializer(
             "image",
             "categories",
             "categories_detail",
+            "comment_count",
+            "reaction_total",
             "translations",
         ]
 
@@ -456,6 +447,12 @@ class PostListSerializer(
         """
         return self._serialize_date(getattr(instance, "date", None))
 
+    def get_comment_count(self, instance: Post) -> int:
+        return post_counters.value(instance, "comment_count")
+
+    def get_reaction_total(self, instance: Post) -> int:
+        return post_counters.value(instance, "reaction_total")
+
 
 class PostDetailSerializer(
     _PostCategoryRepresentationMixin, _TranslationAwareSerializer
@@ -474,7 +471,7 @@ class PostDetailSerializer(
     )
     categories_detail = CategorySerializer(source="categories", many=True, read_only=True)
     created_at = serializers.SerializerMethodField()
-    updated_at = serializers.SerializerMethodField()
+    updated_at = serializers.DateTimeField(read_only=True)
     status = serializers.ChoiceField(choices=Post.Status.choices, required=False)
     created_by = UserPublicSerializer(read_only=True)
     modified_by = UserPublicSerializer(read_only=True)
@@ -529,12 +526,6 @@ class PostDetailSerializer(
         """
         return self._serialize_date(getattr(obj, "date", None))
 
-    def get_updated_at(self, obj: Post):
-        """
-        Return the last updated date. Currently uses the publication date as the model doesn't track separate update timestamps.
-        """
-        return self._serialize_date(getattr(obj, "date", None))
-
     def validate_title(self, value: str) -> str:
         if len(value.strip()) < 5:
             raise serializers.ValidationError("El título debe tener al menos 5 caracteres.")
@@ -602,7 +593,7 @@ class PostDetailSerializer(
 class CommentSerializer(serializers.ModelSerializer):
     """Serializer for comments nested under posts."""
 
-    post = serializers.SlugRelatedField(read_only=True, slug_field="slug")
+    post = serializers.SerializerMethodField()
     created_at = serializers.DateTimeField(read_only=True)
 
     class Meta:
@@ -610,6 +601,12 @@ class CommentSerializer(serializers.ModelSerializer):
         fields = ["id", "post", "author_name", "content", "created_at"]
         read_only_fields = ["id", "post", "created_at"]
 
+    def get_post(self, instance: Comment) -> str:
+        """Slug of the parent post; nested routes provide it as ``post_slug``."""
+
+        slug = self.context.get("post_slug")
+        return slug if slug is not None else instance.post.slug
+
     def validate_author_name(self, value: str) -> str:
         cleaned = value.strip()
         if not cleaned:
@@ -652,12 +649,56 @@ class ReactionSummarySerializer(serializers.Serializer):
     )
 
 
+class PostReactionSummarySerializer(ReactionSummarySerializer):
+    """Reaction summary of one post within a batch response."""
+
+    id = serializers.IntegerField()
+    slug = serializers.CharField(allow_null=True)
+
+
+class ReactionBatchQuerySerializer(serializers.Serializer):
+    """Validate the comma separated ``slugs`` and ``ids`` of a batch lookup."""
+
+    MAX_ITEMS = 50
+
+    slugs = serializers.CharField(required=False, allow_blank=True)
+    ids = serializers.CharField(required=False, allow_blank=True)
+
+    @staticmethod
+    def _split(value: str | None) -> list[str]:
+        return list(dict.fromkeys(item.strip() for item in (value or "").split(",") if item.strip()))
+
+    def validate_ids(self, value: str) -> list[int]:
+        ids = []
+        for item in self._split(value):
+            try:
+                ids.append(int(item))
+            except ValueError:
+                raise serializers.ValidationError(f"Identificador no válido: {item}.")
+        return ids
+
+    def validate_slugs(self, value: str) -> list[str]:
+        return self._split(value)
+
+    def validate(self, attrs):
+        attrs.setdefault("slugs", [])
+        attrs.setdefault("ids", [])
+        total = len(attrs["slugs"]) + len(attrs["ids"])
+        if not total:
+            raise serializers.ValidationError("Indica al menos un slug o identificador.")
+        if total > self.MAX_ITEMS:
+            raise serializers.ValidationError(
+                f"Se admiten como máximo {self.MAX_ITEMS} entradas por solicitud."
+            )
+        return attrs
+
+
 class OpenAITranslationSerializer(serializers.Serializer):
     """Validate payloads for the OpenAI translation proxy endpoint."""
 
     text = serializers.CharField(
         trim_whitespace=False,
-        max_length=getattr(settings, "OPENAI_MAX_TEXT_LENGTH", 2000),
+        max_length=getattr(settings, "OPENAI_MAX_DOCUMENT_LENGTH", 50000),
     )
     target_lang = serializers.CharField()
     source_lang = serializers.CharField(required=False, allow_blank=True, allow_null=True)
@@ -710,3 +751,53 @@ class OpenAITranslationResponseSerializer(serializers.Serializer):
     source_lang = serializers.CharField(allow_null=True, required=False)
     format = serializers.CharField()
 
+
+
+class PostTranslationRequestSerializer(serializers.Serializer):
+    """Validate the options of the whole-post translation action."""
+
+    source_lang = serializers.ChoiceField(
+        choices=[code for code, _name in settings.LANGUAGES], required=False
+    )
+    languages = serializers.ListField(
+        child=serializers.ChoiceField(choices=[code for code, _name in settings.LANGUAGES]),
+        required=False,
+        allow_empty=False,
+    )
+    force = serializers.BooleanField(default=False)
+
+
+class PostTranslationStatusSerializer(serializers.Serializer):
+    """Outcome of the translation of a post into one language."""
+
+    status = serializers.ChoiceField(
+        choices=["created", "updated", "current", "manual", "failed"]
+    )
+    slug = serializers.CharField(required=False)
+    detail = serializers.CharField(required=False)
+
+
+class PostTranslationResponseSerializer(serializers.Serializer):
+    """Per-language report of the whole-post translation action."""
+
+    source_lang = serializers.CharField()
+    languages = serializers.DictField(child=PostTranslationStatusSerializer())
+
+
+class BackgroundJobSerializer(serializers.ModelSerializer):
+    """State of a background job, polled by the client that queued it."""
+
+    class Meta:
+        model = BackgroundJob
+        fields = [
+            "id",
+            "queue",
+            "task",
+            "status",
+            "attempts",
+            "max_attempts",
+            "result",
+            "created_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
@@ -2,25 +2,41 @@
 from __future__ import annotations
 
 import logging
-from typing import Final
 
 from allauth.account.signals import user_signed_up
-from django.conf import settings
-from django.core.mail import EmailMultiAlternatives
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
 from django.core.management import call_command
-from django.db.models.signals import post_migrate
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_migrate,
+    post_save,
+    pre_delete,
+    pre_save,
+)
 from django.dispatch import receiver
 
+from . import (
+    counters,
+    jobs,
+    post_counters,
+    post_translation,
+    rbac,
+    reaction_counters,
+    response_cache,
+    search,
+    slug_index,
+)
+from .models import Category, Comment, Post, Reaction, Tag
 from .seed_config import is_seed_allowed, should_seed_on_migrate
 
 logger = logging.getLogger(__name__)
 
+User = get_user_model()
+
 _ALREADY_TRIGGERED = False
-_DEFAULT_FROM_EMAIL: Final[str] = (
-    getattr(settings, "DEFAULT_FROM_EMAIL", None)
-    or getattr(settings, "EMAIL_HOST_USER", "")
-    or "no-reply@codextest.local"
-)
 
 
 @receiver(post_migrate)
@@ -50,44 +66,212 @@ def run_seeds_after_migrate(sender, **kwargs):  # type: ignore[unused-argument]
         logger.info("Seeds automáticas completadas correctamente.")
 
 
-@receiver(user_signed_up)
-def send_welcome_email(sender, request, user, **kwargs):  # type: ignore[unused-argument]
-    """Send a welcome email to every new account created via registration."""
+@receiver(post_init, sender=Post)
+def remember_post_status(sender, instance, **kwargs):  # type: ignore[unused-argument]
+    counters.remember_status(instance)
 
-    if not getattr(user, "email", None):
-        logger.info("Usuario %s sin email. Se omite bienvenida.", user.pk)
+
+@receiver(post_save, sender=Post)
+def sync_counters_on_status_change(sender, instance, created, raw=False, **kwargs):  # type: ignore[unused-argument]
+    """Keep ``published_post_count`` in step with status transitions."""
+
+    if raw:
+        counters.remember_status(instance)
+        return
+    counters.on_post_saved(instance, created)
+
+
+@receiver(pre_delete, sender=Post)
+def release_counters_on_delete(sender, instance, **kwargs):  # type: ignore[unused-argument]
+    counters.on_post_deleted(instance)
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+@receiver(m2m_changed, sender=Post.categories.through)
+def sync_counters_on_relation_change(sender, instance, action, reverse, pk_set, **kwargs):  # type: ignore[unused-argument]
+    """Apply taxonomy counter deltas when posts gain or lose tags/categories."""
+
+    field_name = counters.field_for_through(sender)
+    if field_name is not None:
+        counters.on_relation_changed(field_name, instance, action, reverse, pk_set)
+
+
+@receiver(post_init, sender=Reaction)
+def remember_reaction_type(sender, instance, **kwargs):  # type: ignore[unused-argument]
+    reaction_counters.remember_type(instance)
+
+
+@receiver(post_save, sender=Reaction)
+def count_saved_reaction(sender, instance, created, raw=False, **kwargs):  # type: ignore[unused-argument]
+    if raw:
+        return
+    reaction_counters.on_reaction_saved(instance, created)
+
+
+@receiver(post_delete, sender=Reaction)
+def count_deleted_reaction(sender, instance, **kwargs):  # type: ignore[unused-argument]
+    reaction_counters.on_reaction_deleted(instance)
+
+
+@receiver(pre_save, sender=Post._parler_meta.root_model)
+def mark_manual_translation(sender, instance, raw=False, **kwargs):  # type: ignore[unused-argument]
+    """Machine translations are written in bulk; any other save is a manual edit."""
+
+    if not raw:
+        post_translation.forget_origin(instance)
+
+
+@receiver(post_save, sender=Post._parler_meta.root_model)
+def index_post_translation(sender, instance, **kwargs):  # type: ignore[unused-argument]
+    search.index_translations([instance.pk])
+    Post.objects.filter(pk=instance.master_id).touch()
+
+
+@receiver(post_delete, sender=Post._parler_meta.root_model)
+def unindex_post_translation(sender, instance, **kwargs):  # type: ignore[unused-argument]
+    search.remove_translations([instance.pk])
+    Post.objects.filter(pk=instance.master_id).touch()
+
+
+@receiver(post_save, sender=Post._parler_meta.root_model)
+@receiver(post_delete, sender=Post._parler_meta.root_model)
+def expire_slug_resolutions(sender, instance, **kwargs):  # type: ignore[unused-argument]
+    slug_index.invalidate()
+
+
+@receiver(m2m_changed, sender=Post.tags.through)
+@receiver(m2m_changed, sender=Post.categories.through)
+def refresh_posts_on_relation_change(sender, instance, action, reverse, pk_set, **kwargs):  # type: ignore[unused-argument]
+    """Tag and category names are part of the documents and payloads of their posts."""
+
+    if not reverse:
+        post_ids = [instance.pk] if action in {"post_add", "post_remove", "post_clear"} else []
+    elif action == "pre_clear":
+        instance._cleared_post_ids = list(instance.posts.values_list("pk", flat=True))
+        return
+    elif action == "post_clear":
+        post_ids = getattr(instance, "_cleared_post_ids", [])
+    elif action in {"post_add", "post_remove"}:
+        post_ids = list(pk_set or ())
+    else:
         return
+    search.index_posts(post_ids)
+    Post.objects.filter(pk__in=post_ids).touch()
+    response_cache.invalidate_objects(Post, post_ids)
 
-    display_name = user.get_full_name().strip() if user.get_full_name() else ""
-    if not display_name:
-        display_name = getattr(user, "username", None) or user.email
-
-    subject = "Bienvenido/a a CodexTest Blog"
-    text_body = (
-        f"Hola {display_name},\n\n"
-        "Gracias por registrarte en CodexTest Blog. Desde ahora podrás comentar "
-        "y guardar tus publicaciones favoritas.\n\n"
-        "¡Nos encanta tenerte por aquí!\n"
-        "El equipo de CodexTest"
+
+#: Attribute recording the stored name of a tag or category translation.
+_SAVED_NAME_ATTR = "_blog_saved_name"
+
+
+@receiver(post_init, sender=Tag._parler_meta.root_model)
+@receiver(post_init, sender=Category._parler_meta.root_model)
+def remember_taxonomy_name(sender, instance, **kwargs):  # type: ignore[unused-argument]
+    setattr(instance, _SAVED_NAME_ATTR, instance.__dict__.get("name"))
+
+
+@receiver(post_save, sender=Tag._parler_meta.root_model)
+@receiver(post_save, sender=Category._parler_meta.root_model)
+def refresh_posts_on_taxonomy_rename(sender, instance, created, raw=False, **kwargs):  # type: ignore[unused-argument]
+    """Names are part of the documents and payloads of the posts; other fields are not."""
+
+    renamed = created or getattr(instance, _SAVED_NAME_ATTR, None) != instance.name
+    setattr(instance, _SAVED_NAME_ATTR, instance.name)
+    if raw or not renamed:
+        return
+    post_ids = list(instance.master.posts.values_list("pk", flat=True))
+    if not post_ids:
+        return
+    Post.objects.filter(pk__in=post_ids).touch()
+    # A popular tag may cover thousands of posts: the worker reindexes them.
+    taxonomy = sender._meta.get_field("master").related_model
+    jobs.enqueue(
+        "blog.index_taxonomy_posts",
+        {"taxonomy": taxonomy._meta.model_name, "id": instance.master_id},
+        queue="maintenance",
+        priority=jobs.LOW_PRIORITY,
     )
-    html_body = (
-        "<p>Hola <strong>{name}</strong>,</p>"
-        "<p>Gracias por registrarte en CodexTest Blog. Ya puedes iniciar sesión para "
-        "guardar publicaciones y participar en la comunidad.</p>"
-        "<p>¡Nos encanta tenerte por aquí!<br />El equipo de CodexTest</p>"
-    ).format(name=display_name)
-
-    message = EmailMultiAlternatives(
-        subject=subject,
-        body=text_body,
-        from_email=_DEFAULT_FROM_EMAIL,
-        to=[user.email],
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def expire_cached_responses(sender, instance, **kwargs):  # type: ignore[unused-argument]
+    response_cache.invalidate_objects(sender, [instance.pk])
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, raw=False, **kwargs):  # type: ignore[unused-argument]
+    if created and not raw:
+        post_counters.adjust([instance.post_id], comments=1)
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, origin=None, **kwargs):  # type: ignore[unused-argument]
+    # Comments cascading from a deleted post have no total left to update.
+    if origin is not None and getattr(origin, "model", type(origin)) is Post:
+        return
+    post_counters.adjust([instance.post_id], comments=-1)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def expire_comment_validators(sender, instance, **kwargs):  # type: ignore[unused-argument]
+    response_cache.invalidate(response_cache.dependency(Comment))
+
+
+@receiver(post_save, sender=Post._parler_meta.root_model)
+@receiver(post_delete, sender=Post._parler_meta.root_model)
+@receiver(post_save, sender=Tag._parler_meta.root_model)
+@receiver(post_delete, sender=Tag._parler_meta.root_model)
+@receiver(post_save, sender=Category._parler_meta.root_model)
+@receiver(post_delete, sender=Category._parler_meta.root_model)
+def expire_cached_translations(sender, instance, **kwargs):  # type: ignore[unused-argument]
+    response_cache.invalidate_objects(
+        sender._meta.get_field("master").related_model, [instance.master_id]
     )
-    message.attach_alternative(html_body, "text/html")
 
-    try:
-        message.send()
-    except Exception:  # pragma: no cover - solo logging
-        logger.exception("No se pudo enviar email de bienvenida a %s", user.email)
-    else:
-        logger.info("Email de bienvenida enviado correctamente a %s", user.email)
+
+@receiver(m2m_changed, sender=User.groups.through)
+def expire_roles_on_group_change(sender, instance, action, reverse, pk_set, **kwargs):  # type: ignore[unused-argument]
+    if not reverse:
+        if action in {"post_add", "post_remove", "post_clear"}:
+            rbac.forget_roles(instance)
+    elif action in {"post_add", "post_remove"}:
+        rbac.invalidate_roles(*(pk_set or ()))
+    elif action == "pre_clear":
+        rbac.invalidate_roles(*instance.user_set.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def expire_roles_of_group_members(sender, instance, created=False, **kwargs):  # type: ignore[unused-argument]
+    if not created:
+        rbac.invalidate_roles(*instance.user_set.values_list("pk", flat=True))
+
+
+@receiver(post_init, sender=User)
+def remember_account_flags(sender, instance, **kwargs):  # type: ignore[unused-argument]
+    rbac.remember_account_flags(instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def expire_roles_of_user(sender, instance, created=True, **kwargs):  # type: ignore[unused-argument]
+    # New and deleted accounts too: a reused primary key must not inherit roles.
+    if created or rbac.account_flags_changed(instance):
+        rbac.invalidate_roles(instance.pk)
+    rbac.remember_account_flags(instance)
+
+
+@receiver(user_signed_up)
+def send_welcome_email(sender, request, user, **kwargs):  # type: ignore[unused-argument]
+    """Queue a welcome email for every new account created via registration."""
+
+    if not getattr(user, "email", None):
+        logger.info("Usuario %s sin email. Se omite bienvenida.", user.pk)
+        return
+    jobs.enqueue("blog.send_welcome_email", {"user_id": user.pk}, queue="emails")
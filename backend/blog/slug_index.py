@@ -0,0 +1,128 @@
+"""Resolution of post slugs across every configured language.
+
+A slug from a URL may belong to any translation of a post. :func:`resolve`
+answers with one indexed query on the translations table, which returns every
+translation of the posts owning that slug. Answers naming at least one post
+are memoized per process and stamped with a generation token that
+``blog.signals`` bumps on any post translation write. The token is a
+:class:`~blog.models.CacheVersion` row, so a write made through one worker
+also expires the entries of the others. Unknown slugs are never memoized: a
+post created or renamed elsewhere resolves on the next request.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+
+from . import response_cache
+from .models import Post
+from .utils.i18n import language_fallback_chain
+
+#: Shared version token of the whole index (see ``blog.response_cache``).
+GENERATION = "blog.post.slugs"
+
+MAX_ENTRIES = 4096
+
+
+class SlugMatch(NamedTuple):
+    post_id: int
+    #: Language of the translation whose slug matched.
+    language_code: str
+    #: Slug of the post in the requested language (or its fallback).
+    canonical_slug: str
+
+
+_entries: OrderedDict[str, tuple[str, tuple]] = OrderedDict()
+_lock = threading.Lock()
+
+
+def normalize(slug: str) -> str:
+    """Stored slugs are lowercase (``slugify_localized``)."""
+
+    return (slug or "").strip().lower()
+
+
+def _translations():
+    return Post._parler_meta.root_model.objects
+
+
+def _load(slug: str) -> tuple:
+    """Return ``(post_id, language_code, slug)`` of every translation of the owners."""
+
+    owners = _translations().filter(slug=slug).values("master_id")
+    return tuple(
+        _translations()
+        .filter(master_id__in=owners)
+        .order_by("master_id", "language_code")
+        .values_list("master_id", "language_code", "slug")
+    )
+
+
+def _rows(slug: str) -> tuple:
+    generation = response_cache.current_versions([GENERATION])[GENERATION]
+    with _lock:
+        entry = _entries.get(slug)
+        if entry is not None and entry[0] == generation:
+            _entries.move_to_end(slug)
+            return entry[1]
+    rows = _load(slug)
+    if not rows:
+        return rows
+    with _lock:
+        _entries[slug] = (generation, rows)
+        _entries.move_to_end(slug)
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+    return rows
+
+
+def _language_preference(language_code: Optional[str]) -> list[str]:
+    preference = [code for code in (language_code, settings.LANGUAGE_CODE) if code]
+    preference.extend(code for code, _name in getattr(settings, "LANGUAGES", ()))
+    return list(dict.fromkeys(preference))
+
+
+def resolve(slug: str, language_code: Optional[str] = None) -> list[SlugMatch]:
+    """Return the posts published under ``slug``, best candidate first.
+
+    Matches in ``language_code`` come first, then the default language and the
+    remaining ``LANGUAGES``; ties keep the oldest post.
+    """
+
+    normalized = normalize(slug)
+    if not normalized:
+        return []
+    slugs_by_post: dict[int, dict[str, str]] = {}
+    for post_id, code, value in _rows(normalized):
+        slugs_by_post.setdefault(post_id, {})[code] = value
+
+    preference = _language_preference(language_code)
+    rank = {code: index for index, code in enumerate(preference)}
+    matches = []
+    for post_id, slugs in slugs_by_post.items():
+        for code, value in slugs.items():
+            if value == normalized:
+                matches.append((rank.get(code, len(rank)), post_id, code))
+    matches.sort()
+
+    chain = language_fallback_chain(language_code) if language_code else preference
+    resolved = []
+    for _rank, post_id, code in matches:
+        slugs = slugs_by_post[post_id]
+        canonical = next((slugs[lang] for lang in chain if lang in slugs), slugs[code])
+        resolved.append(SlugMatch(post_id, code, canonical))
+    return resolved
+
+
+def invalidate() -> None:
+    """Expire the memoized resolutions of every process."""
+
+    response_cache.invalidate(GENERATION)
+
+
+def clear() -> None:
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,181 @@
+"""Render snapshots: prebuilt API payloads of public posts.
+
+Anonymous reads of published posts always produce the same JSON for a given
+``(post, language, expand)``. :class:`~blog.models.PostRenderSnapshot` keeps
+that JSON so ``PostViewSet`` can answer with a single lookup instead of
+loading translations, tags and categories and running the serializers.
+
+A snapshot is *fresh* while ``post.updated_at`` still equals the stamp it was
+built from (translations, relations and taxonomy renames touch the post) and
+none of the post's categories changed after it was built (their counters are
+embedded in ``categories_detail``). Stale snapshots are simply ignored and
+rebuilt on the next anonymous read; ``manage.py rebuild_render_snapshots``
+precomputes them in bulk.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional, Sequence
+
+from django.conf import settings
+from django.db.models import Exists, F, OuterRef, Prefetch
+from django.utils import timezone
+
+from . import rbac, response_cache
+from .models import Category, Post, PostRenderSnapshot, Tag
+from .serializers import PostDetailSerializer, PostListSerializer
+from .utils.i18n import language_fallback_chain, set_parler_language, translations_prefetch
+
+SERIALIZERS = {
+    PostRenderSnapshot.Kind.DETAIL: PostDetailSerializer,
+    PostRenderSnapshot.Kind.LIST: PostListSerializer,
+}
+
+_UPDATE_FIELDS = ["payload", "dependencies", "source_updated_at", "built_at"]
+
+
+def language_codes() -> list[str]:
+    return [code for code, _name in getattr(settings, "LANGUAGES", ())]
+
+
+def post_prefetches(language_code: str, expanded: bool) -> list[Prefetch]:
+    """Relations read by the post serializers, restricted to useful languages."""
+
+    languages = language_codes() if expanded else language_fallback_chain(language_code)
+    return [
+        translations_prefetch(Post, languages),
+        Prefetch(
+            "tags",
+            queryset=Tag.objects.prefetch_related(translations_prefetch(Tag, languages)),
+        ),
+        Prefetch(
+            "categories",
+            queryset=Category.objects.prefetch_related(translations_prefetch(Category, languages)),
+        ),
+    ]
+
+
+def dependencies(post: Post) -> list[str]:
+    """Response cache dependencies of a post payload (see ``blog.response_cache``)."""
+
+    return [
+        response_cache.dependency(Post, post.pk),
+        *(response_cache.dependency(Tag, tag.pk) for tag in post.tags.all()),
+        *(response_cache.dependency(Category, category.pk) for category in post.categories.all()),
+    ]
+
+
+def _fresh(queryset):
+    changed_categories = Post.categories.through.objects.filter(
+        post_id=OuterRef("post_id"), category__updated_at__gt=OuterRef("built_at")
+    )
+    return queryset.filter(
+        post__status__in=rbac.PUBLIC_POST_STATUSES,
+        post__updated_at=F("source_updated_at"),
+    ).exclude(Exists(changed_categories))
+
+
+def find_detail(post_ids: Sequence[int], language_code: str, expanded: bool) -> Optional[PostRenderSnapshot]:
+    """Return the fresh detail snapshot of the first of ``post_ids`` that has one.
+
+    ``post_ids`` are the candidates of ``blog.slug_index.resolve`` in order.
+    """
+
+    found = {
+        snapshot.post_id: snapshot
+        for snapshot in _fresh(
+            PostRenderSnapshot.objects.filter(
+                post_id__in=list(post_ids),
+                language_code=language_code,
+                kind=PostRenderSnapshot.Kind.DETAIL,
+                expanded=expanded,
+            )
+        ).only("post_id", "payload", "dependencies", "source_updated_at")
+    }
+    return next((found[post_id] for post_id in post_ids if post_id in found), None)
+
+
+def find_list_payloads(post_ids: Sequence[int], language_code: str, expanded: bool) -> dict[int, dict]:
+    """Map post ids to their fresh list payloads."""
+
+    rows = _fresh(
+        PostRenderSnapshot.objects.filter(
+            post_id__in=list(post_ids),
+            language_code=language_code,
+            kind=PostRenderSnapshot.Kind.LIST,
+            expanded=expanded,
+        )
+    ).values_list("post_id", "payload")
+    return dict(rows)
+
+
+def store(posts: Sequence[Post], payloads: Sequence[dict], kind: str, language_code: str, expanded: bool, built_at) -> None:
+    """Upsert the snapshots of ``posts`` rendered as ``payloads``.
+
+    ``built_at`` must be taken before the posts were loaded so a category
+    changed in between makes the snapshot stale rather than silently fresh.
+    """
+
+    snapshots = [
+        PostRenderSnapshot(
+            post_id=post.pk,
+            language_code=language_code,
+            kind=kind,
+            expanded=expanded,
+            payload=payload,
+            dependencies=dependencies(post),
+            source_updated_at=post.updated_at,
+            built_at=built_at,
+        )
+        for post, payload in zip(posts, payloads)
+        if post.status in rbac.PUBLIC_POST_STATUSES
+    ]
+    if snapshots:
+        PostRenderSnapshot.objects.bulk_create(
+            snapshots,
+            update_conflicts=True,
+            unique_fields=["post", "language_code", "kind", "expanded"],
+            update_fields=_UPDATE_FIELDS,
+        )
+
+
+def render(posts: Sequence[Post], kind: str, language_code: str, expanded: bool) -> list[dict]:
+    """Serialize prefetched ``posts`` exactly as an anonymous API request would."""
+
+    serializer_class = SERIALIZERS[kind]
+    context = {"language_code": language_code, "expand_translations": expanded}
+    with set_parler_language(language_code):
+        return list(serializer_class(posts, many=True, context=context).data)
+
+
+def build(
+    post_ids: Iterable[int],
+    languages: Optional[Sequence[str]] = None,
+    expanded_variants: Sequence[bool] = (False,),
+) -> int:
+    """(Re)build every snapshot of the public posts in ``post_ids``."""
+
+    post_ids = list(post_ids)
+    built = 0
+    for language_code in languages or language_codes():
+        for expanded in expanded_variants:
+            built_at = timezone.now()
+            with set_parler_language(language_code):
+                posts = list(
+                    Post.objects.filter(pk__in=post_ids, status__in=rbac.PUBLIC_POST_STATUSES)
+                    .select_related("created_by", "modified_by")
+                    .prefetch_related(*post_prefetches(language_code, expanded))
+                    .order_by("pk")
+                )
+            for kind in SERIALIZERS:
+                payloads = render(posts, kind, language_code, expanded)
+                store(posts, payloads, kind, language_code, expanded, built_at)
+                built += len(posts)
+    return built
+
+
+def public_post_ids() -> list[int]:
+    return list(
+        Post.objects.filter(status__in=rbac.PUBLIC_POST_STATUSES)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
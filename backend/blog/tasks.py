@@ -0,0 +1,139 @@
+"""Tasks run by the background job queue (:mod:`blog.jobs`)."""
+from __future__ import annotations
+
+import logging
+from typing import Final
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMultiAlternatives
+
+from . import jobs, post_translation, search, snapshots, translation_memory
+from .models import Category, Post, Tag
+from .utils import openai
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_FROM_EMAIL: Final[str] = (
+    getattr(settings, "DEFAULT_FROM_EMAIL", None)
+    or getattr(settings, "EMAIL_HOST_USER", "")
+    or "no-reply@codextest.local"
+)
+
+
+def _openai_failure(exc: Exception) -> Exception:
+    """Configuration and client errors will not improve with another attempt."""
+
+    if isinstance(exc, openai.OpenAIRateLimited):
+        return jobs.Deferred(str(exc), retry_after=exc.retry_after, status_code=exc.status_code)
+    if isinstance(exc, openai.OpenAIConfigurationError):
+        return jobs.PermanentFailure(str(exc), status_code=503)
+    if isinstance(exc, openai.OpenAIRequestError) and exc.status_code is not None:
+        if exc.status_code not in openai.RETRY_STATUSES:
+            return jobs.PermanentFailure(str(exc), status_code=exc.status_code)
+    return exc
+
+
+@jobs.task("blog.translate_text")
+def translate_text(payload: dict) -> dict:
+    try:
+        translation = translation_memory.translate(
+            text=payload["text"],
+            target_language=payload["target_lang"],
+            source_language=payload.get("source_lang"),
+            fmt=payload.get("format", "markdown"),
+        )
+    except (openai.OpenAIConfigurationError, openai.OpenAIRequestError) as exc:
+        raise _openai_failure(exc) from exc
+    return {
+        "translation": translation.text,
+        "target_lang": payload["target_lang"],
+        "source_lang": payload.get("source_lang"),
+        "format": payload.get("format", "markdown"),
+        "memory": translation.source,
+    }
+
+
+@jobs.task("blog.translate_post")
+def translate_post(payload: dict) -> dict:
+    post = Post._base_manager.filter(pk=payload["post_id"]).first()
+    if post is None:
+        raise jobs.PermanentFailure("La entrada ya no existe.", status_code=404)
+    try:
+        report = post_translation.translate(
+            post,
+            source_language=payload["source_lang"],
+            languages=payload.get("languages"),
+            force=payload.get("force", False),
+        )
+    except LookupError as exc:
+        raise jobs.PermanentFailure(exc.args[0], status_code=400) from exc
+    except (openai.OpenAIConfigurationError, openai.OpenAIRateLimited) as exc:
+        raise _openai_failure(exc) from exc
+    return {"source_lang": payload["source_lang"], "languages": report}
+
+
+@jobs.task("blog.send_welcome_email")
+def send_welcome_email(payload: dict) -> dict:
+    """Welcome email of the accounts created through allauth sign up."""
+
+    user = get_user_model().objects.filter(pk=payload["user_id"]).first()
+    if user is None or not user.email:
+        return {"sent": False}
+
+    display_name = user.get_full_name().strip() if user.get_full_name() else ""
+    if not display_name:
+        display_name = getattr(user, "username", None) or user.email
+
+    subject = "Bienvenido/a a CodexTest Blog"
+    text_body = (
+        f"Hola {display_name},\n\n"
+        "Gracias por registrarte en CodexTest Blog. Desde ahora podrás comentar "
+        "y guardar tus publicaciones favoritas.\n\n"
+        "¡Nos encanta tenerte por aquí!\n"
+        "El equipo de CodexTest"
+    )
+    html_body = (
+        "<p>Hola <strong>{name}</strong>,</p>"
+        "<p>Gracias por registrarte en CodexTest Blog. Ya puedes iniciar sesión para "
+        "guardar publicaciones y participar en la comunidad.</p>"
+        "<p>¡Nos encanta tenerte por aquí!<br />El equipo de CodexTest</p>"
+    ).format(name=display_name)
+
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body=text_body,
+        from_email=_DEFAULT_FROM_EMAIL,
+        to=[user.email],
+    )
+    message.attach_alternative(html_body, "text/html")
+    # SMTP errors propagate so the job is retried.
+    message.send()
+    logger.info("Email de bienvenida enviado correctamente a %s", user.email)
+    return {"sent": True}
+
+
+@jobs.task("blog.rebuild_render_snapshots")
+def rebuild_render_snapshots(payload: dict) -> dict:
+    languages = payload.get("languages") or snapshots.language_codes()
+    expanded_variants = (False, True) if payload.get("with_expanded") else (False,)
+    batch_size = max(1, int(payload.get("batch_size", 200)))
+    post_ids = snapshots.public_post_ids()
+    built = sum(
+        snapshots.build(post_ids[start : start + batch_size], languages, expanded_variants)
+        for start in range(0, len(post_ids), batch_size)
+    )
+    return {"built": built, "posts": len(post_ids)}
+
+
+@jobs.task("blog.index_taxonomy_posts")
+def index_taxonomy_posts(payload: dict) -> dict:
+    """Search documents of the posts of a renamed tag or category."""
+
+    model = {"tag": Tag, "category": Category}[payload["taxonomy"]]
+    instance = model.objects.filter(pk=payload["id"]).first()
+    if instance is None:
+        return {"indexed": 0}
+    post_ids = list(instance.posts.values_list("pk", flat=True))
+    search.index_posts(post_ids)
+    return {"indexed": len(post_ids)}
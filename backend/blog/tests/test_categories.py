@@ -2,12 +2,16 @@
 from __future__ import annotations
 
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Value
+from django.db.models.functions import Lower
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
 
 from blog.models import Category, Post, Tag
+from blog.serializers import PostDetailSerializer
 
 
 class CategoryAPITestCase(APITestCase):
@@ -90,6 +94,32 @@ class CategoryAPITestCase(APITestCase):
         self.assertEqual(response.data["count"], 1)
         self.assertEqual(response.data["results"][0]["slug"], post_a.slug)
 
+        response = self.client.get(reverse("blog:posts-list"), {"category": "FrontEnd"})
+        self.assertEqual(response.data["count"], 1)
+
+    def test_case_insensitive_lookups_use_expression_indexes(self) -> None:
+        """Category filters and tag reuse are served by the ``lower()`` indexes."""
+
+        Tag.objects.create(name="Python")
+        field = PostDetailSerializer().fields["tags"].child_relation
+        self.assertEqual(field.to_internal_value("PYTHON").name, "Python")
+        self.assertEqual(Tag.objects.count(), 1)
+        # Both sides go through the database ``lower()``, so names it cannot
+        # fold still find their tag instead of clashing on its slug.
+        etica = Tag.objects.create(name="Ética")
+        self.assertEqual(field.to_internal_value("Ética").pk, etica.pk)
+        self.assertEqual(Tag.objects.count(), 2)
+
+        if connection.vendor != "sqlite":
+            self.skipTest("Query plans are only asserted on SQLite.")
+        in_category = Post.categories.through.objects.filter(
+            category__translations__slug__lower=Lower(Value("frontend"))
+        )
+        plan = Post.objects.filter(pk__in=in_category.values("post_id")).explain()
+        self.assertIn("blog_category_tr_slug_ci_idx", plan)
+        by_name = Tag.objects.filter(name__lower=Lower(Value("python")))
+        self.assertIn("blog_tag_tr_name_ci_idx", by_name.explain())
+
     def test_create_post_with_categories(self) -> None:
         """The post endpoint accepts category slugs on creation."""
 
@@ -0,0 +1,150 @@
+"""Tests for ETag/Last-Modified validators and 304 responses."""
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
+from parler.utils.context import switch_language
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog.models import Comment, Post, Reaction, Tag
+
+
+class ConditionalRequestTests(APITestCase):
+    """Validate revalidation of posts, comments and reaction summaries."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.post = Post.objects.create(
+            title="Peticiones condicionales",
+            excerpt="Resumen",
+            content="Contenido suficientemente largo.",
+            image="https://example.com/image.png",
+            thumb="https://example.com/thumb.png",
+            imageAlt="Texto alternativo",
+            author="Codex",
+            status=Post.Status.PUBLISHED,
+        )
+        self.list_url = reverse("blog:posts-list")
+        self.detail_url = reverse("blog:posts-detail", kwargs={"slug": self.post.slug})
+
+    def _revalidate(self, url: str, etag: str):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_detail_answers_304_for_matching_validators(self) -> None:
+        """ETag and Last-Modified both short-circuit the detail response."""
+
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('"'))
+        self.assertIn("Last-Modified", response)
+        self.post.refresh_from_db()
+        self.assertEqual(parse_datetime(response.data["updated_at"]), self.post.updated_at)
+
+        revalidated = self._revalidate(self.detail_url, etag)
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(revalidated["ETag"], etag)
+        self.assertEqual(revalidated.content, b"")
+
+        by_date = self.client.get(
+            self.detail_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(by_date.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_translation_and_relation_changes_update_validators(self) -> None:
+        """Editing a translation or the tags of a post yields a new representation."""
+
+        etag = self.client.get(self.detail_url)["ETag"]
+        before = Post.objects.get(pk=self.post.pk).updated_at
+
+        with switch_language(self.post, "en"):
+            self.post.title = "Conditional requests"
+            self.post.save()
+        after_translation = Post.objects.get(pk=self.post.pk).updated_at
+        self.assertGreater(after_translation, before)
+        response = self._revalidate(self.detail_url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.post.tags.add(Tag.objects.create(name="HTTP"))
+        self.assertGreater(Post.objects.get(pk=self.post.pk).updated_at, after_translation)
+        self.assertEqual(
+            self._revalidate(self.detail_url, response["ETag"]).status_code,
+            status.HTTP_200_OK,
+        )
+
+    def test_list_validators_follow_the_collection_and_viewer(self) -> None:
+        """New posts change the list ETag and users do not share anonymous ETags."""
+
+        response = self.client.get(self.list_url)
+        etag = response["ETag"]
+        self.assertNotIn("Last-Modified", response)
+        self.assertEqual(
+            self._revalidate(self.list_url, etag).status_code, status.HTTP_304_NOT_MODIFIED
+        )
+
+        admin = get_user_model().objects.create_superuser(
+            username="admin", email="admin@example.com", password="strong-pass-123"
+        )
+        self.client.force_authenticate(admin)
+        self.assertEqual(self._revalidate(self.list_url, etag).status_code, status.HTTP_200_OK)
+        self.client.force_authenticate(None)
+
+        Post.objects.create(
+            title="Otra entrada publicada",
+            excerpt="Resumen",
+            content="Contenido suficientemente largo.",
+            image="https://example.com/image.png",
+            thumb="https://example.com/thumb.png",
+            imageAlt="Texto alternativo",
+            author="Codex",
+            status=Post.Status.PUBLISHED,
+        )
+        self.assertEqual(self._revalidate(self.list_url, etag).status_code, status.HTTP_200_OK)
+
+    def test_list_changes_when_an_older_post_leaves_it(self) -> None:
+        """Deleting or unpublishing a post that is not the newest yields a new list."""
+
+        newer = Post.objects.create(
+            title="Entrada más reciente",
+            excerpt="Resumen",
+            content="Contenido suficientemente largo.",
+            author="Codex",
+            status=Post.Status.PUBLISHED,
+        )
+        etag = self.client.get(self.list_url)["ETag"]
+
+        self.post.delete()
+        response = self._revalidate(self.list_url, etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["slug"] for item in response.data["results"]], [newer.slug])
+
+        newer.status = Post.Status.DRAFT
+        newer.save()
+        self.assertEqual(
+            self._revalidate(self.list_url, response["ETag"]).status_code, status.HTTP_200_OK
+        )
+
+    def test_comment_list_and_reaction_summary_are_revalidated(self) -> None:
+        """Comments and reactions expose ETags that change with their content."""
+
+        comments_url = reverse("blog:post-comments-list", kwargs={"slug_pk": self.post.slug})
+        etag = self.client.get(comments_url)["ETag"]
+        self.assertEqual(
+            self._revalidate(comments_url, etag).status_code, status.HTTP_304_NOT_MODIFIED
+        )
+        Comment.objects.create(post=self.post, author_name="Ana", content="Buen artículo")
+        self.assertEqual(self._revalidate(comments_url, etag).status_code, status.HTTP_200_OK)
+
+        reactions_url = reverse("blog:posts-reactions", kwargs={"slug": self.post.slug})
+        etag = self.client.get(reactions_url)["ETag"]
+        self.assertEqual(
+            self._revalidate(reactions_url, etag).status_code, status.HTTP_304_NOT_MODIFIED
+        )
+        user = get_user_model().objects.create_user(
+            username="lector", email="lector@example.com", password="strong-pass-123"
+        )
+        Reaction.objects.create(user=user, content_object=self.post, type=Reaction.Types.LIKE)
+        self.assertEqual(self._revalidate(reactions_url, etag).status_code, status.HTTP_200_OK)
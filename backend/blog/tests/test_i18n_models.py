@@ -3,11 +3,13 @@ from __future__ import annotations
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
+from django.db.models import Q
 from django.test import TestCase
 from django.urls import reverse
 from parler.utils.context import switch_language
 
-from blog.models import Category, Post, Tag
+from blog import models
+from blog.models import Category, Post, Tag, rewrite_lookup_key
 
 
 class I18nModelsTestCase(TestCase):
@@ -84,6 +86,19 @@ class I18nModelsTestCase(TestCase):
         other = Category.objects.filter(description__icontains="inter").first()
         self.assertIsNotNone(other)
 
+    def test_lookup_rewrites_are_memoized_per_model(self) -> None:
+        self.assertEqual(rewrite_lookup_key(Post, "title"), "translations__title")
+        self.assertEqual(
+            rewrite_lookup_key(Post, "categories__slug__lower"),
+            "categories__translations__slug__lower",
+        )
+        self.assertIn((Post, "tags__name"), models._REWRITE_PLANS)
+        self.assertEqual(rewrite_lookup_key(Post, "status"), "status")
+
+        post = self._create_post("Planes de consulta")
+        lookup = Q(title="Planes de consulta") | Q(slug="otro")
+        self.assertEqual(Post.objects.filter(lookup, status=post.status).get().pk, post.pk)
+
 
 class AdminI18nTestCase(TestCase):
     def setUp(self) -> None:
@@ -0,0 +1,182 @@
+"""Tests for the database-backed job queue."""
+from __future__ import annotations
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import Mock, patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog import jobs, translation_memory
+from blog.models import BackgroundJob, BackgroundJobQueue
+
+QUEUES = {"translations": 2, "maintenance": 1}
+
+
+def _register(name, function):
+    jobs.TASKS[name] = function
+
+
+@override_settings(BLOG_JOBS_EAGER=False, BLOG_JOB_QUEUES=QUEUES, BLOG_JOB_RETRY_DELAY=10)
+class JobQueueTests(TestCase):
+    """Jobs are claimed by priority within the limits of their queue."""
+
+    def setUp(self) -> None:
+        self.calls = []
+        _register("tests.echo", lambda payload: self.calls.append(payload) or payload)
+        self.addCleanup(jobs.TASKS.pop, "tests.echo", None)
+
+    def test_claim_by_priority_and_queue_concurrency(self) -> None:
+        """Higher priorities go first and no queue exceeds its limit."""
+
+        low = jobs.enqueue("tests.echo", {"n": 1}, queue="translations", priority=jobs.LOW_PRIORITY)
+        high = jobs.enqueue("tests.echo", {"n": 2}, queue="translations", priority=jobs.HIGH_PRIORITY)
+        normal = jobs.enqueue("tests.echo", {"n": 3}, queue="translations")
+        first = jobs.enqueue("tests.echo", {"n": 4}, queue="maintenance")
+        second = jobs.enqueue("tests.echo", {"n": 5}, queue="maintenance")
+
+        claimed = jobs.claim("worker-a", limit=10)
+
+        self.assertEqual([job.pk for job in claimed], [high.pk, normal.pk, first.pk])
+        self.assertEqual(
+            set(BackgroundJobQueue.objects.values_list("name", flat=True)), set(QUEUES)
+        )
+        self.assertEqual(jobs.claim("worker-b", limit=10), [])
+        jobs.execute(claimed[0])
+        self.assertEqual([job.pk for job in jobs.claim("worker-b", limit=10)], [low.pk])
+        self.assertEqual(BackgroundJob.objects.get(pk=second.pk).status, BackgroundJob.Status.QUEUED)
+        with self.assertRaises(KeyError):
+            jobs.enqueue("tests.echo", queue="unknown")
+
+    def test_failures_are_retried_with_backoff(self) -> None:
+        """A failing job is retried later and fails after its last attempt."""
+
+        _register("tests.echo", Mock(side_effect=RuntimeError("boom")))
+        job = jobs.enqueue("tests.echo", queue="maintenance", max_attempts=2)
+
+        (claimed,) = jobs.claim("worker")
+        jobs.execute(claimed)
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.Status.QUEUED)
+        self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=9))
+        self.assertEqual(jobs.claim("worker"), [])
+
+        BackgroundJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        (claimed,) = jobs.claim("worker")
+        jobs.execute(claimed)
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertEqual(job.result, {"detail": "boom", "status_code": None})
+
+    def test_expired_lease_is_taken_over(self) -> None:
+        """Another worker resumes a job whose lease expired; the old outcome is dropped."""
+
+        jobs.enqueue("tests.echo", {"n": 1}, queue="maintenance")
+        (stale,) = jobs.claim("worker-a")
+        BackgroundJob.objects.filter(pk=stale.pk).update(
+            leased_until=timezone.now() - timedelta(seconds=1)
+        )
+
+        (resumed,) = jobs.claim("worker-b")
+        jobs.execute(stale)
+        self.assertEqual(BackgroundJob.objects.get(pk=stale.pk).status, BackgroundJob.Status.RUNNING)
+        jobs.execute(resumed)
+
+        job = BackgroundJob.objects.get(pk=stale.pk)
+        self.assertEqual((job.status, job.attempts), (BackgroundJob.Status.SUCCEEDED, 2))
+        self.assertEqual(job.result, {"n": 1})
+
+
+@override_settings(
+    BLOG_JOBS_EAGER=False,
+    OPENAI_API_KEY="test-key",
+    OPENAI_DEFAULT_MODEL="test-model",
+    OPENAI_SYSTEM_PROMPT="prompt",
+    BLOG_TRANSLATION_MEMORY_TTL=3600,
+)
+class QueuedTranslationTests(APITestCase):
+    """Uncached translations answer 202 and are polled until a worker runs them."""
+
+    def setUp(self) -> None:
+        translation_memory.clear()
+        self.addCleanup(translation_memory.clear)
+        self.user = get_user_model().objects.create_user(username="traductor", password="x")
+        self.client.force_authenticate(self.user)
+        self.url = reverse("blog:ai-translations-list")
+        self.payload = {"text": "Hola mundo", "target_lang": "en", "format": "plain"}
+
+    def test_accepted_then_polled(self) -> None:
+        """The job URL reports the translation, and the next request is served from memory."""
+
+        accepted = self.client.post(self.url, self.payload, format="json")
+        self.assertEqual(accepted.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(accepted.data["status"], BackgroundJob.Status.QUEUED)
+        job_url = reverse("blog:jobs-detail", kwargs={"pk": accepted.data["id"]})
+        self.assertTrue(accepted["Location"].endswith(job_url))
+
+        response = Mock(status_code=200)
+        response.json.return_value = {"output_text": "Hello world"}
+        with patch("blog.utils.openai.requests.Session.post", return_value=response):
+            for job in jobs.claim("worker", ["translations"]):
+                jobs.execute(job)
+
+        polled = self.client.get(job_url)
+        self.assertEqual(polled.data["status"], BackgroundJob.Status.SUCCEEDED)
+        self.assertEqual(polled.data["result"]["translation"], "Hello world")
+        cached = self.client.post(self.url, self.payload, format="json")
+        self.assertEqual(cached.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached.data["translation"], "Hello world")
+
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(username="otra", password="x")
+        )
+        self.assertEqual(self.client.get(job_url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_polled_with_issued_token(self) -> None:
+        """Readers authenticated from token claims can poll their own jobs."""
+
+        self.client.force_authenticate(None)
+        login = self.client.post(
+            reverse("accounts:login"),
+            {"username": "traductor", "password": "x"},
+            format="json",
+        )
+        self.assertEqual(login.status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.data['access']}")
+
+        accepted = self.client.post(self.url, self.payload, format="json")
+        self.assertEqual(accepted.status_code, status.HTTP_202_ACCEPTED)
+        polled = self.client.get(reverse("blog:jobs-detail", kwargs={"pk": accepted.data["id"]}))
+        self.assertEqual(polled.status_code, status.HTTP_200_OK)
+        self.assertEqual(polled.data["status"], BackgroundJob.Status.QUEUED)
+
+
+@override_settings(BLOG_JOBS_EAGER=False, BLOG_JOB_QUEUES=QUEUES)
+class WorkerCommandTests(TransactionTestCase):
+    """``run_blog_worker --once`` drains the queues on its thread pool."""
+
+    def test_once_runs_pending_jobs(self) -> None:
+        """Every due job runs and the command stops when the queues are empty."""
+
+        _register("tests.echo", lambda payload: payload)
+        self.addCleanup(jobs.TASKS.pop, "tests.echo", None)
+        for number in range(3):
+            jobs.enqueue("tests.echo", {"n": number}, queue="translations")
+
+        # One thread: the table locks of the in-memory test database do not wait,
+        # so a claim must not overlap the write of a running job.
+        output = StringIO()
+        call_command("run_blog_worker", "--once", "--threads", "1", stdout=output)
+
+        self.assertIn("3 tareas ejecutadas", output.getvalue())
+        self.assertEqual(
+            sorted(BackgroundJob.objects.values_list("result__n", flat=True)), [0, 1, 2]
+        )
+        self.assertFalse(BackgroundJob.objects.exclude(status=BackgroundJob.Status.SUCCEEDED).exists())
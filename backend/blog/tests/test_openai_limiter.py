@@ -0,0 +1,133 @@
+"""Tests for the shared limits on OpenAI usage."""
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog import jobs, openai_limiter, translation_memory
+from blog.models import BackgroundJob, OpenAICallLease, OpenAIUsage
+from blog.utils import openai
+
+
+@override_settings(OPENAI_MAX_IN_FLIGHT=4, OPENAI_TOKEN_BUDGET=1000, OPENAI_LIMITER_MAX_WAIT=0)
+class OpenAILimiterTests(TestCase):
+    """Batches get the free slots and are shed once the limits are reached."""
+
+    def setUp(self) -> None:
+        openai_limiter.reset()
+        self.addCleanup(openai_limiter.reset)
+
+    def _check_limits(self) -> None:
+        with openai_limiter.reserve(10, 100, call_seconds=30) as slots:
+            self.assertEqual(slots, 4)
+            with self.assertRaises(openai.OpenAIRateLimited) as shed:
+                with openai_limiter.reserve(1, 100, call_seconds=30):
+                    pass
+            self.assertEqual((shed.exception.status_code, shed.exception.retry_after), (429, 1.0))
+        with openai_limiter.reserve(1, 800, call_seconds=30) as slots:
+            self.assertEqual(slots, 1)
+        self.assertIsNone(openai_limiter.exhausted())
+
+        with self.assertRaises(openai.OpenAIRateLimited) as shed:
+            with openai_limiter.reserve(1, 200, call_seconds=30):
+                pass
+        self.assertGreater(shed.exception.retry_after, 50)
+
+    def test_database_backend(self) -> None:
+        """Slots are leased in the database and the budget is shared."""
+
+        self._check_limits()
+        self.assertFalse(OpenAICallLease.objects.exists())
+        self.assertEqual(OpenAIUsage.objects.get().tokens, 900)
+
+        OpenAICallLease.objects.create(
+            owner="dead:1", slots=4, expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        OpenAIUsage.objects.update(window_started_at=timezone.now() - timedelta(seconds=61))
+        with openai_limiter.reserve(2, 1000, call_seconds=30) as slots:
+            self.assertEqual(slots, 2)
+        self.assertGreater(openai_limiter.exhausted(), 50)
+
+    @override_settings(OPENAI_LIMITER_BACKEND="local")
+    def test_local_backend(self) -> None:
+        """The in-process stand-in enforces the same limits."""
+
+        self._check_limits()
+        self.assertFalse(OpenAIUsage.objects.exists())
+
+
+@override_settings(
+    OPENAI_API_KEY="test-key",
+    OPENAI_DEFAULT_MODEL="test-model",
+    OPENAI_SYSTEM_PROMPT="prompt",
+    OPENAI_MAX_IN_FLIGHT=1,
+    OPENAI_TOKEN_BUDGET=1000,
+    OPENAI_LIMITER_MAX_WAIT=0,
+)
+class LimitedTranslationTests(APITestCase):
+    """Translations over the limits answer 429 with Retry-After or wait in the queue."""
+
+    def setUp(self) -> None:
+        translation_memory.clear()
+        self.addCleanup(translation_memory.clear)
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(username="traductor", password="x")
+        )
+        self.url = reverse("blog:ai-translations-list")
+        self.payload = {"text": "Hola mundo", "target_lang": "en", "format": "plain"}
+
+    def _hold_every_slot(self) -> None:
+        OpenAICallLease.objects.create(
+            owner="other:1", slots=1, expires_at=timezone.now() + timedelta(seconds=30)
+        )
+
+    def test_shed_when_saturated_or_over_budget(self) -> None:
+        """Busy slots fail the inline call and a spent budget is refused before queueing."""
+
+        self._hold_every_slot()
+        with patch("blog.utils.openai.requests.Session.post") as mock_post:
+            busy = self.client.post(self.url, self.payload, format="json")
+        self.assertEqual(busy.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(busy["Retry-After"], "1")
+        mock_post.assert_not_called()
+
+        OpenAIUsage.objects.update_or_create(
+            name=openai_limiter.USAGE_NAME,
+            defaults={"tokens": 1000, "window_started_at": timezone.now()},
+        )
+        jobs_before = BackgroundJob.objects.count()
+        spent = self.client.post(self.url, self.payload, format="json")
+        self.assertEqual(spent.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertGreater(int(spent["Retry-After"]), 50)
+        self.assertEqual(BackgroundJob.objects.count(), jobs_before)
+
+    @override_settings(BLOG_JOBS_EAGER=False)
+    def test_worker_defers_without_spending_attempts(self) -> None:
+        """A queued translation waits for a free slot and then runs."""
+
+        accepted = self.client.post(self.url, self.payload, format="json")
+        self._hold_every_slot()
+        (job,) = jobs.claim("worker", ["translations"])
+        jobs.execute(job)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (BackgroundJob.Status.QUEUED, 0))
+        self.assertGreater(job.run_after, timezone.now())
+
+        OpenAICallLease.objects.all().delete()
+        BackgroundJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        response = Mock(status_code=200)
+        response.json.return_value = {"output_text": "Hello world"}
+        with patch("blog.utils.openai.requests.Session.post", return_value=response):
+            (job,) = jobs.claim("worker", ["translations"])
+            jobs.execute(job)
+
+        polled = self.client.get(reverse("blog:jobs-detail", kwargs={"pk": accepted.data["id"]}))
+        self.assertEqual(polled.data["status"], BackgroundJob.Status.SUCCEEDED)
+        self.assertEqual(polled.data["attempts"], 1)
@@ -1,7 +1,11 @@
 """Tests for the OpenAI utility helpers."""
 from __future__ import annotations
 
+import json
 import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import Mock, patch
 
 from django.test import SimpleTestCase, override_settings
@@ -43,7 +47,7 @@ class OpenAIUtilsTests(SimpleTestCase):
         mock_response.status_code = 200
         mock_response.json.return_value = {"output_text": "Hello world"}
 
-        with patch("blog.utils.openai.requests.post", return_value=mock_response) as mock_post:
+        with patch("blog.utils.openai.requests.Session.post", return_value=mock_response) as mock_post:
             translation = translate_text(text="Hola mundo", target_language="en")
 
         self.assertEqual(translation, "Hello world")
@@ -63,7 +67,7 @@ class OpenAIUtilsTests(SimpleTestCase):
         mock_response.status_code = 200
         mock_response.json.return_value = {"output_text": "<p>Hello world</p>"}
 
-        with patch("blog.utils.openai.requests.post", return_value=mock_response) as mock_post:
+        with patch("blog.utils.openai.requests.Session.post", return_value=mock_response) as mock_post:
             translate_text(text="<p>Hola</p>", target_language="en", fmt="html")
 
         kwargs = mock_post.call_args.kwargs
@@ -78,7 +82,7 @@ class OpenAIUtilsTests(SimpleTestCase):
         mock_response.status_code = 200
         mock_response.json.return_value = {"output_text": "Hello world"}
 
-        with patch("blog.utils.openai.requests.post", return_value=mock_response) as mock_post:
+        with patch("blog.utils.openai.requests.Session.post", return_value=mock_response) as mock_post:
             translate_text(text="Hola", target_language="en", fmt="plain")
 
         kwargs = mock_post.call_args.kwargs
@@ -100,7 +104,7 @@ class OpenAIUtilsTests(SimpleTestCase):
         mock_response.status_code = 200
         mock_response.json.return_value = {"output_text": "Hello world"}
 
-        with patch("blog.utils.openai.requests.post", return_value=mock_response) as mock_post:
+        with patch("blog.utils.openai.requests.Session.post", return_value=mock_response) as mock_post:
             translation = translate_text(text="Hola mundo", target_language="en")
 
         self.assertEqual(translation, "Hello world")
@@ -120,7 +124,7 @@ class OpenAIUtilsTests(SimpleTestCase):
         mock_response.status_code = 401
         mock_response.json.return_value = {"error": {"message": "Invalid key"}}
 
-        with patch("blog.utils.openai.requests.post", return_value=mock_response):
+        with patch("blog.utils.openai.requests.Session.post", return_value=mock_response):
             with self.assertRaises(OpenAIRequestError) as ctx:
                 translate_text(text="Hola", target_language="en")
 
@@ -133,7 +137,7 @@ class OpenAIUtilsTests(SimpleTestCase):
         mock_response.status_code = 200
         mock_response.json.side_effect = ValueError("invalid json")
 
-        with patch("blog.utils.openai.requests.post", return_value=mock_response):
+        with patch("blog.utils.openai.requests.Session.post", return_value=mock_response):
             with self.assertRaises(OpenAIRequestError):
                 translate_text(text="Hola", target_language="en")
 
@@ -143,7 +147,7 @@ class OpenAIUtilsTests(SimpleTestCase):
         mock_response.status_code = 200
         mock_response.json.return_value = {}
 
-        with patch("blog.utils.openai.requests.post", return_value=mock_response):
+        with patch("blog.utils.openai.requests.Session.post", return_value=mock_response):
             with self.assertRaises(OpenAIRequestError):
                 translate_text(text="Hola", target_language="en")
 
@@ -152,3 +156,96 @@ class OpenAIUtilsTests(SimpleTestCase):
         with patch.dict(os.environ, {"OPEN_IA_KEY": "  'quoted-key'  "}):
             self.assertTrue(is_configured())
             self.assertEqual(openai._api_key(), "quoted-key")
+
+
+class _StubOpenAI(BaseHTTPRequestHandler):
+    """Replays the scripted ``(delay, status, headers)`` answers of the server."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+        with server.lock:
+            server.peers.append(self.client_address)
+            delay, status_code, headers = server.script.pop(0) if server.script else (0, 200, {})
+        time.sleep(delay)
+        body = json.dumps(
+            {"output_text": "Hello"} if status_code == 200 else {"error": {"message": "Ocupado"}}
+        ).encode("utf-8")
+        try:
+            self.send_response(status_code)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class OpenAIHTTPClientTests(SimpleTestCase):
+    """Exercise the pooled, retrying client against a local stub server."""
+
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOpenAI)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.peers = []
+        self.server.script = []
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        openai.reset_session()
+        self.addCleanup(openai.reset_session)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        settings = override_settings(
+            OPENAI_API_KEY="test-key",
+            OPENAI_API_URL=f"http://127.0.0.1:{self.server.server_address[1]}/v1/responses",
+            OPENAI_REQUEST_TIMEOUT=3,
+            OPENAI_MAX_RETRIES=2,
+            OPENAI_RETRY_BACKOFF=0.01,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_transient_errors_are_retried_on_one_kept_alive_connection(self) -> None:
+        self.server.script = [(0, 503, {}), (0, 502, {})]
+
+        self.assertEqual(translate_text(text="Hola", target_language="en"), "Hello")
+        self.assertEqual(translate_text(text="Hola", target_language="en"), "Hello")
+
+        self.assertEqual(len(self.server.peers), 4)
+        self.assertEqual(len(set(self.server.peers)), 1)
+
+    def test_retry_after_is_honoured(self) -> None:
+        self.server.script = [(0, 429, {"Retry-After": "0.4"})]
+
+        started = time.monotonic()
+        self.assertEqual(translate_text(text="Hola", target_language="en"), "Hello")
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.4)
+        self.assertEqual(len(self.server.peers), 2)
+
+    def test_persistent_errors_stop_after_the_last_retry(self) -> None:
+        self.server.script = [(0, 500, {})] * 5
+
+        with self.assertRaises(OpenAIRequestError) as ctx:
+            translate_text(text="Hola", target_language="en")
+
+        self.assertEqual(ctx.exception.status_code, 500)
+        self.assertEqual(len(self.server.peers), 3)
+
+    @override_settings(OPENAI_REQUEST_TIMEOUT=0.5)
+    def test_slow_answers_respect_the_overall_deadline(self) -> None:
+        self.server.script = [(2, 200, {})] * 3
+
+        started = time.monotonic()
+        with self.assertRaises(OpenAIRequestError):
+            translate_text(text="Hola", target_language="en")
+
+        self.assertLess(time.monotonic() - started, 1.5)
@@ -0,0 +1,139 @@
+"""Tests for the opt-in keyset pagination of the posts list."""
+from __future__ import annotations
+
+from base64 import b64encode
+from datetime import date, timedelta
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog.models import Category, Post
+
+
+class PostKeysetPaginationTests(APITestCase):
+    """Validate cursor navigation over the ``(-date, -id)`` ordering."""
+
+    def setUp(self) -> None:
+        self.list_url = reverse("blog:posts-list")
+        self.posts = []
+        # Several posts share the same date so ties must be broken by ``id``.
+        for index in range(7):
+            self.posts.append(self._create_post(f"Entrada {index}", days_offset=index // 3))
+
+    def _create_post(self, title: str, days_offset: int = 0) -> Post:
+        return Post.objects.create(
+            title=title,
+            excerpt=f"Resumen de {title}",
+            content=f"Contenido de {title}",
+            date=date.today() - timedelta(days=days_offset),
+            image="https://example.com/image.png",
+            thumb="https://example.com/thumb.png",
+            imageAlt="Texto alternativo",
+            author="Codex",
+            status=Post.Status.PUBLISHED,
+        )
+
+    def _expected_ids(self) -> list[int]:
+        ordered = sorted(self.posts, key=lambda post: (post.date, post.id), reverse=True)
+        return [post.id for post in ordered]
+
+    def test_cursor_walks_every_post_once_without_count(self) -> None:
+        """Following ``next`` links must visit each post exactly once in order."""
+
+        seen: list[int] = []
+        response = self.client.get(self.list_url, {"pagination": "cursor", "page_size": 3})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            seen.extend(item["id"] for item in response.data["results"])
+            next_url = response.data["next"]
+            if not next_url:
+                break
+            response = self.client.get(next_url)
+
+        self.assertEqual(seen, self._expected_ids())
+
+    def test_previous_link_returns_prior_page(self) -> None:
+        """The ``previous`` cursor must rebuild the preceding page in the same order."""
+
+        first = self.client.get(self.list_url, {"pagination": "cursor", "page_size": 3})
+        self.assertIsNone(first.data["previous"])
+        second = self.client.get(first.data["next"])
+        self.assertIsNotNone(second.data["previous"])
+
+        back = self.client.get(second.data["previous"])
+
+        self.assertEqual(back.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [item["id"] for item in back.data["results"]],
+            [item["id"] for item in first.data["results"]],
+        )
+
+    @override_settings(BLOG_RESPONSE_CACHE_TIMEOUT=0)
+    def test_cursor_pages_are_revalidated_without_aggregates(self) -> None:
+        """The ETag of a cursor page comes from its rows, not from the whole list."""
+
+        params = {"pagination": "cursor", "page_size": 3}
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, params)
+        self.assertFalse(
+            [query["sql"] for query in queries.captured_queries if "COUNT(" in query["sql"]]
+        )
+        etag = response["ETag"]
+
+        revalidated = self.client.get(self.list_url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self._create_post("Entrada nueva")
+        changed = self.client.get(self.list_url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(changed.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(changed["ETag"], etag)
+
+    def test_count_is_included_on_demand(self) -> None:
+        """``count=true`` adds the total to cursor responses."""
+
+        response = self.client.get(
+            self.list_url, {"pagination": "cursor", "page_size": 2, "count": "true"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], len(self.posts))
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_cursor_mode_keeps_filters(self) -> None:
+        """Category filters must still apply when paginating with cursors."""
+
+        category = Category.objects.create(name="Backend")
+        self.posts[0].categories.add(category)
+        self.posts[4].categories.add(category)
+
+        response = self.client.get(
+            self.list_url,
+            {"pagination": "cursor", "category": category.slug, "page_size": 1},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["id"], self.posts[0].id)
+        follow = self.client.get(response.data["next"])
+        self.assertEqual([item["id"] for item in follow.data["results"]], [self.posts[4].id])
+        self.assertIsNone(follow.data["next"])
+
+    def test_invalid_cursor_returns_not_found(self) -> None:
+        """Tampered cursors are rejected instead of raising server errors."""
+
+        cursor = b64encode(b"p=not-a-date&p=1").decode("ascii")
+        response = self.client.get(self.list_url, {"cursor": cursor})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_mode_remains_default(self) -> None:
+        """Without opting in the list keeps returning page-number metadata."""
+
+        response = self.client.get(self.list_url, {"page_size": 3})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], len(self.posts))
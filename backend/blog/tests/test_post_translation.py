@@ -0,0 +1,136 @@
+"""Tests for the whole-post translation action."""
+from __future__ import annotations
+
+import time
+from unittest.mock import Mock, patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from parler.utils.context import switch_language
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog import rbac, translation_memory
+from blog.models import Post
+
+LATENCY = 0.2
+
+
+def _fake_openai(url, json, headers, timeout):
+    """Answer with the upper-cased text after a fixed delay."""
+
+    time.sleep(LATENCY)
+    response = Mock(status_code=200)
+    response.json.return_value = {"output_text": json["input"].split("Texto:\n", 1)[1].upper()}
+    return response
+
+
+@override_settings(
+    OPENAI_API_KEY="test-key",
+    OPENAI_DEFAULT_MODEL="test-model",
+    OPENAI_SYSTEM_PROMPT="prompt",
+    OPENAI_MAX_RETRIES=0,
+    BLOG_TRANSLATION_MEMORY_TTL=3600,
+)
+class PostTranslationActionTests(APITestCase):
+    """A post is translated into every missing or stale language in one call."""
+
+    @classmethod
+    def setUpTestData(cls):  # type: ignore[override]
+        call_command("seed_roles")
+
+    def setUp(self) -> None:
+        cache.clear()
+        translation_memory.clear()
+        self.addCleanup(translation_memory.clear)
+        self.post = Post.objects.create(
+            title="Hola mundo",
+            excerpt="Un resumen",
+            content="Primer parrafo.\n\nSegundo parrafo.",
+            image="https://example.com/image.png",
+            thumb="https://example.com/thumb.png",
+            imageAlt="Alt",
+            author="Codex",
+            status=Post.Status.PUBLISHED,
+        )
+        editor = get_user_model().objects.create_user(username="editor", password="x")
+        rbac.assign_roles(editor, [rbac.Role.EDITOR])
+        self.client.force_authenticate(editor)
+        self.url = reverse("blog:posts-translate", kwargs={"slug": self.post.slug})
+
+    def _translate(self, payload=None):
+        with patch(
+            "blog.utils.openai.requests.Session.post", side_effect=_fake_openai
+        ) as mock_post:
+            started = time.monotonic()
+            response = self.client.post(self.url, payload or {}, format="json")
+            self.elapsed = time.monotonic() - started
+        self.calls = mock_post.call_count
+        return response
+
+    def _english(self):
+        return Post._parler_meta.root_model.objects.get(master=self.post, language_code="en")
+
+    def test_missing_language_is_translated_concurrently(self) -> None:
+        """The fields are translated in parallel and saved with a slug."""
+
+        response = self._translate()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["languages"], {"en": {"status": "created", "slug": "hola-mundo"}}
+        )
+        self.assertEqual(self.calls, 3)
+        self.assertLess(self.elapsed, LATENCY * 2)
+        english = self._english()
+        self.assertEqual(english.content, "PRIMER PARRAFO.\n\nSEGUNDO PARRAFO.")
+        detail = self.client.get(
+            reverse("blog:posts-detail", kwargs={"slug": "hola-mundo"}), {"lang": "en"}
+        )
+        self.assertEqual(detail.data["title"], "HOLA MUNDO")
+
+    def test_current_stale_and_manual_languages(self) -> None:
+        """Up to date translations are skipped and manual edits are kept."""
+
+        self._translate()
+        self.assertEqual(self._translate().data["languages"]["en"]["status"], "current")
+        self.assertEqual(self.calls, 0)
+
+        with switch_language(self.post, "es"):
+            self.post.content = "Contenido nuevo."
+            self.post.save()
+        stale = self._translate()
+        self.assertEqual(stale.data["languages"]["en"], {"status": "updated", "slug": "hola-mundo"})
+        self.assertEqual(self._english().content, "CONTENIDO NUEVO.")
+
+        english = self._english()
+        english.content = "Edited by hand."
+        english.save()
+        self.assertEqual(self._translate().data["languages"]["en"]["status"], "manual")
+        forced = self._translate({"force": True})
+        self.assertEqual(forced.data["languages"]["en"]["status"], "updated")
+        self.assertEqual(self._english().content, "CONTENIDO NUEVO.")
+
+    def test_failed_language_is_not_written(self) -> None:
+        """A failing language reports its error and leaves no row behind."""
+
+        failure = Mock(status_code=400)
+        failure.json.return_value = {"error": {"message": "Solicitud inválida"}}
+        with patch("blog.utils.openai.requests.Session.post", return_value=failure):
+            response = self.client.post(self.url, {}, format="json")
+
+        self.assertEqual(
+            response.data["languages"], {"en": {"status": "failed", "detail": "Solicitud inválida"}}
+        )
+        self.assertNotIn("en", self.post.get_available_languages())
+
+    def test_requires_permission_to_edit(self) -> None:
+        """Anonymous users cannot translate posts."""
+
+        self.client.force_authenticate(None)
+        response = self.client.post(self.url, {}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
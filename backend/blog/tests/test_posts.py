@@ -2,14 +2,20 @@
 from __future__ import annotations
 
 from datetime import date, timedelta
+from io import StringIO
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
 
-from blog.models import Category, Comment, Post, Tag
+from blog import post_counters, reaction_counters
+from blog.models import Category, Comment, Post, PostRenderSnapshot, Reaction, Tag
 
 
 class PostAPITestCase(APITestCase):
@@ -161,6 +167,84 @@ class PostAPITestCase(APITestCase):
         self.assertIsNotNone(detail)
         self.assertIn("post_count", detail)
 
+    def test_list_query_count_does_not_depend_on_page_size(self) -> None:
+        """Listing posts must use a fixed number of queries per page."""
+
+        backend = Category.objects.create(name="Backend")
+        frontend = Category.objects.create(name="Frontend")
+        for index in range(6):
+            post = self._create_post(f"Entrada {index}", days_offset=index)
+            post.categories.add(backend, frontend)
+        self._create_post("Sin categoría", days_offset=10).categories.add(backend)
+
+        # cache versions, count (shared with the ETag), posts, render snapshots,
+        # translations, tags (+ translations) and categories (+ translations) of
+        # the posts without a snapshot, and the snapshot upsert; counters are
+        # stored columns.
+        for page_size in (1, 3, 7):
+            with self.assertNumQueries(10):
+                response = self.client.get(self.list_url, {"page_size": page_size})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data["results"]), page_size)
+
+        counts = {
+            item["slug"]: item["post_count"]
+            for item in response.data["results"][0]["categories_detail"]
+        }
+        self.assertEqual(counts, {backend.slug: 7, frontend.slug: 6})
+
+    def test_loaded_post_can_be_saved_as_a_copy(self) -> None:
+        """Clearing the primary key of a loaded post inserts a new row."""
+
+        original = self._create_post("Entrada original")
+        copy = Post.objects.get(pk=original.pk)
+        copy.pk = None
+        copy.save()
+
+        self.assertNotEqual(copy.pk, original.pk)
+        self.assertEqual(Post.objects.filter(pk__in=[original.pk, copy.pk]).count(), 2)
+
+    def test_list_exposes_comment_and_reaction_totals(self) -> None:
+        """Both count modes serve the same totals without per-row queries."""
+
+        readers = [
+            get_user_model().objects.create_user(username=f"lector{index}", password="x")
+            for index in range(3)
+        ]
+        busy = self._create_post("Con actividad")
+        quiet = self._create_post("Sin actividad", days_offset=1)
+        for index in range(3):
+            Comment.objects.create(post=busy, author_name=f"Autor {index}", content="Hola")
+        for reader, reaction_type in zip(readers, (Reaction.Types.LIKE, Reaction.Types.WOW)):
+            Reaction.objects.create(user=reader, content_object=busy, type=reaction_type)
+        reaction_counters.toggle(readers[2].pk, busy, Reaction.Types.CLAP)
+        Comment.objects.filter(post=busy).first().delete()
+        busy.refresh_from_db()
+        busy.excerpt = "Resumen editado"
+        busy.save()  # a full save must not overwrite the stored totals
+
+        call_command("recount_post_totals", "--dry-run", stdout=StringIO())
+        self.assertEqual(post_counters.drifted_ids(), [])
+        for mode in post_counters.MODES:
+            with self.subTest(mode=mode), override_settings(BLOG_POST_COUNTS_MODE=mode):
+                cache.clear()
+                PostRenderSnapshot.objects.all().delete()
+                # As in the page size test, minus the (absent) category translations.
+                with self.assertNumQueries(9):
+                    response = self.client.get(self.list_url)
+                totals = {
+                    item["slug"]: (item["comment_count"], item["reaction_total"])
+                    for item in response.data["results"]
+                }
+                self.assertEqual(totals, {busy.slug: (2, 3), quiet.slug: (0, 0)})
+
+        Post.objects.filter(pk=busy.pk).update(comment_count=9)
+        output = StringIO()
+        call_command("recount_post_totals", stdout=output)
+        self.assertIn("Entradas: 1 corregidas de 2.", output.getvalue())
+        busy.refresh_from_db(fields=["comment_count"])
+        self.assertEqual(busy.comment_count, 2)
+
     def test_post_detail_without_categories_returns_empty_arrays(self) -> None:
         """Posts without categories must expose empty lists in the payload."""
 
@@ -264,6 +348,38 @@ class CommentAPITestCase(APITestCase):
         self.assertEqual(response.data["count"], 1)
         self.assertEqual(response.data["results"][0]["author_name"], "Ana")
 
+    def test_list_comments_with_cursor_pagination(self) -> None:
+        """Cursor pages walk every comment once, newest first, in constant queries."""
+
+        moment = timezone.now()
+        comments = [
+            Comment.objects.create(
+                post=self.post,
+                author_name=f"Autor {index}",
+                content="Comentario repetido",
+                created_at=moment - timedelta(minutes=index // 2),
+            )
+            for index in range(5)
+        ]
+        expected = [
+            comment.pk
+            for comment in sorted(comments, key=lambda item: (item.created_at, item.pk), reverse=True)
+        ]
+
+        self.client.get(self.comments_url)  # warms the memoized slug resolution
+        seen = []
+        url, params = self.comments_url, {"pagination": "cursor", "page_size": 2}
+        while url:
+            # Slug generation, post id, cache versions and the page, which gives the ETag.
+            with self.assertNumQueries(4):
+                response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            self.assertTrue(all(item["post"] == self.post.slug for item in response.data["results"]))
+            seen += [item["id"] for item in response.data["results"]]
+            url, params = response.data["next"], {}
+        self.assertEqual(seen, expected)
+
     def test_create_comment_success(self) -> None:
         """Posting a valid comment should return 201 and persist the object."""
 
@@ -1,16 +1,24 @@
 """RBAC integration tests covering role-based permissions."""
 from __future__ import annotations
 
+import tempfile
 from datetime import date
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
 from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
 
 from blog import rbac
-from blog.models import Comment, Post, Tag
+from blog.models import CacheVersion, Comment, Post, Tag
 
 
 class RBACMixin:
@@ -233,3 +241,152 @@ class AuditFieldsTestCase(RBACMixin, APITestCase):
         )
         self.assertEqual(update_response.status_code, status.HTTP_200_OK)
         self.assertEqual(update_response.data["modified_by"]["username"], self.editor.username)
+
+
+class RoleCacheTestCase(RBACMixin, APITestCase):
+    """Validate that role lookups are cached and expire with group changes."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.author = self.create_user_with_role("cached-author", rbac.Role.AUTHOR)
+
+    def fresh_user(self):
+        return self.user_model.objects.get(pk=self.author.pk)
+
+    def test_roles_are_not_shared_through_a_per_process_cache(self) -> None:
+        self.assertTrue(rbac.user_has_role(self.fresh_user(), rbac.Role.AUTHOR))
+        user = self.fresh_user()
+        with self.assertNumQueries(1):
+            self.assertTrue(rbac.user_has_role(user, rbac.Role.AUTHOR))
+
+    def test_roles_are_cached_until_groups_change(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        shared = {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": directory.name,
+        }
+        overrides = override_settings(
+            CACHES={**settings.CACHES, "roles": shared}, BLOG_ROLE_CACHE_ALIAS="roles"
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+        user = self.fresh_user()
+        with self.assertNumQueries(1):
+            self.assertTrue(rbac.user_has_role(user, rbac.Role.AUTHOR))
+            self.assertFalse(rbac.user_has_role(user, rbac.Role.EDITOR))
+            self.assertEqual(rbac.user_roles(user), {rbac.Role.AUTHOR})
+
+        user = self.fresh_user()
+        with self.assertNumQueries(0):
+            self.assertTrue(rbac.user_has_role(user, rbac.Role.AUTHOR))
+
+        editors = Group.objects.get(name=rbac.Role.EDITOR)
+        user.groups.add(editors)
+        self.assertEqual(rbac.user_roles(user), {rbac.Role.AUTHOR, rbac.Role.EDITOR})
+
+        editors.user_set.remove(self.author)
+        self.assertEqual(rbac.user_roles(self.fresh_user()), {rbac.Role.AUTHOR})
+
+        rbac.assign_roles(self.author, [rbac.Role.READER])
+        self.assertEqual(rbac.user_roles(self.fresh_user()), {rbac.Role.READER})
+
+
+class RoleClaimsTokenTestCase(RBACMixin, APITestCase):
+    """Validate role-bearing access tokens and their stateless reads."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.author = self.create_user_with_role("claims-author", rbac.Role.AUTHOR)
+        self.draft = self.create_post_object(
+            "Borrador propio", created_by=self.author, status_value=Post.Status.DRAFT
+        )
+
+    def login(self) -> dict:
+        response = self.client.post(
+            reverse("accounts:login"),
+            {"username": "claims-author", "password": "test-pass-123"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def read_posts(self, access: str):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("blog:posts-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        user_queries = [
+            query["sql"]
+            for query in queries.captured_queries
+            if 'FROM "auth_user"' in query["sql"] or '"auth_user_groups"' in query["sql"]
+        ]
+        return response, user_queries
+
+    def test_reads_trust_current_role_claims(self) -> None:
+        tokens = self.login()
+        self.assertEqual(AccessToken(tokens["access"])["roles"], [rbac.Role.AUTHOR])
+
+        response, user_queries = self.read_posts(tokens["access"])
+        self.assertEqual(user_queries, [])
+        self.assertIn(self.draft.slug, [item["slug"] for item in response.data["results"]])
+
+        rbac.assign_roles(self.author, [rbac.Role.READER])
+        response, user_queries = self.read_posts(tokens["access"])
+        self.assertTrue(user_queries)
+        self.assertNotIn(self.draft.slug, [item["slug"] for item in response.data["results"]])
+
+        refreshed = self.client.post(
+            reverse("token_refresh"), {"refresh": tokens["refresh"]}, format="json"
+        )
+        self.assertEqual(refreshed.status_code, status.HTTP_200_OK)
+        self.assertEqual(AccessToken(refreshed.data["access"])["roles"], [rbac.Role.READER])
+        _response, user_queries = self.read_posts(refreshed.data["access"])
+        self.assertEqual(user_queries, [])
+
+    def test_safe_endpoints_accept_claims_users(self) -> None:
+        """Reads that look at the user work with the token-built user."""
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.login()['access']}")
+        detail = reverse("blog:posts-detail", kwargs={"slug": self.draft.slug})
+        self.assertEqual(self.client.get(detail).status_code, status.HTTP_200_OK)
+        reactions = self.client.get(
+            reverse("blog:posts-reactions", kwargs={"slug": self.draft.slug})
+        )
+        self.assertEqual(reactions.status_code, status.HTTP_200_OK)
+        summaries = self.client.get(
+            reverse("blog:posts-reaction-summaries"), {"slugs": self.draft.slug}
+        )
+        self.assertEqual(summaries.status_code, status.HTTP_200_OK)
+
+        me = self.client.get(reverse("blog:me"))
+        self.assertEqual(me.status_code, status.HTTP_200_OK)
+        self.assertEqual(me.data["id"], self.author.pk)
+        self.assertEqual(me.data["username"], "claims-author")
+        self.assertEqual(me.data["roles"], [rbac.Role.AUTHOR])
+        profile = self.client.get(reverse("accounts:user"))
+        self.assertEqual(profile.status_code, status.HTTP_200_OK)
+        self.assertEqual(profile.data["email"], self.author.email)
+
+    def test_role_versions_are_shared_by_every_process(self) -> None:
+        """Claims follow the stored version, not the cache of the process."""
+
+        access = self.login()["access"]
+        cache.clear()
+        self.assertEqual(self.read_posts(access)[1], [])
+
+        # Another worker changes the roles and bumps the version in the database.
+        CacheVersion.objects.filter(name__endswith=f":version:{self.author.pk}").update(
+            version="other-process"
+        )
+        self.assertTrue(self.read_posts(access)[1])
+
+    def test_deactivated_users_lose_claims_access(self) -> None:
+        access = self.login()["access"]
+        self.author.is_active = False
+        self.author.save(update_fields=["is_active"])
+
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        response = self.client.get(reverse("blog:me"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -1,13 +1,24 @@
 from __future__ import annotations
 
+import threading
+import time
+from io import StringIO
+
 from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
 from django.core.cache import cache
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.db.models import Count
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.settings import api_settings
 from rest_framework.test import APITestCase
 
-from blog.models import Post, Reaction
+from blog import reaction_counters
+from blog.models import Post, Reaction, ReactionCounter
 
 
 class ReactionAPITestCase(APITestCase):
@@ -88,6 +99,69 @@ class ReactionAPITestCase(APITestCase):
         self.assertEqual(anonymous_response.status_code, status.HTTP_200_OK)
         self.assertIsNone(anonymous_response.data.get("my_reaction"))
 
+    def test_counters_follow_every_reaction_write(self):
+        """Counters move with creations, type changes and deletions, and can be rebuilt."""
+
+        other_reaction = Reaction.objects.create(
+            user=self.other, content_object=self.post, type=Reaction.Types.CLAP
+        )
+        self.client.force_authenticate(self.user)
+        self.client.post(self.react_url, {"type": Reaction.Types.CLAP}, format="json")
+        self.client.post(self.react_url, {"type": Reaction.Types.LOVE}, format="json")
+        other_reaction.delete()
+
+        counts = dict(ReactionCounter.objects.filter(count__gt=0).values_list("type", "count"))
+        self.assertEqual(counts, {Reaction.Types.LOVE: 1})
+
+        self.client.logout()
+        with self.assertNumQueries(3):
+            response = self.client.get(self.reactions_url)
+        self.assertEqual(response.data["total"], 1)
+
+        ReactionCounter.objects.filter(type=Reaction.Types.LOVE).update(count=7)
+        output = StringIO()
+        call_command("rebuild_reaction_counters", "--batch-size", "1", stdout=output)
+        self.assertIn("1 corregidos en 1 objetos", output.getvalue())
+        self.assertEqual(ReactionCounter.objects.get(type=Reaction.Types.LOVE).count, 1)
+
+    def test_batch_summaries_cover_visible_posts(self):
+        """The batch endpoint returns every visible summary from grouped queries."""
+
+        second = Post.objects.create(
+            title="Otra entrada con reacciones",
+            excerpt="Resumen",
+            content="Contenido",
+            status=Post.Status.PUBLISHED,
+        )
+        draft = Post.objects.create(title="Borrador oculto", excerpt="Resumen", content="Contenido")
+        Reaction.objects.create(user=self.user, content_object=self.post, type=Reaction.Types.WOW)
+        Reaction.objects.create(user=self.other, content_object=self.post, type=Reaction.Types.LIKE)
+        Reaction.objects.create(user=self.other, content_object=second, type=Reaction.Types.CLAP)
+        url = reverse("blog:posts-reaction-summaries")
+        params = {"slugs": f"{self.post.slug},{draft.slug},missing", "ids": f"{second.pk},{draft.pk}"}
+
+        with self.assertNumQueries(3):
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(item["id"], item["slug"], item["total"]) for item in response.data],
+            [(self.post.pk, self.post.slug, 2), (second.pk, None, 1)],
+        )
+        self.assertIsNone(response.data[0]["my_reaction"])
+
+        self.client.force_authenticate(self.user)
+        response = self.client.get(url, params)
+        self.assertEqual(response.data[0]["my_reaction"], Reaction.Types.WOW)
+        self.assertEqual(response.data[0]["counts"][Reaction.Types.LIKE], 1)
+        self.assertIsNone(response.data[1]["my_reaction"])
+        cached = self.client.get(url, params, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        invalid = self.client.get(url, {"ids": "1,abc"})
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        too_many = self.client.get(url, {"ids": ",".join(str(pk) for pk in range(1, 52))})
+        self.assertEqual(too_many.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_toggle_requires_authentication(self):
         """Unauthenticated users cannot toggle reactions."""
 
@@ -118,3 +192,103 @@ class ReactionAPITestCase(APITestCase):
                 api_settings.DEFAULT_THROTTLE_RATES["reactions"] = original_rate
             api_settings.reload()
             cache.clear()
+
+
+class ReactionToggleConcurrencyTestCase(TransactionTestCase):
+    """Validate the single-statement toggle under concurrent requests."""
+
+    def setUp(self):
+        self.users = [
+            get_user_model().objects.create_user(username=f"concurrent-{index}", password="pass")
+            for index in range(4)
+        ]
+        self.post = Post.objects.create(
+            title="Entrada concurrida",
+            excerpt="Resumen",
+            content="Contenido extendido" * 3,
+            image="https://example.com/image.png",
+            thumb="https://example.com/thumb.png",
+            imageAlt="Texto alternativo",
+            author="Codex",
+            status=Post.Status.PUBLISHED,
+        )
+
+    def toggle(self, reaction_type, statements):
+        with CaptureQueriesContext(connection) as queries:
+            result = reaction_counters.toggle(self.users[0].pk, self.post, reaction_type)
+        # Transaction control is only logged by some backends (e.g. SQLite).
+        executed = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].split()[0] not in {"BEGIN", "COMMIT", "SAVEPOINT", "RELEASE"}
+        ]
+        self.assertEqual(len(executed), statements, executed)
+        return result
+
+    def test_toggle_round_trips(self):
+        """A toggle writes the reaction and reads the summary in two or three statements.
+
+        Adding or removing a reaction also moves ``Post.reaction_total`` and
+        bumps the cache versions of the post.
+        """
+
+        ContentType.objects.get_for_model(Post)
+
+        counts, mine = self.toggle(Reaction.Types.LIKE, 5)
+        self.assertEqual((counts[Reaction.Types.LIKE], mine), (1, Reaction.Types.LIKE))
+
+        counts, mine = self.toggle(Reaction.Types.WOW, 3)
+        self.assertEqual(
+            (counts[Reaction.Types.LIKE], counts[Reaction.Types.WOW], mine),
+            (0, 1, Reaction.Types.WOW),
+        )
+
+        counts, mine = self.toggle(Reaction.Types.WOW, 4)
+        self.assertEqual((sum(counts.values()), mine), (0, None))
+        self.post.refresh_from_db(fields=["reaction_total"])
+        self.assertEqual(self.post.reaction_total, 0)
+
+    def test_concurrent_toggles_keep_one_reaction_and_exact_counters(self):
+        """Parallel toggles never duplicate reactions nor drift the counters."""
+
+        types = [Reaction.Types.LIKE, Reaction.Types.LOVE, Reaction.Types.CLAP]
+        errors = []
+        barrier = threading.Barrier(len(self.users) * 2)
+
+        def worker(user, offset):
+            try:
+                barrier.wait(timeout=10)
+                for step in range(6):
+                    reaction_type = types[(offset + step) % len(types)]
+                    for attempt in range(20):
+                        try:
+                            reaction_counters.toggle(user.pk, self.post, reaction_type)
+                            break
+                        except OperationalError:
+                            # SQLite reports lock contention instead of waiting.
+                            time.sleep(0.01 * (attempt + 1))
+                    else:
+                        raise AssertionError("toggle never acquired the database lock")
+            except Exception as exc:  # pragma: no cover - surfaced below
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker, args=(user, offset))
+            for user in self.users
+            for offset in (0, 1)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        per_user = Reaction.objects.values("user_id").annotate(total=Count("pk"))
+        self.assertTrue(all(row["total"] == 1 for row in per_user))
+        self.assertEqual(reaction_counters.drifted(
+            ContentType.objects.get_for_model(Post).pk, [self.post.pk]
+        ), {})
+        self.post.refresh_from_db(fields=["reaction_total"])
+        self.assertEqual(self.post.reaction_total, Reaction.objects.count())
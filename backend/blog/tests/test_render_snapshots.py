@@ -0,0 +1,141 @@
+"""Tests for the precomputed render snapshots of public posts."""
+from __future__ import annotations
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from parler.utils.context import switch_language
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog.models import Category, Comment, Post, PostRenderSnapshot, Reaction, Tag
+
+
+@override_settings(BLOG_RESPONSE_CACHE_TIMEOUT=0)
+class RenderSnapshotTests(APITestCase):
+    """Validate read-through snapshots, their freshness and the rebuild command."""
+
+    def setUp(self) -> None:
+        self.category = Category.objects.create(name="Backend", description="APIs")
+        self.post = self._create_post("Instantáneas de render")
+        self.post.tags.add(Tag.objects.create(name="Django"))
+        self.post.categories.add(self.category)
+        self.list_url = reverse("blog:posts-list")
+        self.detail_url = reverse("blog:posts-detail", kwargs={"slug": self.post.slug})
+
+    def _create_post(self, title: str, status_value: str = Post.Status.PUBLISHED) -> Post:
+        return Post.objects.create(
+            title=title,
+            excerpt="Resumen",
+            content="Contenido suficientemente largo.",
+            image="https://example.com/image.png",
+            thumb="https://example.com/thumb.png",
+            imageAlt="Texto alternativo",
+            author="Codex",
+            status=status_value,
+        )
+
+    def _get(self, url: str, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_detail_is_served_from_its_snapshot(self) -> None:
+        """The first anonymous read stores the payload; later ones reuse it."""
+
+        live = self._get(self.detail_url)
+        self.assertTrue(
+            PostRenderSnapshot.objects.filter(
+                post=self.post, kind=PostRenderSnapshot.Kind.DETAIL, language_code="es"
+            ).exists()
+        )
+
+        # Slug generation, the snapshot and the cache versions it depends on.
+        with self.assertNumQueries(3):
+            served = self._get(self.detail_url)
+
+        self.assertEqual(served.json(), live.json())
+        self.assertEqual(served["ETag"], live["ETag"])
+
+    def test_edits_and_category_counters_stale_snapshots(self) -> None:
+        """Translations and counters of embedded categories are never served stale."""
+
+        self._get(self.detail_url, lang="en")
+        with switch_language(self.post, "en"):
+            self.post.title = "Render snapshots"
+            self.post.save()
+        self.post.refresh_from_db()
+        with switch_language(self.post, "en"):
+            en_url = reverse("blog:posts-detail", kwargs={"slug": self.post.slug})
+        self.assertEqual(self._get(en_url, lang="en").data["title"], "Render snapshots")
+
+        self._get(self.detail_url)
+        other = self._create_post("Otra entrada publicada")
+        other.categories.add(self.category)
+        category = self._get(self.detail_url).data["categories_detail"][0]
+        self.assertEqual(category["published_post_count"], 2)
+
+        other.categories.remove(self.category)
+        category = self._get(self.detail_url).data["categories_detail"][0]
+        self.assertEqual(category["published_post_count"], 1)
+
+    def test_list_reuses_snapshots_of_its_page(self) -> None:
+        """Posts of a page with snapshots are not loaded nor serialized again."""
+
+        for index in range(3):
+            self._create_post(f"Entrada de listado {index}")
+        live = self._get(self.list_url)
+        self.assertEqual(
+            PostRenderSnapshot.objects.filter(kind=PostRenderSnapshot.Kind.LIST).count(), 4
+        )
+
+        with self.assertNumQueries(4):
+            served = self._get(self.list_url)
+        self.assertEqual(served.json(), live.json())
+
+        user = get_user_model().objects.create_superuser(
+            username="admin", email="admin@example.com", password="strong-pass-123"
+        )
+        self.client.force_authenticate(user)
+        self.assertEqual(self._get(self.list_url).json()["results"], live.json()["results"])
+
+    def test_engagement_keeps_the_detail_and_refreshes_list_totals(self) -> None:
+        """Comments and reactions move list totals without expiring the detail."""
+
+        detail = self._get(self.detail_url)
+        self._get(self.list_url)
+        built_at = PostRenderSnapshot.objects.get(
+            post=self.post, kind=PostRenderSnapshot.Kind.LIST
+        ).built_at
+
+        reader = get_user_model().objects.create_user(username="lector", password="x")
+        Comment.objects.create(post=self.post, author_name="Ana", content="Buen artículo")
+        Reaction.objects.create(user=reader, content_object=self.post, type=Reaction.Types.LIKE)
+
+        revalidated = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=detail["ETag"])
+        self.assertEqual(revalidated.status_code, status.HTTP_304_NOT_MODIFIED)
+        item = self._get(self.list_url).data["results"][0]
+        self.assertEqual((item["comment_count"], item["reaction_total"]), (1, 1))
+        self.assertEqual(
+            PostRenderSnapshot.objects.get(post=self.post, kind=PostRenderSnapshot.Kind.LIST).built_at,
+            built_at,
+        )
+
+    def test_command_builds_public_snapshots(self) -> None:
+        """``rebuild_render_snapshots`` covers every language and skips drafts."""
+
+        self._create_post("Borrador sin publicar", Post.Status.DRAFT)
+        output = StringIO()
+
+        call_command("rebuild_render_snapshots", "--with-expanded", stdout=output)
+
+        self.assertIn("Instantáneas generadas: 8 (1 entradas).", output.getvalue())
+        self.assertEqual(
+            set(PostRenderSnapshot.objects.values_list("post_id", flat=True)), {self.post.pk}
+        )
+        # Slug resolution (memoized afterwards), the snapshot and its cache versions.
+        with self.assertNumQueries(4):
+            self._get(self.detail_url, lang="en", expand="translations")
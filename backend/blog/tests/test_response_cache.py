@@ -0,0 +1,136 @@
+"""Tests for the anonymous response cache of the public endpoints."""
+from __future__ import annotations
+
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog import response_cache
+from blog.models import CacheVersion, Category, Post, Tag
+
+
+class AnonymousResponseCacheTests(APITestCase):
+    """Validate hits, bypasses and dependency based invalidation."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.list_url = reverse("blog:posts-list")
+        self.category = Category.objects.create(name="Backend", description="APIs")
+        self.tag = Tag.objects.create(name="Django")
+        self.post = Post.objects.create(
+            title="Caché de respuestas",
+            excerpt="Resumen",
+            content="Contenido suficientemente largo.",
+            image="https://example.com/image.png",
+            thumb="https://example.com/thumb.png",
+            imageAlt="Texto alternativo",
+            author="Codex",
+            status=Post.Status.PUBLISHED,
+        )
+        self.post.tags.add(self.tag)
+        self.post.categories.add(self.category)
+        self.detail_url = reverse("blog:posts-detail", kwargs={"slug": self.post.slug})
+
+    def _get(self, url: str, expected: str, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response[response_cache.HEADER], expected)
+        return response
+
+    def test_second_anonymous_read_is_served_from_cache(self) -> None:
+        """Equivalent query strings share an entry; languages do not."""
+
+        first = self._get(self.list_url, "MISS", page_size=5, ordering="-date")
+        # The only query reads the versions of the entry.
+        with self.assertNumQueries(1):
+            second = self._get(self.list_url, "HIT", ordering="-date", page_size=5)
+        self.assertEqual(first.data, second.data)
+
+        self._get(self.list_url, "MISS", page_size=5, ordering="-date", lang="en")
+        self._get(self.detail_url, "MISS")
+        self._get(self.detail_url, "HIT")
+
+    def test_authenticated_requests_bypass_the_cache(self) -> None:
+        """Role dependent payloads are never stored nor served from the cache."""
+
+        user = get_user_model().objects.create_superuser(
+            username="admin", email="admin@example.com", password="strong-pass-123"
+        )
+        self._get(self.list_url, "MISS")
+        self.client.force_authenticate(user)
+
+        response = self.client.get(self.list_url)
+
+        self.assertNotIn(response_cache.HEADER, response)
+
+    def test_writes_expire_only_dependent_entries(self) -> None:
+        """Editing a post expires its detail and lists, not unrelated details."""
+
+        other = Post.objects.create(
+            title="Otra entrada",
+            excerpt="Resumen",
+            content="Contenido suficientemente largo.",
+            image="https://example.com/image.png",
+            thumb="https://example.com/thumb.png",
+            imageAlt="Texto alternativo",
+            author="Codex",
+            status=Post.Status.PUBLISHED,
+        )
+        other_url = reverse("blog:posts-detail", kwargs={"slug": other.slug})
+        for url in (self.list_url, self.detail_url, other_url):
+            self._get(url, "MISS")
+
+        self.post.title = "Caché de respuestas revisada"
+        self.post.save()
+
+        self.assertEqual(self._get(self.detail_url, "MISS").data["title"], self.post.title)
+        self._get(self.list_url, "MISS")
+        self._get(other_url, "HIT")
+
+    def test_versions_are_shared_by_every_process(self) -> None:
+        """A version bumped by another process expires the entries of this one."""
+
+        self._get(self.detail_url, "MISS")
+        self._get(self.detail_url, "HIT")
+
+        name = response_cache.dependency(Post, self.post.pk)
+        CacheVersion.objects.filter(name=name).update(version="other-process")
+
+        self._get(self.detail_url, "MISS")
+        self._get(self.detail_url, "HIT")
+
+    def test_taxonomy_changes_reach_cached_posts(self) -> None:
+        """Renaming a tag or moving counters expires posts embedding them."""
+
+        self._get(self.detail_url, "MISS")
+        categories_url = reverse("blog:categories-list")
+        self._get(categories_url, "MISS")
+
+        self.tag.name = "Django REST"
+        self.tag.save()
+        self.assertEqual(self._get(self.detail_url, "MISS").data["tags"], ["Django REST"])
+
+        self.post.status = Post.Status.DRAFT
+        self.post.save()
+        payload = self._get(categories_url, "MISS").data["results"][0]
+        self.assertEqual(payload["published_post_count"], 0)
+
+    def test_stats_command_reports_hits_and_misses(self) -> None:
+        """``response_cache_stats`` exposes the counters per resource."""
+
+        self._get(self.list_url, "MISS")
+        self._get(self.list_url, "HIT")
+        self._get(self.list_url, "HIT")
+
+        output = StringIO()
+        call_command("response_cache_stats", "--reset", stdout=output)
+
+        self.assertIn("posts: 2 aciertos, 1 fallos", output.getvalue())
+        self.assertEqual(
+            response_cache.stats(["posts"]), {"posts": {"hit": 0, "miss": 0}}
+        )
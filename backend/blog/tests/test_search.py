@@ -0,0 +1,153 @@
+"""Tests for the per-language full-text search of posts."""
+from __future__ import annotations
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from parler.utils.context import switch_language
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog import search
+from blog.models import BackgroundJob, CacheVersion, Category, Post, Tag
+
+
+class PostFullTextSearchTests(APITestCase):
+    """Validate ranking, stemming and incremental indexing of the search index."""
+
+    def setUp(self) -> None:
+        self.list_url = reverse("blog:posts-list")
+        if search.get_backend() is None:
+            self.skipTest(f"Full-text search not available on {connection.vendor}.")
+
+    def _create_post(self, title: str, content: str, en: dict | None = None) -> Post:
+        post = Post.objects.create(
+            title=title,
+            excerpt=f"Resumen de {title}",
+            content=content,
+            image="https://example.com/image.png",
+            thumb="https://example.com/thumb.png",
+            imageAlt="Texto alternativo",
+            author="Codex",
+            status=Post.Status.PUBLISHED,
+        )
+        if en:
+            with switch_language(post, "en"):
+                for field, value in en.items():
+                    setattr(post, field, value)
+                post.slug = ""
+                post.save()
+        return post
+
+    def _search(self, term: str, **params) -> list[int]:
+        response = self.client.get(self.list_url, {"search": term, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item["id"] for item in response.data["results"]]
+
+    def test_title_matches_rank_before_content_matches(self) -> None:
+        """Posts naming the term in the title come first regardless of date."""
+
+        in_content = self._create_post("Notas de la semana", "Probamos Kubernetes en local.")
+        in_title = self._create_post("Kubernetes paso a paso", "Una guía de despliegue.")
+        self._create_post("Sin relación", "Nada que ver.")
+        Post.objects.filter(pk=in_title.pk).update(date="2020-01-01")
+
+        self.assertEqual(self._search("kubernetes"), [in_title.id, in_content.id])
+
+    def test_spanish_stemming_and_accents(self) -> None:
+        """Plural and accent variants resolve to the same Spanish stem."""
+
+        post = self._create_post("Programación funcional", "Conceptos básicos.")
+
+        self.assertEqual(self._search("programaciones"), [post.id])
+        self.assertEqual(self._search("basico"), [post.id])
+
+    def test_search_uses_the_active_language_document(self) -> None:
+        """English queries are stemmed in English and only hit English documents."""
+
+        post = self._create_post(
+            "Pruebas automáticas",
+            "Contenido en español.",
+            en={"title": "Running tests", "excerpt": "Summary", "content": "How we run it."},
+        )
+
+        self.assertEqual(self._search("runs", lang="en"), [post.id])
+        self.assertEqual(self._search("pruebas", lang="en"), [])
+        self.assertEqual(self._search("pruebas"), [post.id])
+
+    def test_index_follows_edits_and_tags(self) -> None:
+        """Saving a translation or tagging a post refreshes its document."""
+
+        post = self._create_post("Borrador inicial", "Texto.")
+        self.assertEqual(self._search("observabilidad"), [])
+
+        post.title = "Observabilidad en producción"
+        post.save()
+        self.assertEqual(self._search("observabilidad"), [post.id])
+
+        tag = Tag.objects.create(name="Grafana")
+        post.tags.add(tag)
+        self.assertEqual(self._search("grafana"), [post.id])
+
+        tag.posts.clear()
+        self.assertEqual(self._search("grafana"), [])
+
+    def test_only_renames_reindex_the_posts_of_a_taxonomy(self) -> None:
+        """Renaming a category queues the reindex of its posts; other edits do not."""
+
+        post = self._create_post("Métricas de servicio", "Texto.")
+        category = Category.objects.create(name="Monitorización")
+        post.categories.add(category)
+        jobs_before = BackgroundJob.objects.filter(task="blog.index_taxonomy_posts").count()
+
+        category.description = "Paneles y alertas"
+        category.save()
+        self.assertEqual(
+            BackgroundJob.objects.filter(task="blog.index_taxonomy_posts").count(), jobs_before
+        )
+
+        category.name = "Telemetría"
+        category.save()
+        job = BackgroundJob.objects.filter(task="blog.index_taxonomy_posts").latest("pk")
+        self.assertEqual(job.queue, "maintenance")
+        self.assertEqual(job.result, {"indexed": 1})
+        self.assertEqual(self._search("telemetria"), [post.id])
+
+    def test_rebuild_command_restores_documents(self) -> None:
+        """``rebuild_search_index`` repopulates an emptied index."""
+
+        post = self._create_post("Índices invertidos", "Texto.")
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM blog_post_search")
+        self.assertEqual(self._search("indices"), [])
+
+        output = StringIO()
+        call_command("rebuild_search_index", stdout=output)
+
+        self.assertIn("Documentos indexados: 1", output.getvalue())
+        self.assertEqual(self._search("indices"), [post.id])
+
+    def test_unbuilt_index_falls_back_until_rebuilt(self) -> None:
+        """Posts that predate the index stay searchable until it is rebuilt."""
+
+        post = self._create_post("Registro de cambios", "Texto.")
+        # A database migrated with this post in it: no documents and no marker.
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM blog_post_search")
+        CacheVersion.objects.filter(name=search.READY_MARKER).delete()
+        search._READY.clear()
+        self.addCleanup(search._READY.clear)
+
+        self.assertEqual(self._search("registro"), [post.id])
+        self.assertEqual(self._search("registros"), [])
+
+        output = StringIO()
+        call_command("rebuild_search_index", "--if-needed", stdout=output)
+        self.assertIn("Documentos indexados: 1", output.getvalue())
+        self.assertEqual(self._search("registros"), [post.id])
+
+        output = StringIO()
+        call_command("rebuild_search_index", "--if-needed", stdout=output)
+        self.assertIn("ya está construido", output.getvalue())
@@ -0,0 +1,179 @@
+"""Tests for the coalescing of identical concurrent translations."""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+from blog import openai_limiter, translation_memory
+from blog.models import TranslationLock
+from blog.utils import openai
+
+LATENCY = 0.3
+
+
+class StubOpenAI:
+    """Local HTTP server answering like the OpenAI responses API.
+
+    Replies with the upper-cased text after ``LATENCY`` seconds and counts
+    the texts it received.
+    """
+
+    def __init__(self) -> None:
+        self.requests: Counter[str] = Counter()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:  # noqa: N802 - http.server API
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                text = payload["input"].split("Texto:\n", 1)[1]
+                stub.requests[text] += 1
+                time.sleep(LATENCY)
+                body = json.dumps({"output_text": text.upper()}).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/v1/responses"
+
+    def __enter__(self) -> "StubOpenAI":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def burst(texts: list[str]) -> list:
+    """Translate every text from its own thread, all released at once."""
+
+    barrier = threading.Barrier(len(texts))
+    results: list = [None] * len(texts)
+
+    def run(index: int) -> None:
+        barrier.wait()
+        try:
+            results[index] = translation_memory.translate(
+                text=texts[index], target_language="en", fmt="plain"
+            )
+        except Exception as exc:  # noqa: BLE001 - reported by the test
+            results[index] = exc
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(len(texts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@override_settings(
+    OPENAI_API_KEY="test-key",
+    OPENAI_DEFAULT_MODEL="test-model",
+    OPENAI_SYSTEM_PROMPT="prompt",
+    OPENAI_MAX_RETRIES=0,
+    BLOG_TRANSLATION_MEMORY_TTL=3600,
+    BLOG_TRANSLATION_LOCK_SECONDS=10,
+    OPENAI_LIMITER_BACKEND="local",
+)
+class SingleFlightTests(TransactionTestCase):
+    """Concurrent identical translations reach OpenAI once."""
+
+    def setUp(self) -> None:
+        translation_memory.clear()
+        self.addCleanup(translation_memory.clear)
+        openai_limiter.reset()
+        self.stub = StubOpenAI().__enter__()
+        self.addCleanup(self.stub.__exit__)
+        self.settings_override = override_settings(OPENAI_API_URL=self.stub.url)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        openai.reset_session()
+        self.addCleanup(openai.reset_session)
+
+    def _key(self, text: str) -> str:
+        return translation_memory.make_key(
+            text=text, target_language="en", source_language=None, fmt="plain"
+        )
+
+    # Without the database tier the threads of the burst never write to the
+    # shared in-memory SQLite database, whose table locks do not wait.
+    @override_settings(BLOG_TRANSLATION_MEMORY_TTL=0)
+    def test_burst_of_identical_requests_makes_one_call(self) -> None:
+        """Threads asking for the same texts share one upstream call per text."""
+
+        started = time.monotonic()
+        results = burst(["hola"] * 8 + ["adios"] * 4)
+        elapsed = time.monotonic() - started
+
+        self.assertEqual(self.stub.requests, Counter({"hola": 1, "adios": 1}))
+        self.assertEqual({result.text for result in results[:8]}, {"HOLA"})
+        self.assertEqual({result.text for result in results[8:]}, {"ADIOS"})
+        sources = Counter(result.source for result in results)
+        self.assertEqual(sources[translation_memory.MISS], 2)
+        self.assertEqual(sources[translation_memory.SHARED], 10)
+        self.assertLess(elapsed, LATENCY * 3)
+        self.assertFalse(TranslationLock.objects.exists())
+
+    def test_waits_for_another_process(self) -> None:
+        """A key locked by another process is read from the memory once stored."""
+
+        key = self._key("hola")
+        TranslationLock.objects.create(
+            key=key, owner="other:1", expires_at=timezone.now() + timedelta(seconds=10)
+        )
+
+        def other_process(_seconds) -> None:
+            translation_memory.store(key, "HELLO", "en")
+            translation_memory.clear()
+            TranslationLock.objects.filter(key=key).delete()
+
+        # The other process finishes while this one polls.
+        with patch("blog.translation_memory.time.sleep", side_effect=other_process) as poll:
+            result = translation_memory.translate(text="hola", target_language="en", fmt="plain")
+
+        self.assertEqual(poll.call_count, 1)
+        self.assertEqual(result, translation_memory.Translation("HELLO", translation_memory.SHARED))
+        self.assertEqual(self.stub.requests, Counter())
+
+    def test_failed_or_expired_holder_is_not_waited_for(self) -> None:
+        """Waiters call OpenAI when the holder leaves without a result or its lock expired."""
+
+        key = self._key("hola")
+        TranslationLock.objects.create(
+            key=key, owner="other:1", expires_at=timezone.now() + timedelta(seconds=10)
+        )
+
+        def failing_process(_seconds) -> None:
+            TranslationLock.objects.filter(key=key).delete()
+
+        with patch("blog.translation_memory.time.sleep", side_effect=failing_process):
+            result = translation_memory.translate(text="hola", target_language="en", fmt="plain")
+        self.assertEqual(result, translation_memory.Translation("HOLA", translation_memory.MISS))
+
+        TranslationLock.objects.create(
+            key=self._key("adios"), owner="dead:1", expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        started = time.monotonic()
+        translation_memory.translate(text="adios", target_language="en", fmt="plain")
+
+        self.assertLess(time.monotonic() - started, LATENCY * 2)
+        self.assertEqual(self.stub.requests, Counter({"hola": 1, "adios": 1}))
+        self.assertFalse(TranslationLock.objects.exists())
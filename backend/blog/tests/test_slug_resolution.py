@@ -0,0 +1,95 @@
+"""Tests for the multilingual slug resolution of posts."""
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.urls import reverse
+from parler.utils.context import switch_language
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog import slug_index
+from blog.models import CacheVersion, Comment, Post
+
+
+class SlugResolutionTests(APITestCase):
+    """Validate cross-language lookups, canonical links and memoization."""
+
+    def setUp(self) -> None:
+        cache.clear()
+        slug_index.clear()
+        self.post = Post.objects.create(
+            title="Resolución de slugs",
+            excerpt="Resumen",
+            content="Contenido suficientemente largo.",
+            image="https://example.com/image.png",
+            thumb="https://example.com/thumb.png",
+            imageAlt="Texto alternativo",
+            author="Codex",
+            status=Post.Status.PUBLISHED,
+        )
+        with switch_language(self.post, "en"):
+            self.post.title = "Slug resolution"
+            self.post.excerpt = "Summary"
+            self.post.content = "Long enough content."
+            self.post.slug = ""
+            self.post.save()
+
+    def test_any_language_slug_resolves_with_canonical_link(self) -> None:
+        """A Spanish slug read in English answers and links the English slug."""
+
+        url = reverse("blog:posts-detail", kwargs={"slug": "resolucion-de-slugs"})
+
+        response = self.client.get(url, {"lang": "en"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["slug"], "slug-resolution")
+        self.assertIn("/posts/slug-resolution/>; rel=\"canonical\"", response["Link"])
+        self.assertNotIn("Link", self.client.get(url))
+
+        unknown = reverse("blog:posts-detail", kwargs={"slug": "no-existe"})
+        self.assertEqual(self.client.get(unknown).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_resolutions_are_memoized_until_a_slug_changes(self) -> None:
+        """Repeated lookups skip the database; translation edits expire them."""
+
+        matches = slug_index.resolve("Slug-Resolution", "es")
+        self.assertEqual(
+            matches, [slug_index.SlugMatch(self.post.pk, "en", "resolucion-de-slugs")]
+        )
+        # Only the shared generation is read.
+        with self.assertNumQueries(1):
+            self.assertEqual(slug_index.resolve("slug-resolution", "es"), matches)
+
+        with switch_language(self.post, "en"):
+            self.post.title = "Renamed resolution"
+            self.post.slug = ""
+            self.post.save()
+
+        self.assertEqual(slug_index.resolve("slug-resolution", "es"), [])
+        self.assertEqual(slug_index.resolve("renamed-resolution", "en")[0].post_id, self.post.pk)
+
+    def test_writes_of_other_processes_are_seen(self) -> None:
+        """Unknown slugs are not memoized and a generation bumped elsewhere expires hits."""
+
+        self.assertEqual(slug_index.resolve("entrada-futura", "es"), [])
+        self.assertNotIn("entrada-futura", slug_index._entries)
+        self.assertEqual(len(slug_index.resolve("resolucion-de-slugs", "es")), 1)
+
+        # Rename as another process would: its signals bump the shared generation.
+        translations = Post._parler_meta.root_model.objects
+        translations.filter(master=self.post, language_code="es").update(slug="entrada-futura")
+        CacheVersion.objects.filter(name=slug_index.GENERATION).update(version="other-process")
+
+        self.assertEqual(slug_index.resolve("entrada-futura", "es")[0].post_id, self.post.pk)
+        self.assertEqual(slug_index.resolve("resolucion-de-slugs", "es"), [])
+
+    def test_comments_accept_the_slug_of_any_language(self) -> None:
+        """Nested comment routes resolve their post through the same index."""
+
+        Comment.objects.create(post=self.post, author_name="Ana", content="Buen artículo")
+        url = reverse("blog:post-comments-list", kwargs={"slug_pk": "slug-resolution"})
+
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
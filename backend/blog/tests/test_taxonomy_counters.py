@@ -0,0 +1,129 @@
+"""Tests for the denormalized post counters of categories and tags."""
+from __future__ import annotations
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from blog.models import Category, Post, Tag
+
+
+class TaxonomyCounterTests(TestCase):
+    """Counters must follow relation changes, status transitions and deletes."""
+
+    def setUp(self) -> None:
+        self.tag = Tag.objects.create(name="Django")
+        self.category = Category.objects.create(name="Backend")
+
+    def _create_post(self, title: str, status: str = Post.Status.PUBLISHED) -> Post:
+        return Post.objects.create(
+            title=title,
+            excerpt=f"Resumen de {title}",
+            content=f"Contenido de {title}",
+            image="https://example.com/image.png",
+            thumb="https://example.com/thumb.png",
+            imageAlt="Texto alternativo",
+            author="Codex",
+            status=status,
+        )
+
+    def assertCounters(self, obj, total: int, published: int) -> None:
+        obj.refresh_from_db(fields=["post_count", "published_post_count"])
+        self.assertEqual((obj.post_count, obj.published_post_count), (total, published))
+
+    def test_forward_relation_changes_update_counters(self) -> None:
+        """Adding, removing and clearing from the post side adjusts both counters."""
+
+        published = self._create_post("Publicada")
+        draft = self._create_post("Borrador", status=Post.Status.DRAFT)
+
+        other = Tag.objects.create(name="Python")
+        published.tags.add(self.tag, other)
+        published.tags.add(self.tag)
+        draft.tags.add(self.tag)
+        published.categories.set([self.category])
+        self.assertCounters(self.tag, 2, 1)
+        self.assertCounters(other, 1, 1)
+        self.assertCounters(self.category, 1, 1)
+
+        draft.tags.remove(self.tag)
+        draft.tags.remove(self.tag)
+        self.assertCounters(self.tag, 1, 1)
+
+        published.tags.clear()
+        published.categories.set([])
+        self.assertCounters(self.tag, 0, 0)
+        self.assertCounters(other, 0, 0)
+        self.assertCounters(self.category, 0, 0)
+
+    def test_reverse_relation_changes_update_counters(self) -> None:
+        """Changes made from the tag side count only real links."""
+
+        published = self._create_post("Publicada")
+        draft = self._create_post("Borrador", status=Post.Status.DRAFT)
+
+        self.tag.posts.add(published, draft)
+        self.assertCounters(self.tag, 2, 1)
+
+        self.tag.posts.remove(published, self._create_post("Sin enlace"))
+        self.assertCounters(self.tag, 1, 0)
+
+        self.tag.posts.clear()
+        self.assertCounters(self.tag, 0, 0)
+
+    def test_status_transitions_move_published_counter(self) -> None:
+        """Publishing and unpublishing only touches ``published_post_count``."""
+
+        post = self._create_post("Borrador", status=Post.Status.DRAFT)
+        post.tags.add(self.tag)
+        post.categories.add(self.category)
+        self.assertCounters(self.tag, 1, 0)
+
+        post.status = Post.Status.PUBLISHED
+        post.save()
+        self.assertCounters(self.tag, 1, 1)
+        self.assertCounters(self.category, 1, 1)
+
+        reloaded = Post.objects.get(pk=post.pk)
+        reloaded.status = Post.Status.ARCHIVED
+        reloaded.save()
+        self.assertCounters(self.tag, 1, 0)
+        self.assertCounters(self.category, 1, 0)
+
+    def test_deleting_post_releases_counters(self) -> None:
+        """Deleting posts, one by one or in bulk, decrements their taxonomies."""
+
+        first = self._create_post("Primera")
+        second = self._create_post("Segunda")
+        for post in (first, second):
+            post.tags.add(self.tag)
+            post.categories.add(self.category)
+
+        first.delete()
+        self.assertCounters(self.tag, 1, 1)
+
+        Post.objects.filter(pk=second.pk).delete()
+        self.assertCounters(self.tag, 0, 0)
+        self.assertCounters(self.category, 0, 0)
+
+    def test_recount_command_repairs_drift(self) -> None:
+        """``recount_taxonomy`` restores counters changed behind the signals."""
+
+        post = self._create_post("Publicada")
+        post.tags.add(self.tag)
+        post.categories.add(self.category)
+        Tag.objects.filter(pk=self.tag.pk).update(post_count=9, published_post_count=0)
+        Post.objects.filter(pk=post.pk).update(status=Post.Status.DRAFT)
+
+        output = StringIO()
+        call_command("recount_taxonomy", "--dry-run", stdout=output)
+        self.assertIn("Etiquetas: 1 con desviación", output.getvalue())
+        self.assertCounters(self.tag, 9, 0)
+
+        output = StringIO()
+        call_command("recount_taxonomy", stdout=output)
+        self.assertIn("Categorías: 1 corregidas", output.getvalue())
+        self.assertIn("Etiquetas: 1 corregidas", output.getvalue())
+        self.assertCounters(self.tag, 1, 0)
+        self.assertCounters(self.category, 1, 0)
@@ -0,0 +1,200 @@
+"""Tests for the memory of OpenAI translations."""
+from __future__ import annotations
+
+import threading
+import time
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from blog import translation_memory
+from blog.models import TranslationMemoryEntry
+from blog.utils import chunking
+
+
+def _openai_response(text: str) -> Mock:
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {"output_text": text}
+    return response
+
+
+@override_settings(
+    OPENAI_API_KEY="test-key",
+    OPENAI_DEFAULT_MODEL="test-model",
+    OPENAI_SYSTEM_PROMPT="prompt",
+    BLOG_TRANSLATION_MEMORY_TTL=3600,
+)
+class TranslationMemoryTests(APITestCase):
+    """Repeated translations are answered without calling OpenAI."""
+
+    def setUp(self) -> None:
+        translation_memory.clear()
+        self.addCleanup(translation_memory.clear)
+        self.url = reverse("blog:ai-translations-list")
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(username="traductor", password="x")
+        )
+        self.payload = {"text": "Hola mundo", "target_lang": "en", "format": "plain"}
+
+    def _translate(self, payload=None):
+        return self.client.post(self.url, payload or self.payload, format="json")
+
+    def test_repeated_requests_hit_memory_then_database(self) -> None:
+        """The LRU answers first, the table after a restart, and OpenAI only once."""
+
+        with patch(
+            "blog.utils.openai.requests.Session.post", return_value=_openai_response("Hello world")
+        ) as mock_post:
+            first = self._translate()
+            second = self._translate()
+            translation_memory.clear()
+            third = self._translate()
+
+        self.assertEqual(mock_post.call_count, 1)
+        self.assertEqual(
+            [response[translation_memory.HEADER] for response in (first, second, third)],
+            [translation_memory.MISS, translation_memory.MEMORY, translation_memory.DATABASE],
+        )
+        self.assertEqual({first.data["translation"], third.data["translation"]}, {"Hello world"})
+
+    def test_key_covers_model_format_and_expiry(self) -> None:
+        """Other settings or formats miss, and expired entries are not reused."""
+
+        with patch(
+            "blog.utils.openai.requests.Session.post", return_value=_openai_response("Hello world")
+        ) as mock_post:
+            self._translate()
+            self._translate({**self.payload, "format": "markdown"})
+            with override_settings(OPENAI_DEFAULT_MODEL="other-model"):
+                self._translate()
+            self.assertEqual(mock_post.call_count, 3)
+
+            translation_memory.clear()
+            TranslationMemoryEntry.objects.update(created_at=timezone.now() - timedelta(hours=2))
+            response = self._translate()
+
+        self.assertEqual(response[translation_memory.HEADER], translation_memory.MISS)
+        self.assertEqual(mock_post.call_count, 4)
+
+    def test_errors_are_not_stored(self) -> None:
+        """Failed translations reach the client and leave no entry behind."""
+
+        failure = Mock(status_code=400)
+        failure.json.return_value = {"error": {"message": "Solicitud inválida"}}
+        with patch("blog.utils.openai.requests.Session.post", return_value=failure):
+            response = self._translate()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(TranslationMemoryEntry.objects.exists())
+
+    @override_settings(BLOG_TRANSLATION_MEMORY_MAX_ENTRIES=2)
+    def test_prune_evicts_expired_and_least_recently_used(self) -> None:
+        """Pruning keeps the most recently used entries within the limit."""
+
+        now = timezone.now()
+        for index, age in enumerate((5, 1, 3, 120)):
+            TranslationMemoryEntry.objects.create(
+                key=f"{index:064d}",
+                translation=f"texto {index}",
+                target_language="en",
+                created_at=now - timedelta(minutes=age),
+                last_used_at=now - timedelta(minutes=age),
+            )
+
+        self.assertEqual(translation_memory.prune(), 2)
+        self.assertEqual(
+            sorted(TranslationMemoryEntry.objects.values_list("translation", flat=True)),
+            ["texto 1", "texto 2"],
+        )
+
+
+class ChunkingTests(SimpleTestCase):
+    """Long documents are cut at block boundaries only."""
+
+    def test_markdown_keeps_code_fences_whole(self) -> None:
+        """Paragraphs are packed up to the limit and fences are never split."""
+
+        fence = "```python\n" + "\n\n".join(f"x = {index}" for index in range(20)) + "\n```\n"
+        text = "Uno dos tres.\n\n" * 4 + fence + "\nFinal.\n"
+        chunks = chunking.split(text, limit=40, fmt="markdown")
+
+        self.assertEqual("".join(chunks), text)
+        self.assertIn(fence, chunks)
+        self.assertTrue(all(len(chunk) <= 40 for chunk in chunks if chunk != fence))
+
+    def test_html_cuts_between_top_level_elements(self) -> None:
+        """Cuts fall between elements, never inside tags or ``<pre>``."""
+
+        pre = "<pre>" + "linea\n\n" * 10 + "</pre>"
+        text = '<p class="a">Hola <b>mundo</b></p>' * 3 + pre + "<p>fin</p>"
+        chunks = chunking.split(text, limit=40, fmt="html")
+
+        self.assertEqual("".join(chunks), text)
+        self.assertEqual(chunks[:3], ['<p class="a">Hola <b>mundo</b></p>'] * 3)
+        self.assertEqual(chunks[3:], [pre, "<p>fin</p>"])
+
+
+@override_settings(
+    OPENAI_API_KEY="test-key",
+    OPENAI_DEFAULT_MODEL="test-model",
+    OPENAI_SYSTEM_PROMPT="prompt",
+    OPENAI_MAX_TEXT_LENGTH=100,
+    OPENAI_MAX_RETRIES=0,
+    BLOG_TRANSLATION_MEMORY_TTL=3600,
+)
+class ChunkedTranslationTests(APITestCase):
+    """Long texts are translated by chunks, concurrently and in order."""
+
+    LATENCY = 0.2
+
+    def setUp(self) -> None:
+        translation_memory.clear()
+        self.addCleanup(translation_memory.clear)
+        self.paragraphs = [f"Parrafo numero {index}" + " texto" * 12 for index in range(12)]
+        self.text = "\n\n".join(self.paragraphs)
+        self.failures = {"Parrafo numero 5 t"}
+        self.lock = threading.Lock()
+
+    def _fake_post(self, url, json, headers, timeout):
+        chunk = json["input"].split("Texto:\n", 1)[1]
+        time.sleep(self.LATENCY)
+        with self.lock:
+            failing = [marker for marker in self.failures if marker in chunk]
+            self.failures.difference_update(failing)
+        if failing:
+            return Mock(status_code=502, headers={}, json=Mock(return_value={}))
+        return _openai_response(chunk.upper())
+
+    def test_chunks_run_concurrently_and_failed_ones_are_retried(self) -> None:
+        """Twelve chunks take about two latencies: one round plus a retry."""
+
+        with patch("blog.utils.openai.requests.Session.post", side_effect=self._fake_post) as mock_post:
+            started = time.monotonic()
+            result = translation_memory.translate(text=self.text, target_language="en", fmt="markdown")
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(result.text, self.text.upper())
+        self.assertEqual(result.source, translation_memory.MISS)
+        self.assertEqual(mock_post.call_count, 13)
+        self.assertLess(elapsed, self.LATENCY * 4)
+
+    def test_translated_chunks_survive_a_failure(self) -> None:
+        """A request that fails keeps the good chunks; the retry resends the rest."""
+
+        self.failures = {"Parrafo numero 3 t", "Parrafo numero 7 t"}
+        with patch.object(translation_memory, "CHUNK_ATTEMPTS", 1), patch("blog.utils.openai.requests.Session.post", side_effect=self._fake_post):
+            with self.assertRaises(translation_memory.openai.OpenAIRequestError):
+                translation_memory.translate(text=self.text, target_language="en")
+
+        with patch("blog.utils.openai.requests.Session.post", side_effect=self._fake_post) as mock_post:
+            result = translation_memory.translate(text=self.text, target_language="en")
+
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(result.text, self.text.upper())
@@ -0,0 +1,508 @@
+"""Content-addressed memory of OpenAI translations.
+
+A translation is keyed by the SHA-256 of everything that shapes the answer:
+text, source and target language, format, model and system prompt. Lookups
+go through two tiers:
+
+* an in-process LRU (``BLOG_TRANSLATION_MEMORY_LRU_SIZE`` entries), answering
+  repeated requests without touching the database;
+* :class:`~blog.models.TranslationMemoryEntry`, shared by every worker and
+  surviving restarts.
+
+Entries older than ``BLOG_TRANSLATION_MEMORY_TTL`` seconds are ignored and
+purged; beyond ``BLOG_TRANSLATION_MEMORY_MAX_ENTRIES`` rows the least
+recently used ones are evicted. Only successful translations are stored, so
+configuration and API errors still reach the caller.
+
+Texts longer than ``OPENAI_MAX_TEXT_LENGTH`` are split at block boundaries
+(:mod:`blog.utils.chunking`) and each chunk goes through the memory on its
+own. Missing chunks are sent to OpenAI concurrently on a pool of up to
+``OPENAI_TRANSLATION_WORKERS`` threads, so a long post takes about as long
+as its slowest chunk; a chunk that fails is retried alone and the chunks
+already translated are stored, so retrying the request only resends the
+failed ones. Database access stays on the calling thread.
+
+Identical chunks requested at the same time are sent to OpenAI once
+(single flight). Within a process, later callers wait on the future of the
+thread already translating the key. Across processes, the caller that
+inserts the :class:`~blog.models.TranslationLock` row of the key translates
+it while the others poll the memory until the entry appears; the lock of a
+dead process expires after ``BLOG_TRANSLATION_LOCK_SECONDS``, and when the
+holder fails its waiters call OpenAI themselves.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+from typing import NamedTuple, Optional, Union
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from . import openai_limiter
+from .models import TranslationLock, TranslationMemoryEntry
+from .utils import chunking, openai
+
+HEADER = "X-Translation-Memory"
+MEMORY = "HIT-MEMORY"
+DATABASE = "HIT-DB"
+MISS = "MISS"
+#: Translated by a concurrent identical request this one waited for.
+SHARED = "HIT-INFLIGHT"
+
+#: Stores between two eviction passes of the database tier, per process.
+PRUNE_EVERY = 100
+#: Attempts per chunk of a long text, on top of the HTTP level retries.
+CHUNK_ATTEMPTS = 2
+#: Seconds between two checks of a translation locked by another process.
+LOCK_POLL_INTERVAL = 0.1
+#: Holder of the translation locks taken by this process.
+OWNER = f"{socket.gethostname()}:{os.getpid()}"
+
+_entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+_inflight: dict[str, Future] = {}
+_lock = threading.Lock()
+_stores_since_prune = 0
+
+
+class Translation(NamedTuple):
+    text: str
+    #: Tier that answered: :data:`MEMORY`, :data:`DATABASE`, :data:`SHARED` or :data:`MISS`.
+    source: str
+
+
+def ttl() -> int:
+    """Lifetime of an entry in seconds; ``0`` disables the memory."""
+
+    return max(0, int(getattr(settings, "BLOG_TRANSLATION_MEMORY_TTL", 30 * 24 * 3600)))
+
+
+def lru_size() -> int:
+    return max(0, int(getattr(settings, "BLOG_TRANSLATION_MEMORY_LRU_SIZE", 256)))
+
+
+def max_entries() -> int:
+    return max(1, int(getattr(settings, "BLOG_TRANSLATION_MEMORY_MAX_ENTRIES", 10000)))
+
+
+def chunk_length() -> int:
+    """Longest text sent to OpenAI in a single call (``OPENAI_MAX_TEXT_LENGTH``)."""
+
+    return max(1, int(getattr(settings, "OPENAI_MAX_TEXT_LENGTH", 2000)))
+
+
+def workers() -> int:
+    return max(1, int(getattr(settings, "OPENAI_TRANSLATION_WORKERS", 12)))
+
+
+def lock_seconds() -> int:
+    """Longest wait for a translation locked by another process."""
+
+    return max(1, int(getattr(settings, "BLOG_TRANSLATION_LOCK_SECONDS", 120)))
+
+
+def _normalize(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+
+def make_key(*, text: str, target_language: str, source_language: Optional[str], fmt: str) -> str:
+    """Return the hash addressing the translation of ``text`` with the current settings."""
+
+    parts = [
+        text,
+        _normalize(source_language),
+        _normalize(target_language),
+        _normalize(fmt),
+        openai.active_model(),
+        openai.system_prompt(),
+    ]
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _remember(key: str, text: str) -> None:
+    size = lru_size()
+    if not size:
+        return
+    with _lock:
+        _entries[key] = (time.monotonic() + ttl(), text)
+        _entries.move_to_end(key)
+        while len(_entries) > size:
+            _entries.popitem(last=False)
+
+
+def _recall(key: str) -> Optional[str]:
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _entries[key]
+            return None
+        _entries.move_to_end(key)
+        return entry[1]
+
+
+def lookup(key: str) -> Optional[Translation]:
+    """Return the stored translation for ``key`` from the nearest tier."""
+
+    if not ttl():
+        return None
+    text = _recall(key)
+    if text is not None:
+        return Translation(text, MEMORY)
+    now = timezone.now()
+    row = (
+        TranslationMemoryEntry.objects.filter(key=key, created_at__gt=now - timedelta(seconds=ttl()))
+        .values_list("pk", "translation")
+        .first()
+    )
+    if row is None:
+        return None
+    TranslationMemoryEntry.objects.filter(pk=row[0]).update(last_used_at=now)
+    _remember(key, row[1])
+    return Translation(row[1], DATABASE)
+
+
+def store(key: str, text: str, target_language: str) -> None:
+    """Save a fresh translation in both tiers."""
+
+    global _stores_since_prune
+    if not ttl():
+        return
+    now = timezone.now()
+    defaults = {
+        "translation": text,
+        "target_language": _normalize(target_language),
+        "created_at": now,
+        "last_used_at": now,
+    }
+    try:
+        with transaction.atomic():
+            TranslationMemoryEntry.objects.update_or_create(key=key, defaults=defaults)
+    except IntegrityError:
+        # A concurrent request stored the same key first; its text is as good.
+        pass
+    _remember(key, text)
+    with _lock:
+        _stores_since_prune += 1
+        due = _stores_since_prune >= PRUNE_EVERY
+        if due:
+            _stores_since_prune = 0
+    if due:
+        prune()
+
+
+def prune() -> int:
+    """Delete expired entries and locks, and the least recently used entries over the limit."""
+
+    TranslationLock.objects.filter(expires_at__lte=timezone.now()).delete()
+    deleted, _ = TranslationMemoryEntry.objects.filter(
+        created_at__lte=timezone.now() - timedelta(seconds=ttl())
+    ).delete()
+    overflow = list(
+        TranslationMemoryEntry.objects.order_by("-last_used_at", "-pk").values_list("pk", flat=True)[
+            max_entries() :
+        ]
+    )
+    if overflow:
+        deleted += TranslationMemoryEntry.objects.filter(pk__in=overflow).delete()[0]
+    return deleted
+
+
+def clear() -> None:
+    """Forget the in-process tier (the database tier is left untouched)."""
+
+    with _lock:
+        _entries.clear()
+
+
+def _retryable(error: openai.OpenAIRequestError) -> bool:
+    return error.status_code is None or error.status_code in openai.RETRY_STATUSES
+
+
+def _call_seconds() -> float:
+    """Longest time one chunk may keep an OpenAI slot, its attempts included."""
+
+    return float(getattr(settings, "OPENAI_REQUEST_TIMEOUT", 15.0) or 15.0) * CHUNK_ATTEMPTS
+
+
+def _translate_chunks(jobs: list[dict]) -> list[Union[str, openai.OpenAIRequestError]]:
+    """Run ``translate_text(**job)`` for every job concurrently, in order.
+
+    The batch is admitted by :mod:`blog.openai_limiter` first and runs on
+    no more threads than the slots it was granted.
+    """
+
+    results: list[Union[str, openai.OpenAIRequestError]] = [None] * len(jobs)  # type: ignore[list-item]
+    pending = list(range(len(jobs)))
+    openai.ensure_configured()
+    tokens = sum(openai.estimate_tokens(job["text"]) for job in jobs)
+    with openai_limiter.reserve(
+        len(jobs), tokens, call_seconds=_call_seconds()
+    ) as slots, ThreadPoolExecutor(max_workers=min(workers(), len(pending), slots)) as executor:
+        for _attempt in range(CHUNK_ATTEMPTS):
+            futures = {index: executor.submit(openai.translate_text, **jobs[index]) for index in pending}
+            for index, future in futures.items():
+                try:
+                    results[index] = future.result()
+                except openai.OpenAIRequestError as exc:
+                    results[index] = exc
+            pending = [
+                index
+                for index in pending
+                if isinstance(results[index], openai.OpenAIRequestError)
+                and _retryable(results[index])
+            ]
+            if not pending:
+                break
+    return results
+
+
+def _translate_missing(jobs: list[dict], keys: list[str]) -> list[Union[Translation, openai.OpenAIRequestError]]:
+    """Call OpenAI for ``jobs`` and store the translations under ``keys``."""
+
+    output: list[Union[Translation, openai.OpenAIRequestError]] = []
+    for job, key, result in zip(jobs, keys, _translate_chunks(jobs) if jobs else []):
+        if isinstance(result, openai.OpenAIRequestError):
+            output.append(result)
+            continue
+        store(key, result, job["target_language"])
+        output.append(Translation(result, MISS))
+    return output
+
+
+def _claim(key: str) -> bool:
+    """Take the cross-process lock of ``key``, unless a live holder has it."""
+
+    now = timezone.now()
+    expires_at = now + timedelta(seconds=lock_seconds())
+    try:
+        with transaction.atomic():
+            TranslationLock.objects.create(key=key, owner=OWNER, expires_at=expires_at)
+        return True
+    except IntegrityError:
+        return bool(
+            TranslationLock.objects.filter(key=key, expires_at__lte=now).update(
+                owner=OWNER, expires_at=expires_at
+            )
+        )
+
+
+def _await(key: str) -> Optional[Translation]:
+    """Wait for another process to store ``key``; ``None`` if it gave up."""
+
+    deadline = time.monotonic() + lock_seconds()
+    while True:
+        found = lookup(key)
+        if found is not None:
+            return found._replace(source=SHARED)
+        held = TranslationLock.objects.filter(key=key, expires_at__gt=timezone.now()).exists()
+        if not held or time.monotonic() >= deadline:
+            found = lookup(key)
+            return found._replace(source=SHARED) if found is not None else None
+        time.sleep(LOCK_POLL_INTERVAL)
+
+
+def _settle(keys: list[str], results: dict[str, object]) -> None:
+    """Hand the results of the keys this thread led to the threads waiting on them."""
+
+    with _lock:
+        futures = [(_inflight.pop(key), key) for key in keys if key in _inflight]
+    for future, key in futures:
+        result = results.get(key)
+        if isinstance(result, BaseException):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+
+def _fetch(jobs: list[dict], keys: list[str]) -> list[Union[Translation, openai.OpenAIRequestError]]:
+    """Translate the chunks missing from the memory, once across concurrent callers."""
+
+    led, followed = [], {}
+    with _lock:
+        for index, key in enumerate(keys):
+            if key in _inflight:
+                followed[index] = _inflight[key]
+            else:
+                _inflight[key] = Future()
+                led.append(index)
+
+    results: dict[str, object] = {}
+    try:
+        calls, remote = [], []
+        for index in led:
+            if not ttl():
+                calls.append(index)
+            elif not _claim(keys[index]):
+                remote.append(index)
+            else:
+                # Another process may have stored it between lookup and claim.
+                found = lookup(keys[index])
+                if found is not None:
+                    results[keys[index]] = found
+                else:
+                    calls.append(index)
+        try:
+            answers = _translate_missing([jobs[i] for i in calls], [keys[i] for i in calls])
+            results.update(zip((keys[i] for i in calls), answers))
+        finally:
+            TranslationLock.objects.filter(
+                key__in=[keys[index] for index in led if index not in remote], owner=OWNER
+            ).delete()
+        _settle([keys[index] for index in calls], results)
+
+        orphans = []
+        for index in remote:
+            found = _await(keys[index])
+            if found is None:
+                orphans.append(index)
+            else:
+                results[keys[index]] = found
+        answers = _translate_missing([jobs[i] for i in orphans], [keys[i] for i in orphans])
+        results.update(zip((keys[i] for i in orphans), answers))
+    except BaseException as exc:
+        for index in led:
+            results.setdefault(keys[index], exc)
+        raise
+    finally:
+        _settle([keys[index] for index in led], results)
+
+    for index, future in followed.items():
+        shared = future.result()
+        results[keys[index]] = shared._replace(source=SHARED) if isinstance(shared, Translation) else shared
+    return [results[key] for key in keys]  # type: ignore[misc]
+
+
+def _segments(text: str, fmt: str) -> list[tuple[str, str, str]]:
+    """Split ``text`` into ``(leading space, body, trailing space)`` chunks."""
+
+    if len(text) <= chunk_length():
+        return [("", text, "")]
+    segments = []
+    for piece in chunking.split(text, limit=chunk_length(), fmt=fmt):
+        body = piece.strip()
+        start = piece.index(body) if body else len(piece)
+        segments.append((piece[:start], body, piece[start + len(body) :]))
+    return segments
+
+
+def recall(
+    *, text: str, target_language: str, source_language: Optional[str] = None, fmt: str = "markdown"
+) -> Optional[Translation]:
+    """Return the stored translation of ``text`` when every chunk is remembered.
+
+    Never calls OpenAI, so request handlers can answer hits without queueing.
+    """
+
+    options = {"target_language": target_language, "source_language": source_language, "fmt": fmt}
+    segments = _segments(text, fmt)
+    texts, sources = [], set()
+    for lead, body, trail in segments:
+        if body:
+            found = lookup(make_key(text=body, **options))
+            if found is None:
+                return None
+            sources.add(found.source)
+            body = found.text
+        texts.append(lead + body + trail)
+    joined = "".join(texts)
+    return Translation(
+        joined.strip() if len(segments) > 1 else joined,
+        DATABASE if DATABASE in sources else MEMORY,
+    )
+
+
+def translate_many(items: list[dict]) -> list[Union[Translation, openai.OpenAIRequestError]]:
+    """Translate several texts at once through the memory.
+
+    Each item holds the keyword arguments of :func:`translate`. The chunks
+    missing from the memory, across every item and without duplicates, are
+    sent to OpenAI on one pool. Returns, in order, a :class:`Translation`
+    or the :class:`~blog.utils.openai.OpenAIRequestError` of the item;
+    configuration errors are raised.
+    """
+
+    plans = []
+    jobs: list[dict] = []
+    job_index: dict[str, int] = {}
+    for item in items:
+        options = {
+            "target_language": item["target_language"],
+            "source_language": item.get("source_language"),
+            "fmt": item.get("fmt", "markdown"),
+        }
+        parts = []
+        for lead, body, trail in _segments(item["text"], options["fmt"]):
+            if not body:
+                parts.append((lead + trail, None, None))
+                continue
+            key = make_key(text=body, **options)
+            found = lookup(key)
+            if found is None and key not in job_index:
+                job_index[key] = len(jobs)
+                jobs.append({"text": body, **options})
+            parts.append(((lead, trail), key, found))
+        plans.append(parts)
+
+    fetched = _fetch(jobs, list(job_index)) if jobs else []
+    output: list[Union[Translation, openai.OpenAIRequestError]] = []
+    for parts in plans:
+        texts, sources, failure = [], set(), None
+        for padding, key, found in parts:
+            if key is None:
+                texts.append(padding)
+                continue
+            if found is None:
+                found = fetched[job_index[key]]
+                if isinstance(found, openai.OpenAIRequestError):
+                    failure = failure or found
+                    continue
+            sources.add(found.source)
+            texts.append(padding[0] + found.text + padding[1])
+        if failure is not None:
+            output.append(failure)
+            continue
+        source = next(
+            (tier for tier in (MISS, SHARED, DATABASE, MEMORY) if tier in sources), MEMORY
+        )
+        text = "".join(texts)
+        output.append(Translation(text.strip() if len(parts) > 1 else text, source))
+    return output
+
+
+def translate(
+    *,
+    text: str,
+    target_language: str,
+    source_language: Optional[str] = None,
+    fmt: str = "markdown",
+) -> Translation:
+    """Translate through the memory, calling OpenAI only on a miss.
+
+    Texts over :func:`chunk_length` are translated by chunks; the tier
+    reported is the coldest one involved. Raises the ``blog.utils.openai``
+    errors of :func:`~blog.utils.openai.translate_text`.
+    """
+
+    [result] = translate_many(
+        [
+            {
+                "text": text,
+                "target_language": target_language,
+                "source_language": source_language,
+                "fmt": fmt,
+            }
+        ]
+    )
+    if isinstance(result, Exception):
+        raise result
+    return result
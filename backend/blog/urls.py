@@ -5,6 +5,7 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from .views import (
+    BackgroundJobViewSet,
     CategoryViewSet,
     CommentViewSet,
     MeView,
@@ -21,6 +22,7 @@ router.register("posts", PostViewSet, basename="posts")
 router.register("categories", CategoryViewSet, basename="categories")
 router.register("tags", TagViewSet, basename="tags")
 router.register("ai/translations", OpenAITranslationViewSet, basename="ai-translations")
+router.register("jobs", BackgroundJobViewSet, basename="jobs")
 
 comment_list = CommentViewSet.as_view({
     "get": "list",
@@ -0,0 +1,106 @@
+"""Split long Markdown or HTML documents into translatable chunks.
+
+:func:`split` partitions a text into consecutive slices no longer than a
+limit, cutting only at block boundaries: blank lines in Markdown (then
+single line breaks), tag boundaries in HTML, preferring the shallowest
+nesting level available. Fenced code blocks, ``<pre>``/``<code>``/
+``<script>``/``<style>``/``<textarea>`` elements and tags themselves are
+never cut; a block longer than the limit becomes an oversized chunk rather
+than being broken. Joining the chunks gives back the original text.
+"""
+from __future__ import annotations
+
+import re
+
+FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+TAG_RE = re.compile(r"<!--.*?-->|<(/?)([a-zA-Z][\w:-]*)\b(?:[^>\"']|\"[^\"]*\"|'[^']*')*?(/?)>", re.S)
+
+VOID_ELEMENTS = frozenset(
+    {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+)
+RAW_ELEMENTS = frozenset({"pre", "code", "script", "style", "textarea"})
+
+Cut = tuple[int, int]
+
+
+def _markdown_cuts(text: str) -> list[Cut]:
+    """Line starts outside code fences: level 0 after a blank line, 1 otherwise."""
+
+    cuts: list[Cut] = []
+    fence = ""
+    previous_blank = False
+    position = 0
+    for line in text.splitlines(keepends=True):
+        if position and not fence:
+            cuts.append((position, 0 if previous_blank else 1))
+        marker = FENCE_RE.match(line)
+        if marker:
+            token = marker.group(1)
+            if not fence:
+                fence = token
+            elif token[0] == fence[0] and len(token) >= len(fence) and not line.strip()[len(token) :]:
+                fence = ""
+        previous_blank = not line.strip()
+        position += len(line)
+    return cuts
+
+
+def _html_cuts(text: str) -> list[Cut]:
+    """Positions before opening tags and after closing ones, at their depth."""
+
+    cuts: list[Cut] = []
+    stack: list[str] = []
+    position = 0
+    while True:
+        match = TAG_RE.search(text, position)
+        if match is None:
+            break
+        closing, name, self_closing = match.group(1), (match.group(2) or "").lower(), match.group(3)
+        position = match.end()
+        if not name:
+            # Comment: a boundary on both sides.
+            cuts += [(match.start(), len(stack)), (position, len(stack))]
+            continue
+        if closing:
+            if name in stack:
+                del stack[len(stack) - 1 - stack[::-1].index(name) :]
+                cuts.append((position, len(stack)))
+            continue
+        cuts.append((match.start(), len(stack)))
+        if name in VOID_ELEMENTS or self_closing:
+            cuts.append((position, len(stack)))
+            continue
+        if name in RAW_ELEMENTS:
+            end = re.compile(rf"</{name}\s*>", re.I).search(text, position)
+            if end is None:
+                break
+            position = end.end()
+            cuts.append((position, len(stack)))
+            continue
+        stack.append(name)
+    return cuts
+
+
+def split(text: str, *, limit: int, fmt: str = "markdown") -> list[str]:
+    """Return consecutive slices of ``text`` of at most ``limit`` characters where possible."""
+
+    if len(text) <= limit:
+        return [text]
+    cuts = _html_cuts(text) if fmt == "html" else _markdown_cuts(text)
+    cuts = sorted({cut for cut in cuts if 0 < cut[0] < len(text)})
+    chunks: list[str] = []
+    start = 0
+    while len(text) - start > limit:
+        window = [cut for cut in cuts if start < cut[0] <= start + limit]
+        if window:
+            level = min(cut[1] for cut in window)
+            end = max(index for index, depth in window if depth == level)
+        else:
+            later = [index for index, _depth in cuts if index > start]
+            if not later:
+                break
+            end = later[0]
+        chunks.append(text[start:end])
+        start = end
+    chunks.append(text[start:])
+    return chunks
@@ -2,9 +2,10 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
-from typing import Iterator, Optional
+from typing import Iterable, Iterator, Optional
 
 from django.conf import settings
+from django.db.models import Prefetch
 from django.utils import translation
 from slugify import slugify
 
@@ -55,6 +56,29 @@ def get_active_language(request) -> str:
     return settings.LANGUAGE_CODE
 
 
+def language_fallback_chain(language_code: Optional[str]) -> list[str]:
+    """Return the active language followed by the default fallback language."""
+
+    chain = [_clean_language_code(language_code)]
+    if settings.LANGUAGE_CODE not in chain:
+        chain.append(settings.LANGUAGE_CODE)
+    return chain
+
+
+def translations_prefetch(
+    model, language_codes: Iterable[str], lookup: str = "translations"
+) -> Prefetch:
+    """Prefetch the parler translations of ``model`` limited to ``language_codes``."""
+
+    translations_model = model._parler_meta.root_model
+    return Prefetch(
+        lookup,
+        queryset=translations_model._default_manager.filter(
+            language_code__in=list(language_codes)
+        ),
+    )
+
+
 @contextmanager
 def set_parler_language(language_code: Optional[str]) -> Iterator[None]:
     """Context manager to activate a language for django-parler operations."""
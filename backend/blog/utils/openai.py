@@ -1,12 +1,25 @@
-"""Helpers to interact with the OpenAI Responses API."""
+"""Helpers to interact with the OpenAI Responses API.
+
+Requests share one pooled :class:`requests.Session` per process, so
+consecutive translations reuse kept-alive TLS connections. Transient
+failures (connection errors, timeouts, 429 and 5xx answers) are retried
+with jittered exponential backoff, honouring ``Retry-After``, as long as
+the overall ``OPENAI_REQUEST_TIMEOUT`` budget allows another attempt.
+"""
 from __future__ import annotations
 
 import logging
 import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
 from typing import Any, Dict, Optional
 
 import requests
 from django.conf import settings
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +31,20 @@ DEFAULT_SYSTEM_PROMPT = (
     "pide texto plano elimina cualquier marca o etiqueta. No inventes contenido."
 )
 
+#: Answers worth another attempt: rate limiting and server side failures.
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+#: Upper bound of a single backoff wait, in seconds.
+MAX_BACKOFF = 8.0
+#: An attempt needs at least this much of the overall budget left, in seconds.
+MIN_ATTEMPT_TIME = 0.1
+#: Average characters per token, for usage estimates.
+CHARACTERS_PER_TOKEN = 4
+#: Characters of instructions wrapped around every translated text.
+PROMPT_OVERHEAD = 400
+
+_session_lock = threading.Lock()
+_session_instance: Optional[requests.Session] = None
+
 
 class OpenAIConfigurationError(RuntimeError):
     """Raised when OpenAI integration is not properly configured."""
@@ -31,6 +58,14 @@ class OpenAIRequestError(RuntimeError):
         self.status_code = status_code
 
 
+class OpenAIRateLimited(OpenAIRequestError):
+    """Raised when the shared limits on OpenAI usage leave no room for a call."""
+
+    def __init__(self, message: str, *, retry_after: float):
+        super().__init__(message, status_code=429)
+        self.retry_after = retry_after
+
+
 def _clean_candidate(candidate: Optional[str]) -> str:
     if not isinstance(candidate, str):
         return ""
@@ -62,10 +97,132 @@ def is_configured() -> bool:
     return bool(_api_key())
 
 
+def ensure_configured() -> None:
+    """Raise :class:`OpenAIConfigurationError` when no API key is available."""
+
+    if not is_configured():
+        raise OpenAIConfigurationError(
+            "Configura OPEN_IA_KEY en el entorno del backend para habilitar las traducciones."
+        )
+
+
 def _settings_value(name: str, default):
     return getattr(settings, name, default) or default
 
 
+def active_model() -> str:
+    """Model used for translations (``OPENAI_DEFAULT_MODEL``)."""
+
+    return _settings_value("OPENAI_DEFAULT_MODEL", DEFAULT_MODEL)
+
+
+def system_prompt() -> str:
+    """Instructions sent with every translation (``OPENAI_SYSTEM_PROMPT``)."""
+
+    return _settings_value("OPENAI_SYSTEM_PROMPT", DEFAULT_SYSTEM_PROMPT)
+
+
+def _session() -> requests.Session:
+    """Return the process wide session, creating it on first use."""
+
+    global _session_instance
+    with _session_lock:
+        if _session_instance is None:
+            session = requests.Session()
+            # Non-blocking pool: extra concurrent calls open short-lived
+            # connections, at most ``OPENAI_POOL_SIZE`` are kept alive.
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=max(1, int(_settings_value("OPENAI_POOL_SIZE", 10))),
+                max_retries=0,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session_instance = session
+        return _session_instance
+
+
+def reset_session() -> None:
+    """Close the pooled connections; the next call builds a new session."""
+
+    global _session_instance
+    with _session_lock:
+        if _session_instance is not None:
+            _session_instance.close()
+        _session_instance = None
+
+
+def _retry_after(response) -> Optional[float]:
+    """Seconds requested by a ``Retry-After`` header (delta or HTTP date)."""
+
+    value = getattr(response, "headers", {}).get("Retry-After")
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (moment - timezone.now()).total_seconds())
+
+
+def _backoff(attempt: int) -> float:
+    """Full jitter: a random wait up to ``base * 2**attempt``."""
+
+    base = float(getattr(settings, "OPENAI_RETRY_BACKOFF", 0.5))
+    return random.uniform(0, min(MAX_BACKOFF, base * (2**attempt)))
+
+
+def _post(url: str, *, json: Dict[str, Any], headers: Dict[str, str]) -> requests.Response:
+    """POST with retries inside the ``OPENAI_REQUEST_TIMEOUT`` budget.
+
+    Each attempt may use whatever remains of the budget; connecting gets a
+    fifth of it (at least one second). Returns the last response, even a
+    retryable error, once attempts or time run out; raises the last
+    ``requests`` exception when no response was obtained.
+    """
+
+    timeout = float(_settings_value("OPENAI_REQUEST_TIMEOUT", 15.0))
+    retries = max(0, int(getattr(settings, "OPENAI_MAX_RETRIES", 2)))
+    deadline = time.monotonic() + timeout
+    attempt = 0
+    while True:
+        remaining = max(MIN_ATTEMPT_TIME, deadline - time.monotonic())
+        connect_timeout = min(remaining, max(1.0, timeout / 5))
+        response = error = None
+        try:
+            response = _session().post(
+                url, json=json, headers=headers, timeout=(connect_timeout, remaining)
+            )
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            error = exc
+        else:
+            if response.status_code not in RETRY_STATUSES:
+                return response
+
+        delay = _backoff(attempt)
+        if response is not None:
+            delay = max(delay, _retry_after(response) or 0.0)
+        out_of_time = time.monotonic() + delay + MIN_ATTEMPT_TIME > deadline
+        if attempt >= retries or out_of_time:
+            if response is not None:
+                return response
+            raise error
+        logger.info(
+            "Retrying OpenAI request in %.2fs (attempt %s): %s",
+            delay,
+            attempt + 1,
+            error or response.status_code,
+        )
+        if response is not None:
+            response.close()
+        time.sleep(delay)
+        attempt += 1
+
+
 def _normalize_lang(value: Optional[str]) -> str:
     if not value:
         return ""
@@ -141,6 +298,13 @@ def _extract_translation(payload: Dict[str, Any]) -> str:
     return ""
 
 
+def estimate_tokens(text: str) -> int:
+    """Rough token count of translating ``text``: prompt, text and answer."""
+
+    characters = len(system_prompt()) + PROMPT_OVERHEAD + 2 * len(text)
+    return characters // CHARACTERS_PER_TOKEN + 1
+
+
 def translate_text(
     *,
     text: str,
@@ -151,21 +315,17 @@ def translate_text(
 ) -> str:
     """Translate ``text`` into ``target_language`` using the OpenAI API."""
 
-    if not is_configured():
-        raise OpenAIConfigurationError(
-            "Configura OPEN_IA_KEY en el entorno del backend para habilitar las traducciones."
-        )
+    ensure_configured()
 
     api_key = _api_key()
     url = _settings_value("OPENAI_API_URL", DEFAULT_OPENAI_URL)
-    model = _settings_value("OPENAI_DEFAULT_MODEL", DEFAULT_MODEL)
-    system_prompt = _settings_value("OPENAI_SYSTEM_PROMPT", DEFAULT_SYSTEM_PROMPT)
-    timeout = _settings_value("OPENAI_REQUEST_TIMEOUT", 15.0)
+    model = active_model()
+    instructions = system_prompt()
 
     payload = {
         "model": model,
         "temperature": temperature,
-        "instructions": system_prompt,
+        "instructions": instructions,
         "input": _build_prompt(
             text=text,
             target_language=target_language,
@@ -181,7 +341,7 @@ def translate_text(
     }
 
     try:
-        response = requests.post(url, json=payload, headers=headers, timeout=timeout)
+        response = _post(url, json=payload, headers=headers)
     except requests.RequestException as exc:  # pragma: no cover - network failure
         logger.exception("Error contacting OpenAI: %s", exc)
         raise OpenAIRequestError(
@@ -3,11 +3,16 @@
 from __future__ import annotations
 
 import logging
+import math
 
 from django.conf import settings
-from django.db.models import Count, F, Q
+from django.db.models import Count, F, Max, Prefetch, Q, Value, prefetch_related_objects
+from django.db.models.functions import Lower
+from django_filters.rest_framework import DjangoFilterBackend
 from django.http import Http404
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
 from drf_spectacular.utils import (
     OpenApiExample,
     OpenApiParameter,
@@ -23,21 +28,45 @@ from rest_framework.response import Response
 from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.views import APIView
 
-from .filters import PostFilterSet
-from .models import Category, Comment, Post, Reaction, Tag
-from . import rbac
+from .filters import (
+    FullTextSearchFilter,
+    PostFilterSet,
+    TranslatedOrderingFilter,
+    related_exists,
+)
+from .models import BackgroundJob, Category, Comment, Post, PostRenderSnapshot, Reaction, Tag
+from . import (
+    conditional,
+    jobs,
+    openai_limiter,
+    post_counters,
+    post_translation,
+    rbac,
+    reaction_counters,
+    response_cache,
+    slug_index,
+    snapshots,
+    translation_memory,
+)
+from .pagination import CommentKeysetPagination, PostKeysetPagination
 from .serializers import (
+    BackgroundJobSerializer,
     CategorySerializer,
     CommentSerializer,
     OpenAITranslationResponseSerializer,
     OpenAITranslationSerializer,
     PostDetailSerializer,
     PostListSerializer,
+    PostTranslationRequestSerializer,
+    PostTranslationResponseSerializer,
     TagSerializer,
+    PostReactionSummarySerializer,
+    ReactionBatchQuerySerializer,
     ReactionSummarySerializer,
     ReactionToggleSerializer,
     MeSerializer,
     AssignRoleSerializer,
+    translations_expansion_requested,
 )
 from .permissions import (
     CanModerateComments,
@@ -46,17 +75,53 @@ from .permissions import (
     IsAdminOrReadOnly,
     IsEditorOrAuthorCanEditOwnDraft,
 )
-from .utils.i18n import get_active_language, set_parler_language
+from .utils.i18n import (
+    get_active_language,
+    set_parler_language,
+)
 from .utils.openai import (
     OpenAIConfigurationError,
-    OpenAIRequestError,
-    translate_text,
+    ensure_configured,
 )
 
 
 logger = logging.getLogger(__name__)
 
 
+def job_accepted_response(request, job: BackgroundJob) -> Response:
+    """202 for a queued job, pointing at the endpoint that reports its outcome."""
+
+    location = reverse("blog:jobs-detail", kwargs={"pk": job.pk})
+    response = Response(BackgroundJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+    response["Location"] = request.build_absolute_uri(location)
+    return response
+
+
+def job_failure_response(job: BackgroundJob) -> Response:
+    """Answer a job that failed inline with the error its task reported."""
+
+    result = job.result or {}
+    status_code = result.get("status_code")
+    if not isinstance(status_code, int) or status_code < 400:
+        status_code = status.HTTP_502_BAD_GATEWAY
+    logger.warning("Job %s (%s) failed: %s", job.pk, job.task, job.error)
+    response = Response({"detail": result.get("detail") or job.error}, status=status_code)
+    if result.get("retry_after"):
+        response["Retry-After"] = str(math.ceil(result["retry_after"]))
+    return response
+
+
+def shed_when_over_budget() -> None:
+    """Answer 429 at once while the OpenAI token budget of the window is spent."""
+
+    wait = openai_limiter.exhausted()
+    if wait is not None:
+        raise exceptions.Throttled(
+            wait=wait,
+            detail="Se agotó la cuota de traducción de este minuto. Inténtalo de nuevo más tarde.",
+        )
+
+
 class LanguageNegotiationMixin:
     """Resolve the active language and expose it to serializers and responses."""
 
@@ -89,6 +154,183 @@ class LanguageNegotiationMixin:
         return queryset
 
 
+class CachedReadMixin:
+    """Optimized ``list``/``retrieve`` for read-heavy viewsets.
+
+    * Anonymous responses are served from ``blog.response_cache`` (disable
+      with ``cache_anonymous_responses = False``); they carry ``X-Cache``.
+    * ``get_list_validators``/``get_object_validators`` may return an ETag and
+      a ``Last-Modified`` date; matching conditional requests get a 304
+      before the serializer runs, including for cached entries. When
+      ``validates_page`` is true the list is paginated first and
+      ``get_page_validators`` builds them from the rows of the page.
+    * ``get_prebuilt_object``/``serialize_page``/``serialize_object`` let a
+      viewset answer from payloads rendered ahead of time.
+
+    Must be placed before ``LanguageNegotiationMixin`` so the negotiated
+    language is part of the key.
+    """
+
+    cache_anonymous_responses = True
+
+    def list(self, request, *args, **kwargs):  # type: ignore[override]
+        key, cached = self._lookup_cached(request)
+        if cached is not None:
+            return cached
+        queryset = self.filter_queryset(self.get_queryset())
+        versions = response_cache.current_versions([response_cache.dependency(queryset.model)])
+        validates_page = self.validates_page()
+        if validates_page:
+            page = self.paginate_queryset(queryset)
+            validators = self.get_page_validators(page, key, versions)
+        else:
+            validators = self.get_list_validators(queryset, key, versions)
+        not_modified = conditional.not_modified(request, validators)
+        if not_modified is not None:
+            return not_modified
+
+        if not validates_page:
+            page = self.paginate_queryset(queryset)
+        if page is not None:
+            response = self.get_paginated_response(self.serialize_page(page))
+        else:
+            response = Response(self.get_serializer(queryset, many=True).data)
+        return self._store_response(key, versions, validators, response)
+
+    def retrieve(self, request, *args, **kwargs):  # type: ignore[override]
+        key, cached = self._lookup_cached(request)
+        if cached is not None:
+            return cached
+        prebuilt = self.get_prebuilt_object()
+        if prebuilt is not None:
+            versions = response_cache.current_versions(prebuilt.dependencies)
+            validators = self.get_prebuilt_validators(prebuilt, key, versions)
+        else:
+            instance = self.get_object()
+            versions = response_cache.current_versions(self.get_cache_dependencies(instance))
+            validators = self.get_object_validators(instance, key, versions)
+        not_modified = conditional.not_modified(request, validators)
+        if not_modified is not None:
+            return not_modified
+
+        data = prebuilt.payload if prebuilt is not None else self.serialize_object(instance)
+        return self._store_response(key, versions, validators, Response(data))
+
+    def get_cache_dependencies(self, instance) -> list[str]:
+        """Objects whose changes must expire the cached detail of ``instance``."""
+
+        return [response_cache.dependency(type(instance), instance.pk)]
+
+    def get_list_validators(self, queryset, key: str, versions: dict) -> conditional.Validators:
+        return conditional.NO_VALIDATORS
+
+    def validates_page(self) -> bool:
+        """Whether list validators come from the page rather than the whole queryset."""
+
+        return False
+
+    def get_page_validators(self, page, key: str, versions: dict) -> conditional.Validators:
+        return conditional.NO_VALIDATORS
+
+    def share_count(self, total: int) -> None:
+        """Hand a total computed for the validators over to the paginator."""
+
+        if hasattr(self.paginator, "known_count"):
+            self.paginator.known_count = total
+
+    def get_object_validators(self, instance, key: str, versions: dict) -> conditional.Validators:
+        return conditional.NO_VALIDATORS
+
+    def serialize_page(self, page) -> list:
+        return self.get_serializer(page, many=True).data
+
+    def serialize_object(self, instance):
+        return self.get_serializer(instance).data
+
+    def get_prebuilt_object(self):
+        """Return a stored rendering (``payload``/``dependencies``) of the detail."""
+
+        return None
+
+    def get_prebuilt_validators(self, prebuilt, key: str, versions: dict) -> conditional.Validators:
+        return conditional.NO_VALIDATORS
+
+    def _is_cacheable(self, request) -> bool:
+        return self.cache_anonymous_responses and response_cache.is_cacheable(request)
+
+    def _lookup_cached(self, request):
+        key = response_cache.build_key(request, self.language_code)
+        if not self._is_cacheable(request):
+            return key, None
+        cached = response_cache.lookup(key, self.basename)
+        if cached is None:
+            return key, None
+        status_code, data, validators = cached
+        response = conditional.not_modified(request, validators)
+        if response is None:
+            response = conditional.apply(Response(data, status=status_code), validators)
+        response[response_cache.HEADER] = response_cache.HIT
+        return key, response
+
+    def _store_response(self, key: str, versions: dict, validators, response: Response) -> Response:
+        conditional.apply(response, validators)
+        if self._is_cacheable(self.request):
+            if response.status_code == status.HTTP_200_OK:
+                response_cache.store(key, versions, response.status_code, response.data, validators)
+            response[response_cache.HEADER] = response_cache.MISS
+        return response
+
+
+class KeysetOptInMixin:
+    """Serve ``list`` with ``cursor_pagination_class`` when the client asks.
+
+    ``?pagination=cursor`` or any ``?cursor=`` switches from page numbers to
+    keyset pagination; other actions keep the default paginator.
+    """
+
+    cursor_pagination_class = None
+
+    @property
+    def paginator(self):  # type: ignore[override]
+        """Switch to keyset pagination when the client opts into cursors."""
+
+        if not hasattr(self, "_paginator") and self._wants_cursor_pagination():
+            self._paginator = self.cursor_pagination_class()
+        return super().paginator
+
+    def _wants_cursor_pagination(self) -> bool:
+        request = getattr(self, "request", None)
+        if (
+            self.cursor_pagination_class is None
+            or request is None
+            or getattr(self, "action", None) != "list"
+        ):
+            return False
+        params = request.query_params
+        if self.cursor_pagination_class.cursor_query_param in params:
+            return True
+        return (params.get("pagination") or "").strip().lower() == "cursor"
+
+    def validates_page(self) -> bool:
+        # An aggregate over the whole collection would undo the constant cost of
+        # a keyset page, which already identifies its representation.
+        return self._wants_cursor_pagination()
+
+    def get_page_validators(self, page, key, versions) -> conditional.Validators:
+        """ETag of a keyset page: the key (cursor included), its rows and the versions."""
+
+        if page is None:
+            return conditional.NO_VALIDATORS
+        etag = conditional.make_etag(
+            key,
+            conditional.viewer_scope(self.request),
+            self.paginator.count,
+            *(item.pk for item in page),
+            *versions.values(),
+        )
+        return etag, None
+
+
 LANGUAGE_CODES = [code for code, _name in getattr(settings, "LANGUAGES", ())]
 
 LANGUAGE_QUERY_PARAMETER = OpenApiParameter(
@@ -130,6 +372,18 @@ CONTENT_LANGUAGE_HEADER = OpenApiParameter(
     description="Idioma utilizado en el cuerpo de la respuesta.",
 )
 
+PAGINATION_MODE_PARAMETER = OpenApiParameter(
+    name="pagination",
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.QUERY,
+    required=False,
+    enum=["page", "cursor"],
+    description=(
+        "Con `pagination=cursor` el listado usa cursores opacos (`cursor`) sobre el "
+        "orden `(-date, -id)` y omite `count` salvo que se pida `count=true`."
+    ),
+)
+
 POST_LIST_PLAIN_EXAMPLE = OpenApiExample(
     "Listado en modo plano",
     value={
@@ -208,7 +462,7 @@ POST_DETAIL_PLAIN_EXAMPLE = OpenApiExample(
         "categories": ["frontend"],
         "categories_detail": [],
         "created_at": "2024-02-01",
-        "updated_at": "2024-02-01",
+        "updated_at": "2024-02-01T10:30:00+01:00",
         "image": "https://cdn.example.com/posts/react.png",
         "thumb": "https://cdn.example.com/posts/react-thumb.png",
         "imageAlt": "Ilustración de componentes React",
@@ -238,7 +492,7 @@ POST_DETAIL_EXPANDED_EXAMPLE = OpenApiExample(
             }
         ],
         "created_at": "2024-02-01",
-        "updated_at": "2024-02-01",
+        "updated_at": "2024-02-01T10:30:00+01:00",
         "image": "https://cdn.example.com/posts/react.png",
         "thumb": "https://cdn.example.com/posts/react-thumb.png",
         "imageAlt": "Ilustración de componentes React",
@@ -345,6 +599,7 @@ OPENAI_TRANSLATION_RESPONSE_EXAMPLE = OpenApiExample(
     ),
 )
 class TagViewSet(
+    CachedReadMixin,
     LanguageNegotiationMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
@@ -352,7 +607,7 @@ class TagViewSet(
     mixins.UpdateModelMixin,
     viewsets.GenericViewSet,
 ):
-    """Expose tags with optional post counters for editorial tools."""
+    """Expose tags with their stored post counters for editorial tools."""
 
     serializer_class = TagSerializer
     lookup_field = "slug"
@@ -372,10 +627,6 @@ class TagViewSet(
                     translations__language_code=self.language_code
                 )
 
-        with_counts = params.get("with_counts")
-        if with_counts is not None and with_counts.lower() in {"1", "true", "yes"}:
-            queryset = queryset.annotate(post_count=Count("posts", distinct=True))
-
         return queryset.order_by(*self.ordering).distinct()
 
 
@@ -385,6 +636,7 @@ class TagViewSet(
             LANGUAGE_QUERY_PARAMETER,
             EXPAND_TRANSLATIONS_PARAMETER,
             ACCEPT_LANGUAGE_HEADER,
+            PAGINATION_MODE_PARAMETER,
         ],
         responses={
             200: OpenApiResponse(
@@ -443,6 +695,8 @@ class TagViewSet(
     ),
 )
 class PostViewSet(
+    KeysetOptInMixin,
+    CachedReadMixin,
     LanguageNegotiationMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
@@ -453,13 +707,10 @@ class PostViewSet(
 ):
     """Manage blog posts using viewsets."""
 
-    queryset = (
-        Post.objects.annotate(created_at=F("date"))
-        .prefetch_related("tags", "categories")
-        .order_by("-date", "-id")
-    )
+    queryset = Post.objects.annotate(created_at=F("date")).order_by("-date", "-id")
     lookup_field = "slug"
     lookup_url_kwarg = "slug"
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, TranslatedOrderingFilter]
     filterset_class = PostFilterSet
     search_fields = [
         "translations__title",
@@ -470,6 +721,8 @@ class PostViewSet(
     ordering_fields = ["date", "created_at", "title"]
     ordering = ["-date"]
     permission_classes = [IsAuthenticatedOrReadOnly, IsEditorOrAuthorCanEditOwnDraft]
+    cursor_pagination_class = PostKeysetPagination
+    REACTION_ACTIONS = frozenset({"reactions", "react", "reaction_summaries"})
 
     def get_permissions(self):  # type: ignore[override]
         """Customize permissions for auxiliary actions without tightening writes."""
@@ -488,14 +741,16 @@ class PostViewSet(
         return super().permission_denied(request, message=message, code=code)
 
     def get_throttles(self):  # type: ignore[override]
-        if getattr(self, "action", None) in {"reactions", "react"}:
+        if getattr(self, "action", None) in self.REACTION_ACTIONS:
             self.throttle_scope = "reactions"
+        elif getattr(self, "action", None) == "translate":
+            self.throttle_scope = "openai"
         else:
             self.throttle_scope = None
         return super().get_throttles()
 
     def get_queryset(self):
-        queryset = super().get_queryset().distinct()
+        queryset = super().get_queryset()
 
         user = getattr(self.request, "user", None)
         if not getattr(user, "is_authenticated", False):
@@ -504,7 +759,7 @@ class PostViewSet(
             pass
         elif rbac.user_has_role(user, rbac.Role.AUTHOR):
             queryset = queryset.filter(
-                Q(created_by=user) | Q(status__in=rbac.PUBLIC_POST_STATUSES)
+                Q(created_by_id=user.pk) | Q(status__in=rbac.PUBLIC_POST_STATUSES)
             )
         elif rbac.user_has_role(user, rbac.Role.REVIEWER):
             queryset = queryset.filter(status__in=rbac.REVIEWER_VISIBLE_STATUSES)
@@ -513,69 +768,165 @@ class PostViewSet(
 
         category_slug = self.request.query_params.get("category")
         if category_slug:
-            queryset = queryset.filter(categories__slug__iexact=category_slug)
+            # Uncorrelated on purpose: the planner starts from the ``lower(slug)``
+            # index of the category instead of probing it once per post.
+            in_category = Post.categories.through.objects.filter(
+                category__translations__slug__lower=Lower(Value(category_slug))
+            )
+            queryset = queryset.filter(pk__in=in_category.values("post_id"))
+
+        queryset = self.apply_language(queryset)
+        if self.action == "list":
+            queryset = post_counters.annotate(queryset)
+        if self.action == "list" and self._serves_snapshots():
+            # Relations are only loaded for the posts of a page without a snapshot.
+            return queryset
+        if self.action in self.REACTION_ACTIONS:
+            # Reaction endpoints only need the post id.
+            return queryset
+        return queryset.prefetch_related(*self._related_prefetches())
+
+    def get_list_validators(self, queryset, key, versions):  # type: ignore[override]
+        # No Last-Modified: deleting or unpublishing a post does not move it.
+        summary = queryset.order_by().aggregate(last_modified=Max("updated_at"), total=Count("pk"))
+        self.share_count(summary["total"])
+        etag = conditional.make_etag(
+            key,
+            conditional.viewer_scope(self.request),
+            summary["total"],
+            summary["last_modified"],
+            *versions.values(),
+        )
+        return etag, None
+
+    def get_object_validators(self, instance, key, versions):  # type: ignore[override]
+        return self._post_validators(key, versions, instance.updated_at)
+
+    def get_prebuilt_validators(self, prebuilt, key, versions):  # type: ignore[override]
+        return self._post_validators(key, versions, prebuilt.source_updated_at)
+
+    def _post_validators(self, key, versions, updated_at) -> conditional.Validators:
+        etag = conditional.make_etag(
+            key,
+            conditional.viewer_scope(self.request),
+            updated_at,
+            *versions.values(),
+        )
+        return etag, updated_at
+
+    def get_cache_dependencies(self, instance) -> list[str]:  # type: ignore[override]
+        return snapshots.dependencies(instance)
+
+    def _related_prefetches(self) -> list[Prefetch]:
+        """Load translations for the post, its tags and categories up front."""
+
+        return snapshots.post_prefetches(
+            self.language_code, translations_expansion_requested(self.request)
+        )
+
+    def _serves_snapshots(self) -> bool:
+        """Anonymous reads of public posts are answered from render snapshots."""
+
+        user = getattr(self.request, "user", None)
+        return self.action in {"list", "retrieve"} and not getattr(user, "is_authenticated", False)
+
+    def serialize_page(self, page) -> list:  # type: ignore[override]
+        if not self._serves_snapshots():
+            return super().serialize_page(page)
+        expanded = translations_expansion_requested(self.request)
+        built_at = timezone.now()
+        payloads = snapshots.find_list_payloads(
+            [post.pk for post in page], self.language_code, expanded
+        )
+        missing = [post for post in page if post.pk not in payloads]
+        if missing:
+            prefetch_related_objects(missing, *self._related_prefetches())
+            rendered = super().serialize_page(missing)
+            snapshots.store(
+                missing,
+                rendered,
+                PostRenderSnapshot.Kind.LIST,
+                self.language_code,
+                expanded,
+                built_at,
+            )
+            payloads.update(zip((post.pk for post in missing), rendered))
+        return [post_counters.overlay(payloads[post.pk], post) for post in page]
+
+    def get_prebuilt_object(self):  # type: ignore[override]
+        # Other query parameters (filters) may still turn the detail into a 404.
+        if not self._serves_snapshots() or set(self.request.query_params) - {"lang", "expand"}:
+            return None
+        matches = slug_index.resolve(
+            self.kwargs.get(self.lookup_url_kwarg or self.lookup_field), self.language_code
+        )
+        if not matches:
+            return None
+        return snapshots.find_detail(
+            [match.post_id for match in matches],
+            self.language_code,
+            translations_expansion_requested(self.request),
+        )
+
+    def serialize_object(self, instance):  # type: ignore[override]
+        data = super().serialize_object(instance)
+        if self._serves_snapshots():
+            snapshots.store(
+                [instance],
+                [data],
+                PostRenderSnapshot.Kind.DETAIL,
+                self.language_code,
+                translations_expansion_requested(self.request),
+                self._loaded_at,
+            )
+        return data
 
-        return self.apply_language(queryset.distinct())
+    def retrieve(self, request, *args, **kwargs):  # type: ignore[override]
+        return self._canonical_link(super().retrieve(request, *args, **kwargs))
 
     def get_object(self):  # type: ignore[override]
-        try:
+        # Snapshots built from this object are only as fresh as its relations.
+        self._loaded_at = timezone.now()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        lookup_value = self.kwargs.get(lookup_url_kwarg)
+        if not lookup_value or self.lookup_field != "slug":
             return super().get_object()
-        except Http404:
-            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
-            lookup_value = self.kwargs.get(lookup_url_kwarg)
-
-            if not lookup_value or self.lookup_field != "slug":
-                raise
-
-            base_queryset = self.filter_queryset(super().get_queryset()).distinct()
-
-            translations_field = Post._meta.get_field("translations")
-            translations_model = getattr(translations_field, "related_model", None)
-            if translations_model is None:
-                raise
-
-            language_candidates: list[str] = []
-            if self.language_code and self.language_code not in language_candidates:
-                language_candidates.append(self.language_code)
-            default_language = getattr(settings, "LANGUAGE_CODE", None)
-            if default_language and default_language not in language_candidates:
-                language_candidates.append(default_language)
-            for code in LANGUAGE_CODES:
-                if code not in language_candidates:
-                    language_candidates.append(code)
-
-            for language_code in language_candidates:
-                with set_parler_language(language_code):
-                    translation = (
-                        translations_model._default_manager.filter(slug__iexact=lookup_value)
-                        .order_by("master_id")
-                        .first()
-                    )
-                if translation is None:
-                    continue
-
-                fallback = base_queryset.filter(pk=translation.master_id).first()
-                if fallback is None:
-                    fallback = (
-                        super()
-                        .get_queryset()
-                        .filter(pk=translation.master_id)
-                        .first()
-                    )
-                if fallback is None:
-                    continue
-
-                self.check_object_permissions(self.request, fallback)
-                return fallback
-
-            raise
+
+        matches = slug_index.resolve(lookup_value, self.language_code)
+        if not matches:
+            raise Http404
+        queryset = self.filter_queryset(self.get_queryset())
+        visible = {post.pk: post for post in queryset.filter(pk__in=[m.post_id for m in matches])}
+        obj = next((visible[m.post_id] for m in matches if m.post_id in visible), None)
+        if obj is None:
+            obj = super().get_queryset().filter(pk=matches[0].post_id).first()
+        if obj is None:
+            raise Http404
+
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    def _canonical_link(self, response):
+        """Point clients requesting another language's slug at the canonical URL."""
+
+        slug = self.kwargs.get(self.lookup_url_kwarg or self.lookup_field)
+        canonical = (response.data or {}).get("slug") if response.status_code == status.HTTP_200_OK else None
+        if canonical is None and response.status_code == status.HTTP_304_NOT_MODIFIED:
+            matches = slug_index.resolve(slug, self.language_code)
+            canonical = matches[0].canonical_slug if matches else None
+        if canonical and canonical != slug:
+            url = reverse("blog:posts-detail", kwargs={"slug": canonical})
+            response["Link"] = f'<{self.request.build_absolute_uri(url)}>; rel="canonical"'
+        return response
 
     def filter_queryset(self, queryset):  # type: ignore[override]
         queryset = super().filter_queryset(queryset)
         search_term = (self.request.query_params.get("search") or "").strip()
         if search_term:
-            queryset = queryset.filter(translations__language_code=self.language_code)
-        return queryset.distinct()
+            queryset = queryset.filter(
+                related_exists(Post, "translations", language_code=self.language_code)
+            )
+        return queryset
 
     def get_serializer_class(self):  # type: ignore[override]
         if self.action == "list":
@@ -620,23 +971,23 @@ class PostViewSet(
         return Reaction.objects.for_instance(post)
 
     def _build_reaction_summary(self, post: Post, user):
-        reaction_qs = self._get_reaction_queryset(post)
-        counts = {choice: 0 for choice, _ in Reaction.Types.choices}
-        for row in reaction_qs.values("type").annotate(total=Count("id")):
-            counts[row["type"]] = int(row["total"])
+        counts = reaction_counters.counts_for(post)
 
         my_reaction = None
         if getattr(user, "is_authenticated", False):
             my_reaction = (
-                reaction_qs.filter(user=user)
+                self._get_reaction_queryset(post)
+                .filter(user_id=user.pk)
                 .values_list("type", flat=True)
                 .first()
             )
 
-        total = int(sum(counts.values()))
+        return self._reaction_summary(counts, my_reaction)
+
+    def _reaction_summary(self, counts: dict[str, int], my_reaction):
         payload = {
             "counts": counts,
-            "total": total,
+            "total": int(sum(counts.values())),
             "my_reaction": my_reaction,
         }
         serializer = ReactionSummarySerializer(payload)
@@ -676,7 +1027,93 @@ class PostViewSet(
     def reactions(self, request, slug=None):
         post = self.get_object()
         summary = self._build_reaction_summary(post, request.user)
-        return Response(summary)
+        validators = (
+            conditional.make_etag(
+                conditional.viewer_scope(request),
+                post.pk,
+                sorted(summary["counts"].items()),
+                summary["my_reaction"],
+            ),
+            None,
+        )
+        not_modified = conditional.not_modified(request, validators)
+        if not_modified is not None:
+            return not_modified
+        return conditional.apply(Response(summary), validators)
+
+    @extend_schema(
+        description=(
+            "Devuelve los resúmenes de reacciones de varias entradas, indicadas por"
+            " slug (`slugs`) o identificador (`ids`) separados por comas. Las"
+            " entradas no visibles para el usuario se omiten."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="slugs",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Slugs separados por comas.",
+            ),
+            OpenApiParameter(
+                name="ids",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                required=False,
+                description="Identificadores separados por comas.",
+            ),
+        ],
+        responses={200: PostReactionSummarySerializer(many=True)},
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="reaction-summaries",
+        url_name="reaction-summaries",
+        throttle_classes=[ScopedRateThrottle],
+    )
+    def reaction_summaries(self, request):
+        params = ReactionBatchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        queryset = self.get_queryset().order_by()
+        targets: list[tuple[int, str | None]] = []
+        slugs = params.validated_data["slugs"]
+        if slugs:
+            found = {
+                slug: pk
+                for pk, slug in queryset.filter(translations__slug__in=slugs).values_list(
+                    "pk", "translations__slug"
+                )
+            }
+            targets += [(found[slug], slug) for slug in slugs if slug in found]
+        ids = params.validated_data["ids"]
+        if ids:
+            found_ids = set(queryset.filter(pk__in=ids).values_list("pk", flat=True))
+            targets += [(pk, None) for pk in ids if pk in found_ids]
+
+        user = request.user
+        user_id = user.pk if getattr(user, "is_authenticated", False) else None
+        summaries = reaction_counters.summaries(Post, [pk for pk, _slug in targets], user_id)
+        payload = []
+        for pk, slug in targets:
+            counts, my_reaction = summaries[pk]
+            payload.append(
+                {"id": pk, "slug": slug, **self._reaction_summary(counts, my_reaction)}
+            )
+        validators = (
+            conditional.make_etag(
+                conditional.viewer_scope(request),
+                [
+                    (item["id"], item["slug"], sorted(item["counts"].items()), item["my_reaction"])
+                    for item in payload
+                ],
+            ),
+            None,
+        )
+        not_modified = conditional.not_modified(request, validators)
+        if not_modified is not None:
+            return not_modified
+        return conditional.apply(Response(payload), validators)
 
     @extend_schema(
         description=(
@@ -731,29 +1168,92 @@ class PostViewSet(
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        reaction_type = serializer.validated_data["type"]
-        reaction_qs = self._get_reaction_queryset(post)
-        user_reactions = reaction_qs.filter(user=request.user)
-        same_reaction = user_reactions.filter(type=reaction_type).first()
+        counts, my_reaction = reaction_counters.toggle(
+            request.user.pk, post, serializer.validated_data["type"]
+        )
+        return Response(self._reaction_summary(counts, my_reaction))
 
-        if same_reaction:
-            user_reactions.exclude(pk=same_reaction.pk).delete()
-            same_reaction.delete()
-        else:
-            existing = user_reactions.first()
-            if existing:
-                user_reactions.exclude(pk=existing.pk).delete()
-                existing.type = reaction_type
-                existing.save(update_fields=["type"])
-            else:
-                Reaction.objects.create(
-                    user=request.user,
-                    content_object=post,
-                    type=reaction_type,
-                )
+    @extend_schema(
+        description=(
+            "Traduce `title`, `excerpt` y `content` de la entrada a todos los idiomas"
+            " configurados que falten o estén desactualizados respecto al idioma de"
+            " origen, en paralelo, y guarda las traducciones con sus slugs. Las"
+            " traducciones editadas a mano solo se sustituyen con `force`. El trabajo"
+            " se encola: si un worker no lo termina antes de responder se devuelve"
+            " `202` con la tarea a consultar en `/api/jobs/<id>/`."
+        ),
+        request=PostTranslationRequestSerializer,
+        responses={
+            200: PostTranslationResponseSerializer,
+            202: OpenApiResponse(
+                response=BackgroundJobSerializer,
+                description="Traducción encolada; consulta la tarea indicada en `Location`.",
+            ),
+            400: OpenApiResponse(description="Solicitud inválida o entrada sin idioma de origen."),
+            401: OpenApiResponse(description="Autenticación requerida."),
+            403: OpenApiResponse(description="Permisos insuficientes."),
+            429: OpenApiResponse(
+                description="Límite de uso de OpenAI alcanzado; reintentar tras `Retry-After`."
+            ),
+            503: OpenApiResponse(description="Servicio de traducción no configurado."),
+        },
+        examples=[
+            OpenApiExample(
+                "Respuesta",
+                value={
+                    "source_lang": "es",
+                    "languages": {"en": {"status": "created", "slug": "hello-world"}},
+                },
+                response_only=True,
+            ),
+        ],
+    )
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="translate",
+        url_name="translate",
+        throttle_classes=[ScopedRateThrottle],
+    )
+    def translate(self, request, slug=None):
+        post = self.get_object()
+        serializer = PostTranslationRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        options = serializer.validated_data
+        source_language = options.get("source_lang") or settings.LANGUAGE_CODE
 
-        summary = self._build_reaction_summary(post, request.user)
-        return Response(summary)
+        try:
+            ensure_configured()
+        except OpenAIConfigurationError as exc:
+            logger.warning("OpenAI configuration error: %s", exc)
+            return Response({"detail": str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        if not post_translation.has_source(post, source_language):
+            return Response(
+                {
+                    "detail": "La entrada no tiene contenido en el idioma de origen"
+                    f" ({source_language})."
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        shed_when_over_budget()
+        job = jobs.enqueue(
+            "blog.translate_post",
+            {
+                "post_id": post.pk,
+                "source_lang": source_language,
+                "languages": options.get("languages"),
+                "force": options["force"],
+            },
+            queue="translations",
+            priority=jobs.HIGH_PRIORITY,
+            user=request.user,
+        )
+        if job.status == BackgroundJob.Status.SUCCEEDED:
+            return Response(PostTranslationResponseSerializer(job.result).data)
+        if job.status == BackgroundJob.Status.FAILED:
+            return job_failure_response(job)
+        return job_accepted_response(request, job)
 
 
 @extend_schema_view(
@@ -812,6 +1312,7 @@ class PostViewSet(
     ),
 )
 class CategoryViewSet(
+    CachedReadMixin,
     LanguageNegotiationMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
@@ -847,14 +1348,12 @@ class CategoryViewSet(
             elif normalized in {"false", "0", "no"}:
                 queryset = queryset.filter(is_active=False)
 
-        with_counts = params.get("with_counts")
-        if with_counts is not None and with_counts.lower() in {"1", "true", "yes"}:
-            queryset = queryset.annotate(post_count=Count("posts", distinct=True))
-
         return queryset.order_by(*self.ordering).distinct()
 
 
 class CommentViewSet(
+    KeysetOptInMixin,
+    CachedReadMixin,
     LanguageNegotiationMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
@@ -863,14 +1362,20 @@ class CommentViewSet(
 ):
     """Manage comments nested under posts."""
 
+    cache_anonymous_responses = False
     serializer_class = CommentSerializer
     permission_classes = [CanModerateComments]
     search_fields = ["content", "author_name"]
     ordering_fields = ["created_at"]
-    ordering = ["-created_at"]
+    ordering = ["-created_at", "-id"]
+    cursor_pagination_class = CommentKeysetPagination
 
     def _get_post(self) -> Post:
-        """Return the parent post identified by the slug in the URL."""
+        """Return the parent post identified by the slug in the URL.
+
+        Only the id is loaded; the slug shown in the payloads comes from the
+        slug index (see :meth:`get_serializer_context`).
+        """
 
         if hasattr(self, "_post_cache"):
             return self._post_cache
@@ -885,16 +1390,36 @@ class CommentViewSet(
         if not slug:
             raise Http404("No se proporcionó el slug de la publicación.")
 
-        self._post_cache = get_object_or_404(Post.objects.all(), slug=slug)
+        matches = slug_index.resolve(slug, self.language_code)
+        if not matches:
+            raise Http404("No se encontró la publicación.")
+        self._post_cache = get_object_or_404(Post._base_manager.only("pk"), pk=matches[0].post_id)
+        self._post_slug = matches[0].canonical_slug
         return self._post_cache
 
+    def get_serializer_context(self):  # type: ignore[override]
+        context = super().get_serializer_context()
+        if not getattr(self, "swagger_fake_view", False):
+            self._get_post()
+            context["post_slug"] = self._post_slug
+        return context
+
     def get_queryset(self):  # type: ignore[override]
         post = self._get_post()
-        return (
-            Comment.objects.filter(post=post)
-            .select_related("post")
-            .order_by("-created_at", "-id")
+        return Comment.objects.filter(post_id=post.pk).order_by("-created_at", "-id")
+
+    def get_list_validators(self, queryset, key, versions):  # type: ignore[override]
+        # No Last-Modified: deleting the newest comment would move it backwards.
+        summary = queryset.order_by().aggregate(total=Count("pk"), latest=Max("pk"))
+        self.share_count(summary["total"])
+        etag = conditional.make_etag(
+            key,
+            conditional.viewer_scope(self.request),
+            summary["total"],
+            summary["latest"],
+            *versions.values(),
         )
+        return etag, None
 
 
     @extend_schema(
@@ -1005,8 +1530,15 @@ class RoleManagementViewSet(viewsets.ViewSet):
             response=OpenAITranslationResponseSerializer,
             description="Traducción generada correctamente.",
         ),
+        202: OpenApiResponse(
+            response=BackgroundJobSerializer,
+            description="Traducción encolada; consulta la tarea indicada en `Location`.",
+        ),
         400: OpenApiResponse(description="Solicitud inválida."),
         401: OpenApiResponse(description="Autenticación requerida."),
+        429: OpenApiResponse(
+            description="Límite de uso de OpenAI alcanzado; reintentar tras `Retry-After`."
+        ),
         502: OpenApiResponse(description="Error al contactar con OpenAI."),
         503: OpenApiResponse(description="Servicio de traducción no configurado."),
     },
@@ -1034,35 +1566,82 @@ class OpenAITranslationViewSet(viewsets.ViewSet):
             )
 
         payload = serializer.validated_data
-
         try:
-            translation = translate_text(
-                text=payload["text"],
-                target_language=payload["target_lang"],
-                source_language=payload.get("source_lang"),
-                fmt=payload["format"],
-            )
+            ensure_configured()
         except OpenAIConfigurationError as exc:
             logger.warning("OpenAI configuration error: %s", exc)
             return Response(
                 {"detail": str(exc)},
                 status=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
-        except OpenAIRequestError as exc:
-            detail = str(exc) or "No fue posible completar la traducción."
-            status_code = exc.status_code or status.HTTP_502_BAD_GATEWAY
-            if status_code < 400:
-                status_code = status.HTTP_502_BAD_GATEWAY
-            logger.warning(
-                "OpenAI request failed with status %s: %s", status_code, detail
+
+        found = translation_memory.recall(
+            text=payload["text"],
+            target_language=payload["target_lang"],
+            source_language=payload.get("source_lang"),
+            fmt=payload["format"],
+        )
+        if found is not None:
+            return self._translation_response(payload, found.text, found.source)
+
+        # Misses call OpenAI from a background worker; the client polls the job.
+        shed_when_over_budget()
+        job = jobs.enqueue(
+            "blog.translate_text",
+            {
+                "text": payload["text"],
+                "target_lang": payload["target_lang"],
+                "source_lang": payload.get("source_lang"),
+                "format": payload["format"],
+            },
+            queue="translations",
+            priority=jobs.HIGH_PRIORITY,
+            user=request.user,
+        )
+        if job.status == BackgroundJob.Status.SUCCEEDED:
+            return self._translation_response(
+                payload, job.result["translation"], job.result["memory"]
             )
-            return Response({"detail": detail}, status=status_code)
+        if job.status == BackgroundJob.Status.FAILED:
+            return job_failure_response(job)
+        return job_accepted_response(request, job)
 
+    def _translation_response(self, payload, text: str, memory: str) -> Response:
         response_payload = {
-            "translation": translation,
+            "translation": text,
             "target_lang": payload["target_lang"],
             "source_lang": payload.get("source_lang"),
             "format": payload["format"],
         }
         output_serializer = OpenAITranslationResponseSerializer(response_payload)
-        return Response(output_serializer.data, status=status.HTTP_200_OK)
+        response = Response(output_serializer.data, status=status.HTTP_200_OK)
+        response[translation_memory.HEADER] = memory
+        return response
+
+
+@extend_schema_view(
+    retrieve=extend_schema(
+        description=(
+            "Estado de una tarea en segundo plano. Al terminar, `result` contiene la"
+            " respuesta de la operación encolada o `{detail, status_code}` si falló."
+        ),
+        responses={
+            200: BackgroundJobSerializer,
+            401: OpenApiResponse(description="Autenticación requerida."),
+            404: OpenApiResponse(description="Tarea no encontrada."),
+        },
+    ),
+)
+class BackgroundJobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """Consulta de las tareas encoladas por el usuario autenticado."""
+
+    serializer_class = BackgroundJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):  # type: ignore[override]
+        queryset = BackgroundJob.objects.all()
+        if getattr(self, "swagger_fake_view", False):
+            return queryset.none()
+        if rbac.user_has_role(self.request.user, rbac.Role.ADMIN):
+            return queryset
+        return queryset.filter(created_by_id=self.request.user.pk)
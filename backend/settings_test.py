@@ -12,3 +12,6 @@ ALLOWED_HOSTS = ['*']
 SECURE_SSL_REDIRECT = False
 SESSION_COOKIE_SECURE = False
 CSRF_COOKIE_SECURE = False
+
+# No worker runs during tests: background jobs execute when enqueued.
+BLOG_JOBS_EAGER = True
@@ -31,7 +31,15 @@ else:
     raise SystemExit("Database not available")
 PY
 
+# Other commands (e.g. the job worker) reuse the image once the DB is up;
+# migrations and static files are left to the web container.
+if [ "$#" -gt 0 ]; then
+    exec "$@"
+fi
+
 python manage.py migrate --noinput
+# Indexes the posts that predate the search index; a no-op once it is built.
+python manage.py rebuild_search_index --if-needed
 if [ "${SEED_ON_STARTUP:-}" = "1" ]; then
     python manage.py seed_categories
 fi
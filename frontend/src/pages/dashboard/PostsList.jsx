@@ -14,7 +14,7 @@ import DataTable from '../../components/DataTable.jsx';
 import { listarPosts, eliminarPost } from '../../services/posts.js';
 import { listarCategorias } from '../../services/categories.js';
 import { listarTags } from '../../services/tags.js';
-import { getPostReactions } from '../../services/api.js';
+import { REACTION_BATCH_LIMIT, getPostReactionsBatch } from '../../services/api.js';
 import toast from 'react-hot-toast';
 import { useUIStore, selectIsDark } from '../../store/useUI';
 
@@ -190,21 +190,32 @@ function PostsList() {
       if (pending.length === 0) {
         return;
       }
+      const chunks = [];
+      for (let start = 0; start < pending.length; start += REACTION_BATCH_LIMIT) {
+        const chunk = pending.slice(start, start + REACTION_BATCH_LIMIT);
+        chunks.push({
+          slugs: chunk.filter((key) => typeof key === 'string'),
+          ids: chunk.filter((key) => typeof key === 'number')
+        });
+      }
       const results = await Promise.allSettled(
-        pending.map((slug) =>
-          getPostReactions(slug, { signal: controller.signal })
-            .then((summary) => ({ slug, summary }))
-            .catch(() => null)
-        )
+        chunks.map((chunk) => getPostReactionsBatch(chunk, { signal: controller.signal }))
       );
       if (cancelled) {
         return;
       }
+      const summaries = results
+        .filter((result) => result.status === 'fulfilled')
+        .flatMap((result) => result.value);
+      if (summaries.length === 0) {
+        return;
+      }
       setReactionsBySlug((prev) => {
         const next = { ...prev };
-        results.forEach((result) => {
-          if (result.status === 'fulfilled' && result.value?.slug && result.value?.summary) {
-            next[result.value.slug] = result.value.summary;
+        summaries.forEach(({ id, slug, summary }) => {
+          const key = slug ?? id;
+          if (key !== null && key !== undefined) {
+            next[key] = summary;
           }
         });
         return next;
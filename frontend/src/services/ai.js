@@ -4,7 +4,37 @@ import api, { getStoredTokens } from './api.js';
 
 const LOG_PREFIX = '[AI Translate]';
 
-const MAX_TEXT_LENGTH = 2000;
+const MAX_TEXT_LENGTH = 50000;
+const JOB_POLL_INTERVAL_MS = 1000;
+const JOB_POLL_TIMEOUT_MS = 180000;
+
+const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// The backend answers 202 with a background job when the translation is not
+// cached; poll it until it finishes and resolve with the job result.
+const waitForJob = async (job) => {
+  const deadline = Date.now() + JOB_POLL_TIMEOUT_MS;
+  let current = job;
+
+  while (current.status !== 'succeeded') {
+    if (current.status === 'failed') {
+      const result = current.result ?? {};
+      const error = new Error(result.detail || 'La traducción no pudo completarse.');
+      error.response = { status: result.status_code || 502, data: { detail: result.detail } };
+      throw error;
+    }
+    if (Date.now() > deadline) {
+      const error = new Error('La traducción está tardando demasiado.');
+      error.response = { status: 504, data: { detail: error.message } };
+      throw error;
+    }
+    await sleep(JOB_POLL_INTERVAL_MS);
+    const response = await api.get(`jobs/${current.id}/`);
+    current = response.data ?? {};
+  }
+
+  return current.result ?? {};
+};
 
 export function isAIConfigured() {
   const tokens = getStoredTokens();
@@ -111,7 +141,7 @@ export async function translateText({
 
   try {
     const response = await api.post('ai/translations/', payload);
-    const data = response.data ?? {};
+    const data = response.status === 202 ? await waitForJob(response.data ?? {}) : response.data ?? {};
     const translated = typeof data.translation === 'string' ? data.translation.trim() : '';
 
     if (!translated) {
@@ -1011,6 +1011,41 @@ export async function getPostReactions(slug, options = {}) {
   }
 }
 
+export const REACTION_BATCH_LIMIT = 50;
+
+export async function getPostReactionsBatch({ slugs = [], ids = [] } = {}, options = {}) {
+  if (slugs.length === 0 && ids.length === 0) {
+    return [];
+  }
+  if (slugs.length + ids.length > REACTION_BATCH_LIMIT) {
+    throw new Error(`Solo se pueden consultar ${REACTION_BATCH_LIMIT} posts por solicitud.`);
+  }
+
+  const params = {};
+  if (slugs.length > 0) {
+    params.slugs = slugs.join(',');
+  }
+  if (ids.length > 0) {
+    params.ids = ids.join(',');
+  }
+  const config = { params };
+  if (options.signal) {
+    config.signal = options.signal;
+  }
+
+  try {
+    const response = await api.get('posts/reaction-summaries/', config);
+    const items = Array.isArray(response.data) ? response.data : [];
+    return items.map((item) => ({
+      id: item?.id ?? null,
+      slug: item?.slug ?? null,
+      summary: normalizeReactionSummary(item ?? {})
+    }));
+  } catch (error) {
+    throw toApiError(error);
+  }
+}
+
 export async function togglePostReaction(slug, type) {
   if (!slug) {
     throw new Error('Debes indicar el slug del post para registrar la reacción.');